@@ -0,0 +1,119 @@
+"""Offline runner for the benchmarks, for machines without asv.
+
+Usage: ``python -m benchmarks [-k PATTERN] [--max-param N] [--repeat R] [--large]``
+
+Benchmarks follow the asv conventions: ``time_*`` methods are timed (best of ``repeat`` runs), ``peakmem_*`` methods
+report the peak memory allocated by the call (traced with ``tracemalloc``, so that it does not include the setup), and
+``track_*`` methods report their return value. A ``setup`` raising ``NotImplementedError`` skips the benchmark, e.g.
+when vtk is not installed. ``--large`` adds the loader sizes up to 10^8 elements and the streamlines on 10^7 tetrahedrons, like setting
+``IPYGANY_LARGE_BENCHMARKS``.
+"""
+
+import argparse
+import gc
+import importlib
+import inspect
+import itertools
+import os
+import pkgutil
+import re
+import time
+
+import benchmarks
+
+PREFIXES = ('time_', 'peakmem_', 'track_')
+
+
+def iter_benchmark_classes():
+    for module_info in pkgutil.iter_modules(benchmarks.__path__):
+        if module_info.name in ('__main__', 'utils'):
+            continue
+
+        module = importlib.import_module('benchmarks.' + module_info.name)
+        for name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ == module.__name__ and any(m.startswith(PREFIXES) for m in dir(cls)):
+                yield module_info.name, cls
+
+
+def iter_params(cls):
+    params = getattr(cls, 'params', [])
+    if not params:
+        return [()]
+
+    # A single list of parameters, or a list of lists
+    if not isinstance(params[0], (list, tuple)):
+        params = [params]
+
+    return itertools.product(*params)
+
+
+def measure(method, args, repeat):
+    name = method.__name__
+
+    if name.startswith('time_'):
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            method(*args)
+            best = min(best, time.perf_counter() - start)
+        return '{:.4g} s'.format(best)
+
+    if name.startswith('peakmem_'):
+        from benchmarks.utils import peak_allocation
+
+        gc.collect()
+        return '{:.4g} MB'.format(peak_allocation(method, *args))
+
+    return '{:.4g} {}'.format(method(*args), getattr(method, 'unit', ''))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description=__doc__.split('\n')[0])
+    parser.add_argument('-k', '--pattern', default='', help='only run the benchmarks matching this regex')
+    parser.add_argument('--max-param', type=float, default=None, help='skip numeric parameters above this value')
+    parser.add_argument('--repeat', type=int, default=3, help='number of runs of the time benchmarks')
+    parser.add_argument('--large', action='store_true', help='also run the loaders on 10^7 and 10^8 elements, and the streamlines on 10^7 tetrahedrons')
+    args = parser.parse_args(argv)
+
+    # Benchmark modules read it when they are imported
+    if args.large:
+        os.environ['IPYGANY_LARGE_BENCHMARKS'] = '1'
+
+    for module_name, cls in iter_benchmark_classes():
+        methods = sorted(m for m in dir(cls) if m.startswith(PREFIXES))
+
+        for params in iter_params(cls):
+            if args.max_param is not None and any(
+                isinstance(p, (int, float)) and p > args.max_param for p in params
+            ):
+                continue
+
+            selected = [
+                m for m in methods if re.search(args.pattern, '{}.{}.{}'.format(module_name, cls.__name__, m))
+            ]
+            if not selected:
+                continue
+
+            label = '{}.{}({})'.format(module_name, cls.__name__, ', '.join(map(str, params)))
+            instance = cls()
+
+            try:
+                if hasattr(instance, 'setup'):
+                    instance.setup(*params)
+            except NotImplementedError as e:
+                print('{:<60} skipped: {}'.format(label, e))
+                continue
+
+            try:
+                for name in selected:
+                    print('{:<60} {:<40} {}'.format(label, name, measure(getattr(instance, name), params, args.repeat)), flush=True)
+            finally:
+                if hasattr(instance, 'teardown'):
+                    instance.teardown(*params)
+
+            del instance
+            gc.collect()
+
+
+if __name__ == '__main__':
+    main()
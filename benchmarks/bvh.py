@@ -0,0 +1,37 @@
+import numpy as np
+
+from ipygany.bvh import BVH
+from ipygany.filters import tetrahedron_skin
+
+from .utils import tetrahedral_grid
+
+
+class BVHQueries:
+    params = [10 ** 5, 10 ** 6, 10 ** 7]
+    param_names = ['n_tetrahedrons']
+    timeout = 600
+
+    def setup(self, n_tetrahedrons):
+        self.vertices, self.tetrahedrons, _ = tetrahedral_grid(n_tetrahedrons)
+        self.triangles = tetrahedron_skin(self.tetrahedrons)
+
+        self.triangle_bvh = BVH(self.vertices, self.triangles)
+        self.tetrahedron_bvh = BVH(self.vertices, self.tetrahedrons)
+
+        size = self.vertices[:, 0].max()
+        rng = np.random.default_rng(0)
+        self.points = rng.uniform(0., size, (10000, 3))
+        self.origins = self.points + (0., 0., 2. * size)
+        self.directions = np.tile([0., 0., -1.], (10000, 1))
+
+    def time_build_triangles(self, n_tetrahedrons):
+        BVH(self.vertices, self.triangles)
+
+    def time_build_tetrahedrons(self, n_tetrahedrons):
+        BVH(self.vertices, self.tetrahedrons)
+
+    def time_intersect(self, n_tetrahedrons):
+        self.triangle_bvh.intersect(self.origins, self.directions)
+
+    def time_locate(self, n_tetrahedrons):
+        self.tetrahedron_bvh.locate(self.points)
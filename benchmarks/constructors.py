@@ -0,0 +1,80 @@
+import numpy as np
+
+from ipygany import PolyMesh, TetraMesh, PointCloud, Component
+from ipygany.serialization import array_to_binary
+
+from .utils import tetrahedral_grid
+
+
+class Constructors:
+    """Construction of the mesh widgets from NumPy arrays."""
+
+    params = [10 ** 4, 10 ** 6, 10 ** 8]
+    param_names = ['n_tetrahedrons']
+    timeout = 1200
+
+    def setup(self, n_tetrahedrons):
+        self.vertices, self.tetrahedrons, distance = tetrahedral_grid(n_tetrahedrons)
+        self.triangles = np.ascontiguousarray(self.tetrahedrons[:, :3])
+        self.data = {'distance': [Component('value', distance)]}
+
+    def time_polymesh(self, n_tetrahedrons):
+        PolyMesh(vertices=self.vertices, triangle_indices=self.triangles, data=self.data)
+
+    def peakmem_polymesh(self, n_tetrahedrons):
+        PolyMesh(vertices=self.vertices, triangle_indices=self.triangles, data=self.data)
+
+    def time_tetramesh(self, n_tetrahedrons):
+        TetraMesh(vertices=self.vertices, tetrahedron_indices=self.tetrahedrons, data=self.data)
+
+    def peakmem_tetramesh(self, n_tetrahedrons):
+        TetraMesh(vertices=self.vertices, tetrahedron_indices=self.tetrahedrons, data=self.data)
+
+    def time_pointcloud(self, n_tetrahedrons):
+        PointCloud(vertices=self.vertices, data=self.data)
+
+    def peakmem_pointcloud(self, n_tetrahedrons):
+        PointCloud(vertices=self.vertices, data=self.data)
+
+
+class ComponentStatistics:
+    """First computation of the statistics of a component, as done when an effect needs its range."""
+
+    params = [10 ** 4, 10 ** 6, 10 ** 8]
+    param_names = ['n_values']
+    timeout = 600
+
+    def setup(self, n_values):
+        self.array = np.random.default_rng(0).standard_normal(n_values, dtype=np.float32)
+
+    def time_min_max(self, n_values):
+        component = Component('value', self.array)
+        component.min, component.max
+
+    def peakmem_min_max(self, n_values):
+        component = Component('value', self.array)
+        component.min, component.max
+
+    def time_percentile(self, n_values):
+        Component('value', self.array).percentile([1., 99.])
+
+
+class Serialization:
+    """Conversion of arrays to wire buffers."""
+
+    params = [[10 ** 4, 10 ** 6, 10 ** 8], ['float32', 'float64', 'uint32', 'int64']]
+    param_names = ['size', 'dtype']
+    timeout = 600
+
+    def setup(self, size, dtype):
+        self.array = np.arange(size).astype(dtype)
+        self.strided = np.arange(2 * size).astype(dtype)[::2]
+
+    def time_array_to_binary(self, size, dtype):
+        array_to_binary(self.array)
+
+    def peakmem_array_to_binary(self, size, dtype):
+        array_to_binary(self.array)
+
+    def time_array_to_binary_strided(self, size, dtype):
+        array_to_binary(self.strided)
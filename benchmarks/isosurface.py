@@ -0,0 +1,35 @@
+import numpy as np
+
+from ipygany.filters import isosurface
+from ipygany.volume import isosurface as volume_isosurface
+
+from .utils import tetrahedral_grid
+
+
+class IsoSurface:
+    params = [10 ** 6, 10 ** 7, 5 * 10 ** 7]
+    param_names = ['n_tetrahedrons']
+    timeout = 600
+
+    def setup(self, n_tetrahedrons):
+        self.vertices, self.tetrahedrons, self.distance = tetrahedral_grid(n_tetrahedrons)
+        self.radius = self.distance.max() / 2.
+
+    def time_isosurface(self, n_tetrahedrons):
+        isosurface(self.vertices, self.tetrahedrons, self.distance, self.radius)
+
+    def time_isosurface_multiple_values(self, n_tetrahedrons):
+        isosurface(self.vertices, self.tetrahedrons, self.distance, [self.radius / 2., self.radius, self.radius * 1.5])
+
+
+class VolumeIsoSurface:
+    params = [64, 128, 256]
+    param_names = ['n']
+    timeout = 600
+
+    def setup(self, n):
+        x, y, z = np.meshgrid(*(np.arange(n, dtype=np.float32),) * 3, indexing='ij', sparse=True)
+        self.grid = np.sqrt((x - n / 2.) ** 2 + (y - n / 2.) ** 2 + (z - n / 2.) ** 2)
+
+    def time_isosurface(self, n):
+        volume_isosurface(self.grid, n / 4.)
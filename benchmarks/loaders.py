@@ -0,0 +1,115 @@
+import os
+import tempfile
+
+import numpy as np
+
+from ipygany import PolyMesh, TetraMesh
+
+from .utils import tetrahedral_grid, sizes
+
+
+def import_vtk():
+    """Import vtk, skipping the benchmark if it is not installed."""
+    try:
+        import vtk
+        from vtk.util.numpy_support import numpy_to_vtk, numpy_to_vtkIdTypeArray
+    except ImportError:
+        raise NotImplementedError('vtk is not installed')
+
+    return vtk, numpy_to_vtk, numpy_to_vtkIdTypeArray
+
+
+def unstructured_grid(vertices, tetrahedrons, distance):
+    """Build a ``vtkUnstructuredGrid`` of tetrahedrons, with the distance as point data."""
+    vtk, numpy_to_vtk, numpy_to_vtkIdTypeArray = import_vtk()
+
+    points = vtk.vtkPoints()
+    points.SetData(numpy_to_vtk(vertices, deep=True))
+
+    cells = np.empty((len(tetrahedrons), 5), dtype=np.int64)
+    cells[:, 0] = 4
+    cells[:, 1:] = tetrahedrons
+
+    cell_array = vtk.vtkCellArray()
+    cell_array.SetCells(len(tetrahedrons), numpy_to_vtkIdTypeArray(cells.ravel(), deep=True))
+
+    grid = vtk.vtkUnstructuredGrid()
+    grid.SetPoints(points)
+    grid.SetCells(vtk.VTK_TETRA, cell_array)
+
+    array = numpy_to_vtk(distance, deep=True)
+    array.SetName('distance')
+    grid.GetPointData().AddArray(array)
+
+    return grid
+
+
+class VTKLoader:
+    """Loading of ``.vtu`` files, through the pure-Python vtk loader."""
+
+    params = sizes(4, 5, 6, large=(7, 8))
+    param_names = ['n_tetrahedrons']
+    timeout = 600
+
+    def setup(self, n_tetrahedrons):
+        vtk, _, _ = import_vtk()
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'grid.vtu')
+
+        writer = vtk.vtkXMLUnstructuredGridWriter()
+        writer.SetFileName(self.path)
+        writer.SetInputData(unstructured_grid(*tetrahedral_grid(n_tetrahedrons)))
+        writer.Write()
+
+        self.mesh = PolyMesh.from_vtk(self.path)
+
+    def teardown(self, n_tetrahedrons):
+        self.directory.cleanup()
+
+    def time_polymesh_from_vtk(self, n_tetrahedrons):
+        PolyMesh.from_vtk(self.path)
+
+    def peakmem_polymesh_from_vtk(self, n_tetrahedrons):
+        PolyMesh.from_vtk(self.path)
+
+    def time_tetramesh_from_vtk(self, n_tetrahedrons):
+        TetraMesh.from_vtk(self.path)
+
+    def peakmem_tetramesh_from_vtk(self, n_tetrahedrons):
+        TetraMesh.from_vtk(self.path)
+
+    def time_reload_data(self, n_tetrahedrons):
+        self.mesh.reload(self.path)
+
+    def time_reload_all(self, n_tetrahedrons):
+        self.mesh.reload(self.path, reload_vertices=True, reload_triangles=True)
+
+
+class PyVistaLoader:
+    """Conversion of in-memory pyvista meshes."""
+
+    params = sizes(4, 5, 6, large=(7, 8))
+    param_names = ['n_tetrahedrons']
+    timeout = 600
+
+    def setup(self, n_tetrahedrons):
+        try:
+            import pyvista as pv
+        except ImportError:
+            raise NotImplementedError('pyvista is not installed')
+
+        self.grid = pv.wrap(unstructured_grid(*tetrahedral_grid(n_tetrahedrons)))
+        self.surface = self.grid.extract_surface().triangulate()
+
+    def time_polymesh_from_unstructured_grid(self, n_tetrahedrons):
+        PolyMesh.from_pyvista(self.grid)
+
+    def peakmem_polymesh_from_unstructured_grid(self, n_tetrahedrons):
+        PolyMesh.from_pyvista(self.grid)
+
+    def time_polymesh_from_polydata(self, n_tetrahedrons):
+        PolyMesh.from_pyvista(self.surface)
+
+    def peakmem_polymesh_from_polydata(self, n_tetrahedrons):
+        PolyMesh.from_pyvista(self.surface)
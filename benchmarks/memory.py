@@ -0,0 +1,57 @@
+import numpy as np
+
+from ipygany import PolyMesh, TetraMesh, PointCloud
+from ipygany.serialization import array_to_binary
+
+from .utils import tetrahedral_grid, peak_allocation
+
+
+def megabytes(track):
+    track.unit = 'megabytes'
+
+    return track
+
+
+def construct_and_serialize(cls, **kwargs):
+    block = cls(**kwargs)
+
+    return [array_to_binary(getattr(block, name)) for name in ('vertices', 'triangle_indices', 'tetrahedron_indices') if block.has_trait(name)]
+
+
+class ConstructorMemory:
+    """Peak memory allocated by the constructors and by the serialization, compared to the size of the input arrays."""
+
+    params = [10 ** 6, 10 ** 7]
+    param_names = ['n_tetrahedrons']
+    timeout = 600
+
+    def setup(self, n_tetrahedrons):
+        vertices, tetrahedrons, _ = tetrahedral_grid(n_tetrahedrons)
+
+        self.vertices = vertices.astype(np.float64)
+        self.vertices32 = vertices
+        self.tetrahedrons = tetrahedrons
+        self.triangles = np.ascontiguousarray(tetrahedrons[:, :3])
+
+    @megabytes
+    def track_input_size(self, n_tetrahedrons):
+        return (self.vertices.nbytes + self.tetrahedrons.nbytes) / 2 ** 20
+
+    @megabytes
+    def track_polymesh(self, n_tetrahedrons):
+        return peak_allocation(construct_and_serialize, PolyMesh, vertices=self.vertices32, triangle_indices=self.triangles)
+
+    @megabytes
+    def track_polymesh_float64(self, n_tetrahedrons):
+        return peak_allocation(construct_and_serialize, PolyMesh, vertices=self.vertices, triangle_indices=self.triangles)
+
+    @megabytes
+    def track_tetramesh(self, n_tetrahedrons):
+        return peak_allocation(
+            construct_and_serialize, TetraMesh,
+            vertices=self.vertices32, triangle_indices=self.triangles, tetrahedron_indices=self.tetrahedrons
+        )
+
+    @megabytes
+    def track_pointcloud(self, n_tetrahedrons):
+        return peak_allocation(construct_and_serialize, PointCloud, vertices=self.vertices)
@@ -0,0 +1,32 @@
+import numpy as np
+
+from ipygany.raster import Camera, rasterize
+
+
+class Rasterize:
+    """Software rendering of a height field made of ``n_triangles`` triangles into an 800x600 image."""
+
+    params = [10 ** 4, 10 ** 6, 10 ** 7]
+    param_names = ['n_triangles']
+    timeout = 600
+
+    def setup(self, n_triangles):
+        n = int(np.ceil(np.sqrt(n_triangles / 2))) + 1
+
+        x, y = np.meshgrid(np.linspace(-1, 1, n), np.linspace(-1, 1, n), indexing='ij')
+        z = 0.3 * np.sin(3 * x) * np.cos(3 * y)
+        vertices = np.stack((x.ravel(), y.ravel(), z.ravel()), axis=1)
+
+        i = (np.arange(n - 1)[:, np.newaxis] * n + np.arange(n - 1)).ravel()
+        triangles = np.concatenate((np.stack((i, i + n, i + 1), axis=1), np.stack((i + 1, i + n, i + n + 1), axis=1)))
+
+        colors = np.repeat((z.ravel()[:, np.newaxis] + 0.3) / 0.6, 3, axis=1)
+
+        self.primitives = [(vertices, triangles, colors)]
+        self.camera = Camera((0., -3., 2.5), (0., 0., 0.), up=(0., 0., 1.))
+
+    def time_rasterize(self, n_triangles):
+        rasterize(self.primitives, self.camera, 800, 600)
+
+    def peakmem_rasterize(self, n_triangles):
+        rasterize(self.primitives, self.camera, 800, 600)
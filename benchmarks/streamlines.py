@@ -0,0 +1,28 @@
+import numpy as np
+
+from ipygany.streamlines import TetrahedronLocator, integrate_streamlines
+
+from .utils import sizes, tetrahedral_grid
+
+
+class Streamlines:
+    # 10^4 seeds, on up to 10^7 tetrahedrons with IPYGANY_LARGE_BENCHMARKS
+    params = sizes(6, large=(7, ))
+    param_names = ['n_tetrahedrons']
+    timeout = 600
+
+    def setup(self, n_tetrahedrons):
+        self.vertices, self.tetrahedrons, _ = tetrahedral_grid(n_tetrahedrons)
+
+        size = self.vertices[:, 0].max()
+        centered = self.vertices - size / 2.
+        self.velocity = np.stack((-centered[:, 1], centered[:, 0], np.full(len(self.vertices), 0.1)), axis=1)
+
+        self.locator = TetrahedronLocator(self.vertices, self.tetrahedrons)
+        self.seeds = np.random.default_rng(0).uniform(1., size - 1., (10000, 3))
+
+    def time_locator(self, n_tetrahedrons):
+        TetrahedronLocator(self.vertices, self.tetrahedrons)
+
+    def time_streamlines(self, n_tetrahedrons):
+        integrate_streamlines(self.locator, self.velocity, self.seeds, self.locator.cell_size / 8., max_steps=100)
@@ -0,0 +1,51 @@
+import os
+import tracemalloc
+
+import numpy as np
+
+# Sizes above 10^6 elements need tens of gigabytes for the loaders, they are only benchmarked when this is set
+LARGE = bool(os.environ.get('IPYGANY_LARGE_BENCHMARKS'))
+
+
+def sizes(*exponents, large=()):
+    """Get the powers of ten benchmarked, the ``large`` ones only if ``IPYGANY_LARGE_BENCHMARKS`` is set."""
+    return [10 ** e for e in exponents + (large if LARGE else ())]
+
+
+def peak_allocation(function, *args, **kwargs):
+    """Run ``function`` and return the peak memory it allocated, in megabytes."""
+    tracemalloc.start()
+    try:
+        result = function(*args, **kwargs)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    del result
+
+    return peak / 2 ** 20
+
+
+def tetrahedral_grid(n_tetrahedrons):
+    """Create a cubic structured grid made of at least ``n_tetrahedrons`` tetrahedrons, 6 per voxel.
+
+    Returns the vertices, the tetrahedron indices, and the distance of each vertex to the center of the grid.
+    """
+    n = int(np.ceil((n_tetrahedrons / 6) ** (1. / 3.)))
+
+    axis = np.arange(n + 1, dtype=np.float32)
+    x, y, z = np.meshgrid(axis, axis, axis, indexing='ij')
+    vertices = np.stack((x.ravel(), y.ravel(), z.ravel()), axis=1)
+
+    def index(i, j, k):
+        return ((i * (n + 1) + j) * (n + 1) + k).astype(np.uint32)
+
+    i, j, k = [a.ravel() for a in np.meshgrid(*(np.arange(n, dtype=np.uint32),) * 3, indexing='ij')]
+    corners = np.stack([index(i + di, j + dj, k + dk) for dk in (0, 1) for dj in (0, 1) for di in (0, 1)], axis=1)
+
+    split = np.array([[0, 1, 3, 7], [0, 1, 7, 5], [0, 2, 7, 3], [0, 2, 6, 7], [0, 4, 5, 7], [0, 4, 7, 6]])
+    tetrahedrons = corners[:, split].reshape(-1, 4)
+
+    distance = np.linalg.norm(vertices - n / 2., axis=1)
+
+    return vertices, tetrahedrons, distance
@@ -0,0 +1,37 @@
+import numpy as np
+
+from ipygany.filters import VertexWelding
+
+
+class Weld:
+    """Welding of a triangle soup made of ``n_triangles`` shuffled triangles of a height field."""
+
+    params = [10 ** 5, 10 ** 6, 10 ** 7]
+    param_names = ['n_triangles']
+    timeout = 600
+
+    def setup(self, n_triangles):
+        n = int(np.ceil(np.sqrt(n_triangles / 2))) + 1
+
+        x, y = np.meshgrid(np.linspace(-1, 1, n), np.linspace(-1, 1, n), indexing='ij')
+        vertices = np.stack((x.ravel(), y.ravel(), np.sin(3 * x.ravel()) * np.cos(3 * y.ravel())), axis=1).astype(np.float32)
+
+        i = (np.arange(n - 1)[:, np.newaxis] * n + np.arange(n - 1)).ravel()
+        triangles = np.concatenate((np.stack((i, i + n, i + 1), axis=1), np.stack((i + 1, i + n, i + n + 1), axis=1)))
+        triangles = triangles[np.random.RandomState(0).permutation(len(triangles))]
+
+        self.soup = vertices[triangles].reshape(-1, 3)
+
+    def time_weld(self, n_triangles):
+        VertexWelding(self.soup)
+
+    def time_weld_tolerance(self, n_triangles):
+        VertexWelding(self.soup, tolerance=1e-5)
+
+    def peakmem_weld(self, n_triangles):
+        VertexWelding(self.soup)
+
+    def track_ratio(self, n_triangles):
+        return VertexWelding(self.soup).ratio
+
+    track_ratio.unit = 'x'
@@ -6,14 +6,16 @@
 
 from .colormaps import colormaps  # noqa
 from .ipygany import (  # noqa
-    PolyMesh, TetraMesh, PointCloud,
+    PolyMesh, TetraMesh, PointCloud, Glyphs, Volume,
     Scene,
     Data, Component,
     Alpha, RGB, IsoColor, ColorBar,
     Threshold, IsoSurface,
+    Clip, Slice, Streamlines, ProgressivePolyMesh,
     Warp, WarpByScalar,
     Water, UnderWater
 )
+from .partition import MeshPartition  # noqa
 from ._version import __version__, version_info  # noqa
 
 from .nbextension import _jupyter_nbextension_paths  # noqa
@@ -0,0 +1,213 @@
+"""Bounding volume hierarchy over mesh cells, for picking and probing."""
+
+import numpy as np
+
+
+def barycentric_coordinates(points, vertices, tetrahedrons):
+    """Compute the barycentric coordinates of points in the given tetrahedrons, one tetrahedron per point.
+
+    Coordinates are NaN for degenerate tetrahedrons.
+    """
+    v0 = vertices[tetrahedrons[:, 0]]
+    e1 = vertices[tetrahedrons[:, 1]] - v0
+    e2 = vertices[tetrahedrons[:, 2]] - v0
+    e3 = vertices[tetrahedrons[:, 3]] - v0
+    p = points - v0
+
+    # Cramer's rule
+    c23 = np.cross(e2, e3)
+    det = np.einsum('ij,ij->i', e1, c23)
+    det[det == 0] = np.nan
+
+    l1 = np.einsum('ij,ij->i', p, c23) / det
+    l2 = np.einsum('ij,ij->i', e1, np.cross(p, e3)) / det
+    l3 = np.einsum('ij,ij->i', e1, np.cross(e2, p)) / det
+
+    return np.stack((1. - l1 - l2 - l3, l1, l2, l3), axis=1)
+
+
+def interpolate_cells(array, cell_indices, cells, weights):
+    """Interpolate per-vertex values at points located in cells, NaN where cells are -1.
+
+    ``cell_indices`` are the ``(n_cells, k)`` vertex indices of the cells, ``cells`` the cell index of each point and
+    ``weights`` its barycentric coordinates. ``array`` can have more than one dimension.
+    """
+    array = np.asarray(array)
+    values = np.einsum('ij,ij...->i...', weights, array[cell_indices[np.maximum(cells, 0)]])
+    values[cells < 0] = np.nan
+
+    return values
+
+
+def _spread_bits(values):
+    """Spread the 10 lowest bits of the values, inserting two zeros between each bit."""
+    values = values.astype(np.uint64) & np.uint64(0x3ff)
+    values = (values | (values << np.uint64(16))) & np.uint64(0x30000ff)
+    values = (values | (values << np.uint64(8))) & np.uint64(0x300f00f)
+    values = (values | (values << np.uint64(4))) & np.uint64(0x30c30c3)
+    values = (values | (values << np.uint64(2))) & np.uint64(0x9249249)
+
+    return values
+
+
+def morton_codes(points):
+    """Compute the 30 bits Morton codes of 3-D points, quantized over their bounding box."""
+    points = np.asarray(points).reshape(-1, 3)
+
+    lo = points.min(axis=0)
+    extent = points.max(axis=0) - lo
+    extent[extent == 0] = 1.
+
+    quantized = ((points - lo) / extent * 1023.).astype(np.uint64)
+
+    return (_spread_bits(quantized[:, 0]) << np.uint64(2)) | (_spread_bits(quantized[:, 1]) << np.uint64(1)) | _spread_bits(quantized[:, 2])
+
+
+class BVH:
+    """A bounding volume hierarchy over triangles or tetrahedrons.
+
+    Cells are sorted along a Morton curve and grouped by ``leaf_size`` into leaves, which are the bottom of a complete
+    binary tree stored as a heap: the children of node ``i`` are ``2i + 1`` and ``2i + 2``. Queries traverse the tree
+    level by level for all the rays or points at once.
+    """
+
+    def __init__(self, vertices, cells, leaf_size=8):
+        """Build the hierarchy given the ``(n, 3)`` vertices and the ``(n_cells, 3)`` or ``(n_cells, 4)`` cell indices."""
+        self.vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        self.cells = np.asarray(cells)
+        self.leaf_size = leaf_size
+
+        corners = self.vertices[self.cells]
+        self.order = np.argsort(morton_codes(corners.mean(axis=1)), kind='stable')
+
+        n_leaves = max(1, -(-len(self.cells) // leaf_size))
+        self.depth = int(np.ceil(np.log2(n_leaves)))
+        self.first_leaf = 2 ** self.depth - 1
+
+        n_nodes = 2 ** (self.depth + 1) - 1
+        self.mins = np.full((n_nodes, 3), np.inf)
+        self.maxs = np.full((n_nodes, 3), -np.inf)
+
+        if len(self.cells):
+            starts = np.arange(0, len(self.cells), leaf_size)
+            leaves = slice(self.first_leaf, self.first_leaf + len(starts))
+            self.mins[leaves] = np.minimum.reduceat(corners.min(axis=1)[self.order], starts)
+            self.maxs[leaves] = np.maximum.reduceat(corners.max(axis=1)[self.order], starts)
+
+        # Bottom-up computation of the inner nodes bounding boxes
+        for level in range(self.depth - 1, -1, -1):
+            nodes = np.arange(2 ** level - 1, 2 ** (level + 1) - 1)
+            self.mins[nodes] = np.minimum(self.mins[2 * nodes + 1], self.mins[2 * nodes + 2])
+            self.maxs[nodes] = np.maximum(self.maxs[2 * nodes + 1], self.maxs[2 * nodes + 2])
+
+    def _traverse(self, queries, test):
+        """Traverse the tree, keeping the (query, node) pairs for which ``test(queries, nodes)`` is true.
+
+        Returns the (query, cell) candidate pairs found in the leaves.
+        """
+        nodes = np.zeros(len(queries), dtype=np.int64)
+
+        for _ in range(self.depth + 1):
+            hit = test(queries, nodes)
+            queries = queries[hit]
+            nodes = nodes[hit]
+
+            if nodes.size and nodes[0] >= self.first_leaf:
+                break
+
+            queries = np.repeat(queries, 2)
+            nodes = (2 * np.repeat(nodes, 2) + 1) + np.tile([0, 1], len(nodes))
+
+        # Expand the leaves into their cells
+        starts = (nodes - self.first_leaf) * self.leaf_size
+        counts = np.clip(len(self.cells) - starts, 0, self.leaf_size)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        return np.repeat(queries, counts), self.order[np.repeat(starts, counts) + local]
+
+    def intersect(self, origins, directions):
+        """Intersect rays with the triangles of the hierarchy.
+
+        Returns, for each ray, the index of the closest hit triangle (-1 if none), the distance along the ray (in
+        units of the direction length), and the barycentric coordinates of the hit point.
+        """
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inverse = 1. / directions
+
+            def ray_box(rays, nodes):
+                t1 = (self.mins[nodes] - origins[rays]) * inverse[rays]
+                t2 = (self.maxs[nodes] - origins[rays]) * inverse[rays]
+                t_near = np.fmax.reduce(np.fmin(t1, t2), axis=1)
+                t_far = np.fmin.reduce(np.fmax(t1, t2), axis=1)
+
+                return np.all(self.mins[nodes] <= self.maxs[nodes], axis=1) & (t_near <= t_far) & (t_far >= 0)
+
+            rays, triangles = self._traverse(np.arange(len(origins)), ray_box)
+
+            # Moller-Trumbore intersection of all the candidates at once
+            v0 = self.vertices[self.cells[triangles, 0]]
+            e1 = self.vertices[self.cells[triangles, 1]] - v0
+            e2 = self.vertices[self.cells[triangles, 2]] - v0
+            d = directions[rays]
+
+            p = np.cross(d, e2)
+            det = np.einsum('ij,ij->i', e1, p)
+            det[det == 0] = np.nan
+
+            s = origins[rays] - v0
+            u = np.einsum('ij,ij->i', s, p) / det
+            q = np.cross(s, e1)
+            v = np.einsum('ij,ij->i', d, q) / det
+            t = np.einsum('ij,ij->i', e2, q) / det
+
+            hit = (u >= 0) & (v >= 0) & (u + v <= 1) & (t >= 0)
+
+        rays, triangles, t, u, v = rays[hit], triangles[hit], t[hit], u[hit], v[hit]
+
+        # Keep the closest hit of each ray
+        closest = np.lexsort((t, rays))
+        hit_rays, first = np.unique(rays[closest], return_index=True)
+        closest = closest[first]
+
+        result = np.full(len(origins), -1, dtype=np.int64)
+        result[hit_rays] = triangles[closest]
+
+        distances = np.full(len(origins), np.inf)
+        distances[hit_rays] = t[closest]
+
+        weights = np.zeros((len(origins), 3))
+        weights[hit_rays] = np.stack((1. - u[closest] - v[closest], u[closest], v[closest]), axis=1)
+
+        return result, distances, weights
+
+    def locate(self, points, tolerance=1e-9):
+        """Find the tetrahedrons of the hierarchy containing the points.
+
+        Returns the tetrahedron index of each point (-1 if outside) and its barycentric coordinates.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+
+        def point_box(queries, nodes):
+            return np.all((self.mins[nodes] - tolerance <= points[queries]) & (points[queries] <= self.maxs[nodes] + tolerance), axis=1)
+
+        queries, candidates = self._traverse(np.arange(len(points)), point_box)
+
+        coordinates = barycentric_coordinates(points[queries], self.vertices, self.cells[candidates])
+        inside = np.all(coordinates >= -tolerance, axis=1)
+
+        hits, first = np.unique(queries[inside], return_index=True)
+
+        result = np.full(len(points), -1, dtype=np.int64)
+        result[hits] = candidates[inside][first]
+
+        weights = np.zeros((len(points), 4))
+        weights[hits] = coordinates[inside][first]
+
+        return result, weights
+
+    def interpolate(self, array, cells, weights):
+        """Interpolate per-vertex values given cell indices and barycentric coordinates, NaN where cells are -1."""
+        return interpolate_cells(array, self.cells, cells, weights)
@@ -0,0 +1,144 @@
+"""Support for chunked and out-of-core array sources, like h5py datasets or zarr arrays."""
+
+import sys
+
+import numpy as np
+
+from traitlets import TraitType
+
+# Default number of values processed at once
+CHUNK_SIZE = 2 ** 20
+
+
+def _is_instance(value, module_name, class_name):
+    """Check if ``value`` is an instance of ``module_name.class_name``, without importing the module if it was not."""
+    module = sys.modules.get(module_name)
+
+    return module is not None and isinstance(value, getattr(module, class_name, ()))
+
+
+def is_chunked_array(value):
+    """Check if ``value`` is an array source which should not be loaded in memory at once.
+
+    ``h5py.Dataset``, ``zarr.Array`` and dask arrays are such sources, as well as objects exposing ``chunks`` next to
+    ``shape``, ``dtype`` and slicing.
+    """
+    if isinstance(value, np.ndarray):
+        return False
+
+    if is_dask_array(value) or _is_instance(value, 'h5py', 'Dataset') or _is_instance(value, 'zarr', 'Array'):
+        return True
+
+    return all(hasattr(value, attr) for attr in ('shape', 'dtype', 'chunks', '__getitem__'))
+
+
+def is_dask_array(value):
+    """Check if ``value`` is a dask array, without importing dask if it was not imported already."""
+    return _is_instance(value, 'dask.array', 'Array')
+
+
+def iter_slices(shape, chunk_size=CHUNK_SIZE):
+    """Iterate over slices along the first axis of an array of the given shape, covering ``chunk_size`` values each."""
+    if not len(shape):
+        yield ()
+        return
+
+    row_size = int(np.prod(shape[1:]))
+    rows = max(1, chunk_size // max(row_size, 1))
+
+    for start in range(0, shape[0], rows):
+        yield slice(start, start + rows)
+
+
+def iter_chunks(array, chunk_size=CHUNK_SIZE):
+    """Iterate over flat chunks of an array, slicing it along its first axis.
+
+    Only one chunk at a time is loaded or copied, if the array is chunked or not contiguous.
+    """
+    for chunk in iter_slices(np.shape(array), chunk_size):
+        yield np.ravel(array[chunk])
+
+
+def wire_dtype(dtype):
+    """Get the dtype used for sending an array of the given dtype to the front-end."""
+    dtype = np.dtype(dtype)
+
+    # WebGL does not support float64, and JS does not support int64
+    if dtype == np.float64:
+        return np.dtype(np.float32)
+    if dtype == np.int64:
+        return np.dtype(np.int32)
+
+    return dtype
+
+
+def to_buffer(array, dtype=None, chunk_size=CHUNK_SIZE):
+    """Copy an array source into a new contiguous NumPy array of the given dtype, chunk by chunk.
+
+    The dtype conversion happens chunk-wise, so that the peak memory is the output buffer plus one chunk.
+    """
+    shape = tuple(array.shape)
+    buffer = np.empty(shape, dtype=array.dtype if dtype is None else dtype)
+
+    # Dask chunks are computed in parallel and written into the buffer as they complete
+    if is_dask_array(array):
+        import dask.array as da
+
+        da.store(array.astype(buffer.dtype), buffer, lock=False)
+        return buffer
+
+    for chunk in iter_slices(shape, chunk_size):
+        buffer[chunk] = array[chunk]
+
+    return buffer
+
+
+def min_max(array, chunk_size=CHUNK_SIZE):
+    """Compute the min and max of an array in a single pass, ignoring NaNs.
+
+    Returns ``(None, None)`` if the array is empty or only contains NaNs. Dask arrays are reduced on the dask scheduler.
+    """
+    if is_dask_array(array):
+        import dask
+        import dask.array as da
+
+        # Both reductions share the same graph, so the chunks are only computed once
+        mins, maxs = dask.compute([da.nanmin(array)], [da.nanmax(array)]) if array.size else ([], [])
+    else:
+        mins = []
+        maxs = []
+        for chunk in iter_chunks(array, chunk_size):
+            if chunk.size:
+                mins.append(np.fmin.reduce(chunk))
+                maxs.append(np.fmax.reduce(chunk))
+
+    if not mins or np.isnan(np.fmin.reduce(mins)):
+        return (None, None)
+
+    return (float(np.fmin.reduce(mins)), float(np.fmax.reduce(maxs)))
+
+
+def histogram(array, edges, chunk_size=CHUNK_SIZE):
+    """Compute the counts of the histogram of an array given the bin edges, chunk by chunk."""
+    if is_dask_array(array):
+        import dask.array as da
+
+        return da.histogram(array.ravel(), bins=edges)[0].compute().astype(np.int64)
+
+    counts = np.zeros(len(edges) - 1, dtype=np.int64)
+    for chunk in iter_chunks(array, chunk_size):
+        counts += np.histogram(chunk, bins=edges)[0]
+
+    return counts
+
+
+class ChunkedArray(TraitType):
+    """A trait type for chunked array sources, which are stored as is instead of being loaded in memory."""
+
+    info_text = 'a chunked array (h5py dataset, zarr array...)'
+
+    def validate(self, obj, value):
+        if is_chunked_array(value):
+            return value
+
+        self.error(obj, value)
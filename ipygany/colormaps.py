@@ -40,3 +40,103 @@ colormaps = Bunch(
     Inferno=36,
     Plasma=37
 )
+
+# Matplotlib names of the colormaps, for the ones matplotlib provides
+_matplotlib_names = {
+    name: name for name in [
+        'BrBG', 'PRGn', 'PiYG', 'PuOr', 'RdBu', 'RdGy', 'RdYlBu', 'RdYlGn', 'Spectral', 'BuGn', 'BuPu', 'GnBu', 'OrRd',
+        'PuBuGn', 'PuBu', 'PuRd', 'RdPu', 'YlGnBu', 'YlGn', 'YlOrBr', 'YlOrRd', 'Blues', 'Greens', 'Greys', 'Purples',
+        'Reds', 'Oranges'
+    ]
+}
+_matplotlib_names.update(
+    Cividis='cividis', CubehelixDefault='cubehelix', Turbo='turbo',
+    Viridis='viridis', Magma='magma', Inferno='inferno', Plasma='plasma'
+)
+
+
+def _cubehelix(hue, saturation, lightness):
+    """Convert cubehelix colors into RGB colors between 0 and 1, like d3-color."""
+    import numpy as np
+
+    h = np.radians(hue + 120.)
+    a = saturation * lightness * (1. - lightness)
+    cosh, sinh = np.cos(h), np.sin(h)
+
+    rgb = np.stack((
+        lightness + a * (-0.14861 * cosh + 1.78277 * sinh),
+        lightness + a * (-0.29227 * cosh - 0.90649 * sinh),
+        lightness + a * (1.97294 * cosh),
+    ), axis=1)
+
+    return np.clip(rgb, 0., 1.)
+
+
+def _rainbow(t):
+    import numpy as np
+
+    ts = np.abs(t - 0.5)
+    return _cubehelix(360. * t - 100., 1.5 - 1.5 * ts, 0.8 - 0.9 * ts)
+
+
+def _sinebow(t):
+    import numpy as np
+
+    t = 0.5 - t
+    return np.stack([np.sin(np.pi * (t + offset)) ** 2 for offset in (0., 1. / 3., 2. / 3.)], axis=1)
+
+
+# Colormaps computed like the d3-scale-chromatic interpolators used by the front-end, for the ones matplotlib lacks
+_d3_colormaps = dict(
+    Rainbow=_rainbow,
+    Warm=lambda t: _cubehelix(-100. + 180. * t, 0.75 + 0.75 * t, 0.35 + 0.45 * t),
+    Cool=lambda t: _cubehelix(260. - 180. * t, 0.75 + 0.75 * t, 0.35 + 0.45 * t),
+    Sinebow=_sinebow,
+)
+
+
+def colormap_lut(colormap, size=256):
+    """Sample a colormap, given by name or index, into a ``(size, 3)`` array of RGB bytes.
+
+    This requires matplotlib, except for the Rainbow, Warm, Cool and Sinebow colormaps which are computed like in the
+    browser.
+    """
+    import numpy as np
+
+    name = colormap if isinstance(colormap, str) else next(key for key, value in colormaps.items() if value == colormap)
+    t = np.linspace(0., 1., size)
+
+    if name in _d3_colormaps:
+        colors = _d3_colormaps[name](t)
+    else:
+        try:
+            import matplotlib
+        except ImportError:
+            raise ImportError('Please install ``matplotlib`` to use this feature')
+
+        colors = matplotlib.colormaps[_matplotlib_names[name]](t)[:, :3]
+
+    return np.round(colors * 255.).astype(np.uint8)
+
+
+def apply_colormap(values, min, max, colormap, type='linear'):
+    """Map values onto a colormap like the IsoColor effect, as a ``(n, 3)`` array of RGB bytes.
+
+    Values are normalized in the ``[min, max]`` range, or in the log space if ``type`` is ``'log'``. This may
+    require matplotlib, see ``colormap_lut``.
+    """
+    import numpy as np
+
+    values = np.asarray(values, dtype=np.float64)
+    lo, hi = min, max
+
+    if type == 'log':
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values, lo, hi = np.log(values), np.log(lo), np.log(hi)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = np.nan_to_num(np.clip((values - lo) / (hi - lo), 0., 1.))
+
+    lut = colormap_lut(colormap)
+
+    return lut[np.round(t * (len(lut) - 1)).astype(np.int64)]
@@ -0,0 +1,83 @@
+"""Compact embedding of ipygany widgets in static HTML pages."""
+
+import base64
+import hashlib
+import os
+import zlib
+
+from ipywidgets.embed import dependency_state, embed_minimal_html as _embed_minimal_html
+
+from ._frontend import module_name
+
+
+def _set_path(state, path, value):
+    for key in path[:-1]:
+        state = state[key]
+    state[path[-1]] = value
+
+
+def embed_state(views, directory=None, prefix=None, compress=False, drop_defaults=True):
+    """Get the embeddable state of widgets, the binary buffers of ipygany widgets being stored out of the JSON state.
+
+    Parameters
+    ----------
+    views : widget or list of widgets
+        The widgets to embed, with all the widgets they depend on.
+    directory : str (optional)
+        The directory where the buffers are written as external ``.bin`` files, which the front-end fetches when it
+        loads the widgets. Identical buffers are written only once.
+    prefix : str (optional)
+        The URL prefix of the buffer files, as seen from the HTML page. It defaults to the directory name.
+    compress : bool
+        If no directory is given, buffers are stored in the state as base64 encoded compressed data, identical buffers
+        being stored once and referenced by their hash. Otherwise they are left as is.
+
+    Returns
+    -------
+    dict
+        The state, which can be passed to the ``ipywidgets.embed`` functions.
+    """
+    state = dependency_state(views, drop_defaults=drop_defaults)
+
+    if directory is None and not compress:
+        return state
+
+    if directory is not None:
+        os.makedirs(directory, exist_ok=True)
+        prefix = prefix if prefix is not None else os.path.basename(os.path.normpath(directory)) + '/'
+
+    compressed = set()
+
+    for model in state.values():
+        if model['model_module'] != module_name or 'buffers' not in model:
+            continue
+
+        for buffer in model.pop('buffers'):
+            data = base64.b64decode(buffer['data'])
+            digest = hashlib.sha1(data).hexdigest()
+
+            if directory is not None:
+                name = digest + '.bin'
+                path = os.path.join(directory, name)
+
+                if not os.path.exists(path):
+                    with open(path, 'wb') as f:
+                        f.write(data)
+
+                reference = {'url': prefix + name}
+            elif digest in compressed:
+                reference = {'hash': digest}
+            else:
+                compressed.add(digest)
+                reference = {'compressed': base64.b64encode(zlib.compress(data)).decode('ascii'), 'hash': digest}
+
+            _set_path(model['state'], buffer['path'], reference)
+
+    return state
+
+
+def embed_minimal_html(fp, views, directory=None, prefix=None, compress=False, **kwargs):
+    """Write a minimal HTML file embedding the widgets, see ``embed_state`` for the options."""
+    state = embed_state(views, directory, prefix, compress, kwargs.pop('drop_defaults', True))
+
+    _embed_minimal_html(fp, views, state=state, **kwargs)
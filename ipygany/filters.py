@@ -0,0 +1,599 @@
+"""Vectorized mesh filters evaluated in the kernel."""
+
+import hashlib
+
+import numpy as np
+
+
+def tetrahedron_skin(tetrahedron_indices):
+    """Compute the triangle indices of the boundary of a set of tetrahedrons."""
+    tetrahedron_indices = np.asarray(tetrahedron_indices).reshape(-1, 4)
+
+    # Extract all the triangle indices
+    faces = np.concatenate([
+        tetrahedron_indices[:, [2, 1, 0]],
+        tetrahedron_indices[:, [0, 3, 2]],
+        tetrahedron_indices[:, [1, 3, 0]],
+        tetrahedron_indices[:, [2, 3, 1]]
+    ])
+
+    # Sort triangles indices so that we can compare them and find duplicates
+    sorted_faces = np.sort(faces, axis=1)
+
+    # Get unique triangle indices and the number of times they appear
+    _, unique_index, counts = np.unique(sorted_faces, return_index=True, return_counts=True, axis=0)
+
+    # Extract triangles that appear exactly once
+    return faces[unique_index[counts == 1]]
+
+
+def in_range(values, min, max, inclusive=True):
+    """Return the boolean mask of the values lying between min and max."""
+    values = np.asarray(values)
+
+    if inclusive:
+        return (values >= min) & (values <= max)
+    return (values > min) & (values < max)
+
+
+def threshold_cells(cells, values, min, max, inclusive=True):
+    """Return the boolean mask of the cells for which all the vertex values lie between min and max.
+
+    ``cells`` is a ``(n_cells, n_vertices_per_cell)`` array of vertex indices and ``values`` the per-vertex values.
+    """
+    vertex_mask = in_range(values, min, max, inclusive)
+
+    return np.all(vertex_mask[cells], axis=1)
+
+
+def compact(cells, n_vertices=None):
+    """Drop the vertices that are not referenced by any cell.
+
+    Returns the remapped cells and the indices of the kept vertices, which can be used to slice vertices and data.
+    """
+    cells = np.asarray(cells)
+    used = np.unique(cells)
+
+    if n_vertices is None:
+        n_vertices = used[-1] + 1 if used.size else 0
+
+    remap = np.zeros(n_vertices, dtype=np.uint32)
+    remap[used] = np.arange(used.size, dtype=np.uint32)
+
+    return remap[cells], used
+
+
+# Edges of a tetrahedron, as pairs of local vertex indices
+TETRAHEDRON_EDGES = np.array([[0, 1], [0, 2], [0, 3], [1, 2], [1, 3], [2, 3]])
+
+
+def _marching_tetrahedra_table():
+    """Build the table of the triangles to generate for each of the 16 inside/outside configurations of a tetrahedron.
+
+    Triangles are given as tetrahedron edge indices, unused triangles are filled with -1.
+    """
+    edge_index = {tuple(edge): i for i, edge in enumerate(TETRAHEDRON_EDGES.tolist())}
+
+    def edge(a, b):
+        return edge_index[(min(a, b), max(a, b))]
+
+    table = np.full((16, 2, 3), -1, dtype=np.int64)
+    for case in range(16):
+        inside = [v for v in range(4) if case & (1 << v)]
+        outside = [v for v in range(4) if not case & (1 << v)]
+
+        # One vertex is isolated from the others: one triangle cutting its three edges
+        if len(inside) in (1, 3):
+            lone = inside[0] if len(inside) == 1 else outside[0]
+            table[case, 0] = [edge(lone, v) for v in range(4) if v != lone]
+
+        # Two vertices on each side: a quad made of two triangles
+        if len(inside) == 2:
+            a, b = inside
+            c, d = outside
+            table[case, 0] = [edge(a, c), edge(a, d), edge(b, d)]
+            table[case, 1] = [edge(a, c), edge(b, d), edge(b, c)]
+
+    return table
+
+
+MARCHING_TETRAHEDRA_TABLE = _marching_tetrahedra_table()
+
+
+def interpolate(array, lo, hi, t):
+    """Interpolate per-vertex values on new vertices defined as ``lo + t * (hi - lo)``."""
+    array = np.asarray(array)
+
+    return array[lo] + t * (array[hi] - array[lo])
+
+
+def _weld(a, b, n_vertices):
+    """Weld triangle corners defined as ``(a, b)`` vertex pairs, ``a == b`` for corners lying on existing vertices.
+
+    Returns the ``(lo, hi)`` vertex pairs of the unique corners, and the triangle indices.
+    """
+    keys = np.minimum(a, b).astype(np.uint64) * np.uint64(n_vertices) + np.maximum(a, b).astype(np.uint64)
+    unique_keys, triangles = np.unique(keys.ravel(), return_inverse=True)
+
+    lo = (unique_keys // np.uint64(n_vertices)).astype(np.int64)
+    hi = (unique_keys % np.uint64(n_vertices)).astype(np.int64)
+
+    return lo, hi, triangles.reshape(-1, 3).astype(np.uint32)
+
+
+def _crossing(values, value, lo, hi):
+    """Compute where ``value`` is crossed on the ``(lo, hi)`` edges, as a factor between 0 and 1 (0 if ``lo == hi``)."""
+    delta = values[hi] - values[lo]
+
+    return np.divide(value - values[lo], delta, out=np.zeros(len(lo)), where=lo != hi)
+
+
+def _isosurface_corners(vertices, tetrahedron_indices, values, value):
+    """Run marching tetrahedra, returning the triangle corners as pairs of vertices of the cut edges."""
+    inside = values >= value
+
+    # Classify all the tetrahedrons at once
+    cases = inside[tetrahedron_indices].astype(np.uint8) @ np.array([1, 2, 4, 8], dtype=np.uint8)
+    crossing = (cases != 0) & (cases != 15)
+    tetrahedrons = tetrahedron_indices[crossing]
+
+    triangle_edges = MARCHING_TETRAHEDRA_TABLE[cases[crossing]]
+    valid = triangle_edges[:, :, 0] >= 0
+    owners = np.nonzero(valid)[0]
+    triangle_edges = triangle_edges[valid]
+
+    # Global indices of the end points of the edges cut by each triangle
+    a = np.take_along_axis(tetrahedrons[owners], TETRAHEDRON_EDGES[triangle_edges, 0], axis=1)
+    b = np.take_along_axis(tetrahedrons[owners], TETRAHEDRON_EDGES[triangle_edges, 1], axis=1)
+
+    # Orient triangles so that their normals point towards increasing values
+    t = _crossing(values, value, a.ravel(), b.ravel()).reshape(-1, 3, 1)
+    points = vertices[a] + t * (vertices[b] - vertices[a])
+    normals = np.cross(points[:, 1] - points[:, 0], points[:, 2] - points[:, 0])
+
+    a0, b0 = a[:, 0], b[:, 0]
+    direction = np.where(inside[a0, np.newaxis], vertices[a0] - vertices[b0], vertices[b0] - vertices[a0])
+    flip = np.einsum('ij,ij->i', normals, direction) < 0
+
+    a[flip] = a[flip][:, [0, 2, 1]]
+    b[flip] = b[flip][:, [0, 2, 1]]
+
+    return a, b
+
+
+def _clip_corners(triangle_indices, values, value):
+    """Clip triangles, keeping the parts where values are lower than ``value``.
+
+    Returns the triangle corners as vertex pairs, identical pairs denote existing vertices.
+    """
+    inside = (values <= value)[triangle_indices]
+    count = inside.sum(axis=1)
+
+    full = triangle_indices[count == 3]
+    a = [full]
+    b = [full]
+
+    # Rotate partially kept triangles so that their lone vertex (the only one inside or outside) comes first
+    partial = (count == 1) | (count == 2)
+    one_inside = count[partial] == 1
+    lone = np.argmax(inside[partial] == one_inside[:, np.newaxis], axis=1)
+    rotated = np.take_along_axis(triangle_indices[partial], (lone[:, np.newaxis] + np.arange(3)) % 3, axis=1)
+
+    # The lone vertex is inside: one triangle
+    s, u, w = rotated[one_inside].T
+    a.append(np.stack((s, s, s), axis=1))
+    b.append(np.stack((s, u, w), axis=1))
+
+    # The lone vertex is outside: a quad made of two triangles
+    s, u, w = rotated[~one_inside].T
+    a.extend((np.stack((s, u, w), axis=1), np.stack((s, w, s), axis=1)))
+    b.extend((np.stack((u, u, w), axis=1), np.stack((u, w, w), axis=1)))
+
+    return np.concatenate(a), np.concatenate(b)
+
+
+def _snap(values, value, a, b):
+    """Snap the ``(a, b)`` corners crossing their edge at one of its end points to that vertex.
+
+    The snapped corners become ``(vertex, vertex)`` edges, which are welded with the other corners lying on that vertex.
+    """
+    t = _crossing(values, value, a.ravel(), b.ravel()).reshape(a.shape)
+
+    return np.where(t >= 1., b, a), np.where(t <= 0., a, b)
+
+
+def _weld_surface(a, b, n_vertices):
+    """Weld triangle corners like ``_weld``, removing the collapsed and the duplicated triangles.
+
+    Triangles collapse when some of their corners are snapped to the same vertex, and are duplicated when e.g. a cut
+    face lies on a face of the skin.
+    """
+    lo, hi, triangles = _weld(a, b, n_vertices)
+
+    kept = (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2])
+    triangles = triangles[kept]
+
+    _, unique_index = np.unique(np.sort(triangles, axis=1), return_index=True, axis=0)
+    triangles, ids = compact(triangles[np.sort(unique_index)], len(lo))
+
+    return lo[ids], hi[ids], triangles
+
+
+def _surface(vertices, values, value, a, b):
+    """Weld triangle corners and compute the resulting surface."""
+    lo, hi, triangles = _weld_surface(*_snap(values, value, a, b), len(vertices))
+    t = _crossing(values, value, lo, hi)
+
+    return interpolate(vertices, lo, hi, t[:, np.newaxis]), triangles, (lo, hi, t)
+
+
+def isosurface(vertices, tetrahedron_indices, values, value):
+    """Compute the isosurface of a per-vertex field on a tetrahedral mesh, using marching tetrahedra.
+
+    ``value`` can be a single iso value or a sequence of iso values. Returns the vertices and the triangle indices of the
+    surface, as well as the ``(lo, hi, t)`` interpolation arrays which can be used with ``interpolate`` in order to compute
+    any per-vertex data on the surface.
+    """
+    vertices = np.asarray(vertices).reshape(-1, 3)
+    tetrahedron_indices = np.asarray(tetrahedron_indices).reshape(-1, 4)
+    values = np.asarray(values)
+
+    surfaces = [
+        _surface(vertices, values, v, *_isosurface_corners(vertices, tetrahedron_indices, values, v))
+        for v in np.atleast_1d(value)
+    ]
+
+    offsets = np.cumsum([0] + [len(points) for points, _, _ in surfaces[:-1]])
+
+    return (
+        np.concatenate([points for points, _, _ in surfaces]),
+        np.concatenate([triangles + np.uint32(offset) for (_, triangles, _), offset in zip(surfaces, offsets)]),
+        tuple(np.concatenate(arrays) for arrays in zip(*[interpolation for _, _, interpolation in surfaces]))
+    )
+
+
+def clip(vertices, triangle_indices, values, value=0., tetrahedron_indices=None):
+    """Clip a mesh, keeping the parts where the per-vertex values are lower than ``value``.
+
+    The triangles are cut along the clipping boundary. If ``tetrahedron_indices`` is given, the cut face through the
+    volume is added to the result. The return value is the same as for ``isosurface``.
+    """
+    vertices = np.asarray(vertices).reshape(-1, 3)
+    triangle_indices = np.asarray(triangle_indices).reshape(-1, 3)
+    values = np.asarray(values)
+
+    a, b = _clip_corners(triangle_indices, values, value)
+
+    if tetrahedron_indices is not None:
+        cap_a, cap_b = _isosurface_corners(vertices, np.asarray(tetrahedron_indices).reshape(-1, 4), values, value)
+        a = np.concatenate((a, cap_a))
+        b = np.concatenate((b, cap_b))
+
+    return _surface(vertices, values, value, a, b)
+
+
+def plane_distance(vertices, origin, normal):
+    """Compute the signed distance of the vertices to the plane defined by a point and a normal."""
+    normal = np.asarray(normal, dtype=np.float64)
+
+    return (np.asarray(vertices).reshape(-1, 3) - origin) @ (normal / np.linalg.norm(normal))
+
+
+def clip_plane(vertices, triangle_indices, tetrahedron_indices, origin, normal):
+    """Clip a mesh by a plane, removing the part lying on the side the plane ``normal`` points to, see ``clip``.
+
+    ``tetrahedron_indices`` can be ``None``, otherwise the cut face through the volume is added to the result.
+    """
+    return clip(
+        vertices, triangle_indices, plane_distance(vertices, origin, normal), tetrahedron_indices=tetrahedron_indices
+    )
+
+
+def slice_plane(vertices, triangle_indices, tetrahedron_indices, origin, normal):
+    """Compute the cut face of a tetrahedral mesh by a plane, see ``isosurface``. The triangles are not used."""
+    if tetrahedron_indices is None:
+        raise TypeError('A slice can only be computed from tetrahedrons')
+
+    return isosurface(vertices, tetrahedron_indices, plane_distance(vertices, origin, normal), 0.)
+
+
+def cluster_vertices(vertices, triangle_indices, cell_size):
+    """Simplify a mesh by vertex clustering: the vertices lying in the same cell of a regular grid are merged.
+
+    Returns the new vertices (the mean of each cluster), the triangle indices without the collapsed and duplicated
+    triangles, and the cluster index of each original vertex, which can be used with ``cluster_mean`` in order to
+    compute per-vertex data on the simplified mesh.
+    """
+    vertices = np.asarray(vertices).reshape(-1, 3)
+    triangle_indices = np.asarray(triangle_indices).reshape(-1, 3)
+
+    cells = np.floor((vertices - vertices.min(axis=0)) / cell_size).astype(np.int64)
+    shape = cells.max(axis=0) + 1
+    keys = (cells[:, 0] * shape[1] + cells[:, 1]) * shape[2] + cells[:, 2]
+
+    _, clusters = np.unique(keys, return_inverse=True)
+    clusters = clusters.ravel()
+
+    triangles = clusters[triangle_indices]
+    kept = (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2])
+    triangles = triangles[kept]
+
+    # Several triangles can collapse onto the same clusters
+    _, unique_index = np.unique(np.sort(triangles, axis=1), return_index=True, axis=0)
+    triangles = triangles[np.sort(unique_index)]
+
+    return cluster_mean(vertices, clusters).astype(vertices.dtype), triangles.astype(np.uint32), clusters
+
+
+def cluster_mean(array, clusters):
+    """Average per-vertex values over the clusters computed by ``cluster_vertices``."""
+    array = np.asarray(array)
+    counts = np.bincount(clusters)
+
+    if array.ndim == 1:
+        return np.bincount(clusters, weights=array) / counts
+
+    return np.stack([np.bincount(clusters, weights=column) for column in array.T], axis=1) / counts[:, np.newaxis]
+
+
+class CellToPoint:
+    """Mapping of cell values onto points, each point getting the average value of the cells it belongs to.
+
+    The scatter indices and weights only depend on the topology, so that mapping new values (e.g. another time step of
+    the same mesh) costs a single weighted ``np.bincount``. Points which belong to no cell get NaN values.
+    """
+
+    def __init__(self, connectivity, offsets, n_points):
+        """Build the mapping of cells given as a flat ``connectivity`` array of point indices and the ``n_cells + 1``
+        ``offsets`` of the cells in it (the VTK 9 cell array layout)."""
+        offsets = np.asarray(offsets, dtype=np.int64)
+
+        self.n_points = n_points
+        self.n_cells = len(offsets) - 1
+
+        self.point_ids = np.asarray(connectivity)[offsets[0]:offsets[-1]].astype(np.int64, copy=False)
+        self.cell_ids = np.repeat(np.arange(self.n_cells), np.diff(offsets))
+        self.topology = self._topology(self.point_ids, offsets - offsets[0])
+
+        counts = np.bincount(self.point_ids, minlength=n_points)
+        with np.errstate(divide='ignore'):
+            self.weights = np.where(counts > 0, 1. / counts, np.nan)
+
+    @staticmethod
+    def _topology(point_ids, offsets):
+        digest = hashlib.sha1(np.ascontiguousarray(offsets))
+        digest.update(np.ascontiguousarray(point_ids))
+
+        return digest.hexdigest()
+
+    def matches(self, connectivity, offsets, n_points):
+        """Check whether the mapping was built for these cells, comparing a hash of the connectivity and offsets."""
+        offsets = np.asarray(offsets, dtype=np.int64)
+        point_ids = np.asarray(connectivity)[offsets[0]:offsets[-1]].astype(np.int64, copy=False)
+
+        if n_points != self.n_points or len(offsets) - 1 != self.n_cells or len(point_ids) != len(self.point_ids):
+            return False
+
+        return self._topology(point_ids, offsets - offsets[0]) == self.topology
+
+    @staticmethod
+    def from_cells(cells, n_points):
+        """Build the mapping of cells with the same number of points, given as a ``(n_cells, k)`` array."""
+        cells = np.asarray(cells)
+
+        return CellToPoint(cells.ravel(), np.arange(len(cells) + 1) * cells.shape[1], n_points)
+
+    def __call__(self, cell_values):
+        """Map ``(n_cells,)`` values onto the points."""
+        cell_values = np.asarray(cell_values).ravel()
+        if len(cell_values) != self.n_cells:
+            raise ValueError('Expected {} cell values, got {}'.format(self.n_cells, len(cell_values)))
+
+        return np.bincount(self.point_ids, weights=cell_values[self.cell_ids], minlength=self.n_points) * self.weights
+
+
+class VertexNormals:
+    """Area-weighted vertex normals of a triangle mesh.
+
+    The incidence of the triangles on the vertices (the vertex of each triangle corner, as native integers) only depends
+    on the topology and is computed once, so that the normals of deformed versions of the mesh are summed with one
+    weighted ``np.bincount`` per axis, which is faster than ``np.add.at``.
+    """
+
+    def __init__(self, triangle_indices, n_vertices):
+        self.triangles = np.asarray(triangle_indices).reshape(-1, 3).astype(np.intp)
+        self.n_vertices = n_vertices
+
+        # Corners ordered by corner index first, matching np.tile of the face normals
+        self.corner_vertices = self.triangles.T.ravel()
+
+    def __call__(self, vertices):
+        """Compute the ``(n, 3)`` unit normals, vertices which belong to no triangle getting null normals."""
+        vertices = np.asarray(vertices).reshape(-1, 3)
+        a, b, c = (vertices[self.triangles[:, i]] for i in range(3))
+
+        # The norm of the cross product is twice the area of the triangle
+        face_normals = np.cross(b - a, c - a)
+
+        normals = np.stack([
+            np.bincount(self.corner_vertices, weights=np.tile(face_normals[:, axis], 3), minlength=self.n_vertices)
+            for axis in range(3)
+        ], axis=1)
+
+        norms = np.linalg.norm(normals, axis=1, keepdims=True)
+
+        return np.divide(normals, norms, out=np.zeros_like(normals), where=norms > 0)
+
+
+def _row_digits(columns, available_bits):
+    """Split and pack integer columns into digits of at most ``available_bits`` bits, most significant first, so that
+    rows are equal if and only if all their digits are equal."""
+    pieces = []
+    for column in columns:
+        column = column.astype(np.uint64, copy=False)
+        column = column - column.min()
+
+        # Drop the low bits which are null in all the rows, e.g. for float32 coordinates stored as float64
+        low_bits = int(np.bitwise_or.reduce(column))
+        if low_bits:
+            column >>= np.uint64((low_bits & -low_bits).bit_length() - 1)
+
+        width = int(column.max()).bit_length()
+
+        while width > available_bits:
+            width -= available_bits
+            pieces.append((column >> np.uint64(width), available_bits))
+            column = column & np.uint64((1 << width) - 1)
+        pieces.append((column, width))
+
+    digits = []
+    digit, digit_width = pieces[0]
+    for piece, width in pieces[1:]:
+        if digit_width + width <= available_bits:
+            digit = (digit << np.uint64(width)) | piece
+            digit_width += width
+        else:
+            digits.append(digit)
+            digit, digit_width = piece, width
+    digits.append(digit)
+
+    return digits
+
+
+def _sort_rows(digits, index_bits):
+    """Get the stable permutation sorting rows by their digits, most significant first, and the sorted first digit.
+
+    This is a LSD radix sort: each digit is sorted with one ``np.sort`` of the digit packed with the current position,
+    which is several times faster than ``np.argsort`` and stable.
+    """
+    n = len(digits[0])
+    positions = np.arange(n, dtype=np.uint64)
+    shift = np.uint64(index_bits)
+
+    order = None
+    for digit in reversed(digits):
+        packed = (digit if order is None else digit[order]) << shift
+        packed |= positions
+        packed.sort()
+
+        sorted_positions = (packed & np.uint64((1 << index_bits) - 1)).astype(np.intp)
+        order = sorted_positions if order is None else order[sorted_positions]
+
+    return order, packed >> shift
+
+
+class VertexWelding:
+    """Merging of the duplicated vertices of a triangle soup, e.g. read from an STL file.
+
+    Positions are compared exactly, or rounded on a grid of ``tolerance`` spacing (vertices closer than the tolerance
+    can still be rounded to different grid points), and the vertices are grouped with a radix sort of the packed
+    coordinates. Welded vertices are ordered and positioned as their first occurrence, and per-vertex values are merged
+    by averaging them over the merged vertices.
+    """
+
+    def __init__(self, vertices, tolerance=0.):
+        vertices = np.asarray(vertices).reshape(-1, 3)
+
+        self.n_input = len(vertices)
+        self.tolerance = tolerance
+
+        if not self.n_input:
+            self.n_vertices = 0
+            self.inverse = np.empty(0, dtype=np.int64)
+            self.vertices = vertices
+            return
+
+        if tolerance > 0:
+            origin = vertices.min(axis=0).astype(np.float64)
+            columns = [np.rint((vertices[:, axis] - origin[axis]) / tolerance) for axis in range(3)]
+        else:
+            columns = [np.ascontiguousarray(vertices[:, axis]) for axis in range(3)]
+
+            if vertices.dtype.kind == 'f':
+                # Compare the bits of the coordinates, adding zero turns -0. into 0.
+                columns = [
+                    (column + column.dtype.type(0)).view('u{}'.format(column.dtype.itemsize)) for column in columns
+                ]
+
+        index_bits = max(int(self.n_input - 1).bit_length(), 1)
+        digits = _row_digits(columns, 64 - index_bits)
+        order, first_digit = _sort_rows(digits, index_bits)
+
+        # Flag the first row of each group of equal rows in the sorted order
+        first = np.empty(self.n_input, dtype=bool)
+        first[0] = True
+        np.not_equal(first_digit[1:], first_digit[:-1], out=first[1:])
+        for digit in digits[1:]:
+            digit = digit[order]
+            first[1:] |= digit[1:] != digit[:-1]
+
+        # The sort being stable, the first vertex of each group is its first occurrence in the input
+        first_occurrences = order[first]
+        self.n_vertices = len(first_occurrences)
+
+        is_first = np.zeros(self.n_input, dtype=bool)
+        is_first[first_occurrences] = True
+        numbers = (np.cumsum(is_first) - 1)[first_occurrences]
+
+        self.inverse = np.empty(self.n_input, dtype=np.int64)
+        self.inverse[order] = numbers[np.cumsum(first) - 1]
+
+        self.vertices = np.empty((self.n_vertices, 3), dtype=vertices.dtype)
+        self.vertices[numbers] = vertices[first_occurrences]
+
+    @property
+    def ratio(self):
+        """The reduction ratio, the number of input vertices over the number of welded vertices."""
+        return self.n_input / self.n_vertices if self.n_vertices else 1.
+
+    def triangles(self, triangle_indices=None):
+        """Remap triangle indices onto the welded vertices, the input being a soup of consecutive triangles if
+        ``triangle_indices`` is ``None``. Triangles collapsed by the tolerance are removed."""
+        if triangle_indices is None:
+            triangles = self.inverse.reshape(-1, 3)
+        else:
+            triangles = self.inverse[np.asarray(triangle_indices).reshape(-1, 3)]
+
+        if self.tolerance > 0:
+            triangles = triangles[
+                (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) & (triangles[:, 0] != triangles[:, 2])
+            ]
+
+        return triangles.astype(np.uint32).ravel()
+
+    def __call__(self, values):
+        """Merge per-vertex values of the input, as the mean over the merged vertices."""
+        values = np.asarray(values)
+        if len(values) != self.n_input:
+            raise ValueError('Expected {} values, got {}'.format(self.n_input, len(values)))
+
+        merged = cluster_mean(values, self.inverse) if self.n_input else values
+
+        return merged.astype(values.dtype, copy=False) if values.dtype.kind == 'f' else merged
+
+
+def oct_encode(normals):
+    """Encode unit normals into two signed bytes each, using the octahedral mapping."""
+    normals = np.asarray(normals, dtype=np.float64).reshape(-1, 3)
+
+    norm1 = np.abs(normals).sum(axis=1, keepdims=True)
+    p = np.divide(normals[:, :2], norm1, out=np.zeros((len(normals), 2)), where=norm1 > 0)
+
+    # Fold the lower hemisphere onto the outer triangles of the square
+    lower = normals[:, 2] < 0
+    p[lower] = (1. - np.abs(p[lower][:, ::-1])) * np.where(p[lower] >= 0., 1., -1.)
+
+    return np.round(p * 127.).astype(np.int8)
+
+
+def oct_decode(encoded):
+    """Decode normals encoded by ``oct_encode``."""
+    p = np.asarray(encoded, dtype=np.float64).reshape(-1, 2) / 127.
+
+    z = 1. - np.abs(p).sum(axis=1)
+    t = np.clip(-z, 0., None)[:, np.newaxis]
+    xy = p - np.where(p >= 0., t, -t)
+
+    normals = np.concatenate((xy, z[:, np.newaxis]), axis=1)
+
+    return normals / np.linalg.norm(normals, axis=1, keepdims=True)
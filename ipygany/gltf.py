@@ -0,0 +1,314 @@
+"""Export of blocks to binary glTF (``.glb``) files."""
+
+import hashlib
+import json
+import re
+import struct
+
+import numpy as np
+
+from .chunked import CHUNK_SIZE, iter_slices
+from .colormaps import apply_colormap
+
+# glTF constants
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+
+COMPONENT_TYPES = {
+    np.dtype(np.uint8): 5121,
+    np.dtype(np.uint16): 5123,
+    np.dtype(np.uint32): 5125,
+    np.dtype(np.float32): 5126,
+}
+
+ACCESSOR_TYPES = {1: 'SCALAR', 2: 'VEC2', 3: 'VEC3', 4: 'VEC4'}
+
+TRIANGLES = 4
+POINTS = 0
+
+
+class _BinaryChunk:
+    """Layout of the binary chunk of a GLB file.
+
+    Arrays are added with a conversion function applied chunk by chunk, so that no full-size intermediate copy is
+    created. The converted chunks are only hashed when the array is added, identical buffer views being only stored
+    once, and converted again when the file is written.
+    """
+
+    def __init__(self, chunk_size=CHUNK_SIZE):
+        self.chunk_size = chunk_size
+        self.views = []
+        self.sources = []
+        self.length = 0
+
+        self._hashes = {}
+
+    def _chunks(self, array, convert):
+        for chunk in iter_slices(np.shape(array), self.chunk_size):
+            yield np.ascontiguousarray(convert(array[chunk]))
+
+    def add(self, array, convert, target, stride=None):
+        """Add a buffer view holding ``convert(array)``, returning its index."""
+        digest = hashlib.sha1()
+        length = 0
+        for converted in self._chunks(array, convert):
+            digest.update(converted)
+            length += converted.nbytes
+
+        key = (digest.hexdigest(), target, stride)
+        if key in self._hashes:
+            return self._hashes[key]
+
+        # Buffer views are aligned on 4 bytes
+        offset = (self.length + 3) // 4 * 4
+        view = {'buffer': 0, 'byteOffset': offset, 'byteLength': length, 'target': target}
+        if stride is not None:
+            view['byteStride'] = stride
+
+        self.views.append(view)
+        self.sources.append((array, convert))
+        self.length = offset + length
+
+        self._hashes[key] = len(self.views) - 1
+        return self._hashes[key]
+
+    def write(self, file):
+        """Write the buffer views into ``file``, padded to 4 bytes."""
+        position = 0
+        for view, (array, convert) in zip(self.views, self.sources):
+            file.write(b'\0' * (view['byteOffset'] - position))
+
+            for converted in self._chunks(array, convert):
+                file.write(converted.data)
+            position = view['byteOffset'] + view['byteLength']
+
+        file.write(b'\0' * ((4 - position % 4) % 4))
+
+
+def _padded(array, dtype):
+    """Cast a chunk of rows and pad them with zeros so that each row is aligned on 4 bytes."""
+    array = np.asarray(array, dtype=dtype).reshape(len(array), -1)
+    columns = -(-array.shape[1] * array.itemsize // 4) * 4 // array.itemsize
+
+    if columns == array.shape[1]:
+        return array
+
+    padded = np.zeros((len(array), columns), dtype=dtype)
+    padded[:, :array.shape[1]] = array
+
+    return padded
+
+
+def _bounds(array, chunk_size=CHUNK_SIZE):
+    """Compute the per-column min and max of a ``(n, k)`` array, chunk by chunk."""
+    if not len(array):
+        return np.zeros(array.shape[1]), np.zeros(array.shape[1])
+
+    lo = np.full(array.shape[1], np.inf)
+    hi = np.full(array.shape[1], -np.inf)
+
+    for chunk in iter_slices(array.shape, chunk_size):
+        lo = np.fmin(lo, np.min(array[chunk], axis=0, initial=np.inf))
+        hi = np.fmax(hi, np.max(array[chunk], axis=0, initial=-np.inf))
+
+    return lo, hi
+
+
+def _linear(srgb):
+    """Convert sRGB colors between 0 and 1 into linear colors, as expected by glTF."""
+    srgb = np.asarray(srgb, dtype=np.float64)
+
+    return np.where(srgb <= 0.04045, srgb / 12.92, ((srgb + 0.055) / 1.055) ** 2.4)
+
+
+def _color_factor(color):
+    if isinstance(color, str) and re.fullmatch('#[0-9a-fA-F]{6}', color):
+        return list(_linear([int(color[i:i + 2], 16) / 255. for i in (1, 3, 5)])) + [1.]
+
+    return [1., 1., 1., 1.]
+
+
+def _attribute_name(data_name, component_name):
+    """Custom glTF attribute names should start with an underscore."""
+    return '_' + re.sub('[^0-9A-Za-z]', '_', '{}_{}'.format(data_name, component_name)).upper()
+
+
+def _iso_colors(effect, mesh):
+    """Compute the per-vertex RGB colors between 0 and 1 of an IsoColor effect, the input being looked up by name on
+    ``mesh``."""
+    from .ipygany import Component, _component_array, _vertices_array
+
+    component = effect._input_components()[0]
+
+    if isinstance(component, Component):
+        key = next(
+            (data.name, c.name) for data in effect.data for c in data.components if c is component
+        )
+        values = _component_array(mesh[key])
+    else:
+        values = np.full(len(_vertices_array(mesh)), component, dtype=np.float64)
+
+    return apply_colormap(values, effect.min, effect.max, effect.colormap, effect.type) / 255.
+
+
+def _resolve(block):
+    """Get the block holding the topology and data of ``block``, its displayed vertices, and its RGB colors between 0
+    and 1 (or ``None``).
+
+    Effects are evaluated in the kernel, see ``Effect.evaluate``. The ones which cannot be (e.g. ``IsoSurface``) are
+    resolved as the geometry of their source, colored by the first ``IsoColor`` of the chain if any.
+    """
+    from .ipygany import Effect, IsoColor, Glyphs, _vertices_array
+
+    mesh = block.source if isinstance(block, Effect) else block
+
+    if isinstance(mesh, Glyphs):
+        mesh = mesh.extract()
+    elif block.can_evaluate:
+        evaluation = block.evaluate()
+        return mesh, evaluation.vertices, evaluation.colors
+
+    iso_color = None
+    current = block
+    while isinstance(current, Effect):
+        if isinstance(current, IsoColor) and iso_color is None:
+            iso_color = current
+        current = current.parent
+
+    return mesh, _vertices_array(mesh), _iso_colors(iso_color, mesh) if iso_color is not None else None
+
+
+def export_glb(blocks, path, quantize=False, bake_colors=True, chunk_size=CHUNK_SIZE):
+    """Export blocks into a binary glTF file.
+
+    The ``vertices``, ``triangle_indices`` and ``Component`` arrays are written as binary buffer views, identical arrays
+    being written only once. Components are written as custom ``_DATA_COMPONENT`` vertex attributes.
+
+    Parameters
+    ----------
+    blocks : list
+        The blocks to export. Effects are evaluated in the kernel (see ``Effect.evaluate``): warps move the vertices,
+        and ``IsoColor`` or ``RGB`` colors are baked as vertex colors if ``bake_colors`` is ``True`` (most ``IsoColor``
+        colormaps require matplotlib). Effects which cannot be evaluated are exported as the geometry of their source.
+    path : str or file
+        The output path, or a binary file object.
+    quantize : bool
+        If ``True``, vertices are quantized on 16 bits (using the ``KHR_mesh_quantization`` extension), as well as
+        components, for which the range is written in the accessor ``extras``.
+    """
+    from .ipygany import PointCloud, _component_array
+
+    binary = _BinaryChunk(chunk_size)
+    accessors = []
+    meshes = []
+    nodes = []
+    materials = []
+
+    def accessor(view, dtype, count, n_components, **kwargs):
+        accessors.append(dict(
+            bufferView=view, componentType=COMPONENT_TYPES[np.dtype(dtype)], count=count,
+            type=ACCESSOR_TYPES[n_components], **kwargs
+        ))
+        return len(accessors) - 1
+
+    for block in blocks:
+        mesh, vertices, colors = _resolve(block)
+        node = {'mesh': len(meshes)}
+
+        lo, hi = _bounds(vertices, chunk_size)
+        attributes = {}
+        extras = {}
+
+        if quantize:
+            scale = np.where(hi > lo, (hi - lo) / 65535., 1.)
+            node.update(translation=lo.tolist(), scale=scale.tolist())
+
+            view = binary.add(vertices, lambda chunk: _padded(np.round((chunk - lo) / scale), np.uint16), ARRAY_BUFFER, 8)
+            attributes['POSITION'] = accessor(
+                view, np.uint16, len(vertices), 3, min=[0, 0, 0], max=np.round((hi - lo) / scale).astype(int).tolist()
+            )
+        else:
+            view = binary.add(vertices, lambda chunk: chunk.astype(np.float32), ARRAY_BUFFER)
+            attributes['POSITION'] = accessor(view, np.float32, len(vertices), 3, min=lo.tolist(), max=hi.tolist())
+
+        for data in mesh.data:
+            for component in data.components:
+                array = _component_array(component)
+                name = _attribute_name(data.name, component.name)
+                extras[name] = [data.name, component.name]
+
+                if quantize:
+                    c_lo, c_hi = component.min, component.max
+                    c_scale = (c_hi - c_lo) / 65535. if c_lo is not None and c_hi > c_lo else 1.
+                    c_lo = c_lo if c_lo is not None else 0.
+
+                    view = binary.add(
+                        array, lambda chunk, c_lo=c_lo, c_scale=c_scale: _padded(np.round((np.nan_to_num(chunk) - c_lo) / c_scale), np.uint16),
+                        ARRAY_BUFFER, 4
+                    )
+                    attributes[name] = accessor(
+                        view, np.uint16, len(array), 1, normalized=True, extras={'min': c_lo, 'max': c_lo + 65535. * c_scale}
+                    )
+                else:
+                    view = binary.add(array, lambda chunk: chunk.astype(np.float32), ARRAY_BUFFER)
+                    attributes[name] = accessor(view, np.float32, len(array), 1)
+
+        material = {'pbrMetallicRoughness': {'baseColorFactor': _color_factor(mesh.default_color), 'metallicFactor': 0.}}
+
+        if colors is not None and bake_colors:
+            # Linear colors, as expected by glTF
+            rgba = np.full((len(colors), 4), 255, dtype=np.uint8)
+            rgba[:, :3] = np.round(_linear(np.clip(colors, 0., 1.)) * 255.)
+            attributes['COLOR_0'] = accessor(binary.add(rgba, lambda chunk: chunk, ARRAY_BUFFER), np.uint8, len(rgba), 4, normalized=True)
+            material['pbrMetallicRoughness']['baseColorFactor'] = [1., 1., 1., 1.]
+
+        primitive = {'attributes': attributes, 'material': len(materials)}
+        materials.append(material)
+
+        if isinstance(mesh, PointCloud):
+            primitive['mode'] = POINTS
+        else:
+            primitive['mode'] = TRIANGLES
+
+            triangle_indices = np.asarray(mesh.triangle_indices).reshape(-1, 1)
+            dtype = np.uint16 if len(vertices) < 65535 and quantize else np.uint32
+            view = binary.add(triangle_indices, lambda chunk, dtype=dtype: chunk.astype(dtype), ELEMENT_ARRAY_BUFFER)
+            primitive['indices'] = accessor(view, dtype, len(triangle_indices), 1)
+
+        meshes.append({
+            'name': type(mesh).__name__,
+            'primitives': [primitive],
+            'extras': {'data': extras},
+        })
+        nodes.append(node)
+
+    gltf = {
+        'asset': {'version': '2.0', 'generator': 'ipygany'},
+        'scene': 0,
+        'scenes': [{'nodes': list(range(len(nodes)))}],
+        'nodes': nodes,
+        'meshes': meshes,
+        'materials': materials,
+        'accessors': accessors,
+        'bufferViews': binary.views,
+        'buffers': [{'byteLength': binary.length}],
+    }
+    if quantize:
+        gltf['extensionsUsed'] = gltf['extensionsRequired'] = ['KHR_mesh_quantization']
+
+    header = json.dumps(gltf, separators=(',', ':')).encode('utf-8')
+    header += b' ' * ((4 - len(header) % 4) % 4)
+    binary_length = (binary.length + 3) // 4 * 4
+
+    def write(file):
+        file.write(struct.pack('<4sII', b'glTF', 2, 12 + 8 + len(header) + 8 + binary_length))
+        file.write(struct.pack('<I4s', len(header), b'JSON'))
+        file.write(header)
+        file.write(struct.pack('<I4s', binary_length, b'BIN\0'))
+        binary.write(file)
+
+    if isinstance(path, str):
+        with open(path, 'wb') as file:
+            write(file)
+    else:
+        write(path)
@@ -0,0 +1,92 @@
+"""Glyph templates and instancing helpers."""
+
+import numpy as np
+
+
+def arrow(sides=8, shaft_radius=0.03, tip_radius=0.08, tip_length=0.25):
+    """Create an arrow glyph of length 1 pointing along the z axis, starting at the origin.
+
+    Returns the ``(n, 3)`` vertices and ``(n_triangles, 3)`` triangle indices of the template.
+    """
+    angles = np.linspace(0., 2. * np.pi, sides, endpoint=False)
+    circle = np.stack((np.cos(angles), np.sin(angles), np.zeros(sides)), axis=1)
+
+    shaft_top = 1. - tip_length
+    vertices = np.concatenate((
+        circle * shaft_radius,
+        circle * shaft_radius + (0., 0., shaft_top),
+        circle * tip_radius + (0., 0., shaft_top),
+        [(0., 0., 0.), (0., 0., shaft_top), (0., 0., 1.)],
+    )).astype(np.float32)
+
+    bottom, top, tip_base = np.arange(sides), np.arange(sides) + sides, np.arange(sides) + 2 * sides
+    bottom_center, tip_center, tip = 3 * sides, 3 * sides + 1, 3 * sides + 2
+    following = np.roll(np.arange(sides), -1)
+
+    triangles = np.concatenate((
+        # Shaft
+        np.stack((bottom, bottom[following], top[following]), axis=1),
+        np.stack((bottom, top[following], top), axis=1),
+        # Caps
+        np.stack((np.full(sides, bottom_center), bottom[following], bottom), axis=1),
+        np.stack((np.full(sides, tip_center), tip_base[following], tip_base), axis=1),
+        # Tip
+        np.stack((tip_base, tip_base[following], np.full(sides, tip)), axis=1),
+    )).astype(np.uint32)
+
+    return vertices, triangles
+
+
+def subsample(n_points, stride=1, max_glyphs=None, random=False, seed=None):
+    """Select the points where glyphs are drawn.
+
+    Every ``stride``-th point is kept, then at most ``max_glyphs`` of them, evenly spaced or picked at random.
+    """
+    ids = np.arange(0, n_points, stride)
+
+    if max_glyphs is not None and len(ids) > max_glyphs:
+        if random:
+            ids = np.sort(np.random.default_rng(seed).choice(ids, max_glyphs, replace=False))
+        else:
+            ids = ids[np.linspace(0, len(ids) - 1, max_glyphs).astype(np.int64)]
+
+    return ids
+
+
+def rotations(orientations):
+    """Compute the ``(n, 3, 3)`` rotation matrices mapping the z axis onto the given unit vectors."""
+    orientations = np.asarray(orientations, dtype=np.float64).reshape(-1, 3)
+    x, y, z = orientations.T
+
+    # Rodrigues' formula for the rotation of axis (z_axis x orientation), singular when orientation is -z
+    opposite = z < -1. + 1e-9
+    k = 1. / np.where(opposite, 1., 1. + z)
+
+    matrices = np.empty((len(orientations), 3, 3))
+    matrices[:, 0] = np.stack((1. - k * x * x, -k * x * y, x), axis=1)
+    matrices[:, 1] = np.stack((-k * x * y, 1. - k * y * y, y), axis=1)
+    matrices[:, 2] = np.stack((-x, -y, z), axis=1)
+
+    # Half turn around the x axis
+    matrices[opposite] = np.diag([1., -1., -1.])
+
+    return matrices
+
+
+def expand(template_vertices, template_triangle_indices, positions, orientations, scales):
+    """Build the explicit geometry of all the glyph instances.
+
+    Returns the vertices and the triangle indices, the vertices of instance ``i`` being ``template_vertices`` scaled by
+    ``scales[i]``, rotated from the z axis onto ``orientations[i]`` and translated to ``positions[i]``.
+    """
+    template_vertices = np.asarray(template_vertices).reshape(-1, 3)
+    template_triangle_indices = np.asarray(template_triangle_indices).reshape(-1, 3)
+    positions = np.asarray(positions).reshape(-1, 3)
+
+    vertices = np.einsum('nij,vj->nvi', rotations(orientations), template_vertices)
+    vertices = vertices * np.asarray(scales).reshape(-1, 1, 1) + positions[:, np.newaxis]
+
+    offsets = np.arange(len(positions), dtype=np.uint32) * np.uint32(len(template_vertices))
+    triangle_indices = template_triangle_indices[np.newaxis] + offsets[:, np.newaxis, np.newaxis]
+
+    return vertices.reshape(-1, 3).astype(np.float32), triangle_indices.reshape(-1, 3).astype(np.uint32)
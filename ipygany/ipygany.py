@@ -1,16 +1,20 @@
 """Scientific Visualization in Jupyter."""
 
 from array import array
+from collections import namedtuple
+from contextlib import contextmanager, ExitStack
+import threading
+import weakref
 
 import numpy as np
 
 from traitlets import (
-    Bool, Dict, Enum, Unicode, List, Instance, CFloat, Tuple, TraitError, Union, default, validate, Any,
+    Bool, Dict, Enum, Unicode, List, Instance, CFloat, Int, Tuple, TraitError, Union, default, validate, observe, Any,
 )
 from traittypes import Array
 from ipywidgets import (
     widget_serialization,
-    DOMWidget, Widget,
+    DOMWidget, Widget, CallbackDispatcher,
     Color, Image
 )
 
@@ -18,10 +22,37 @@ from .serialization import array_serialization, data_array_serialization
 
 from ._frontend import module_version, module_name
 
-from .colormaps import colormaps
+from .colormaps import colormaps, apply_colormap
+
+from .bvh import BVH
+
+from .statistics import Statistics
+
+from .chunked import ChunkedArray, is_chunked_array
+
+from .partition import MeshPartition
+
+from .glyphs import arrow, subsample, expand
+
+from . import volume
+
+from .gltf import export_glb
+
+from .raster import render_png
+
+from .streamlines import TetrahedronLocator, integrate_streamlines, tubes
+
+from .filters import (
+    tetrahedron_skin, in_range, threshold_cells, compact, isosurface, clip_plane, slice_plane, interpolate,
+    cluster_vertices, cluster_mean, CellToPoint, VertexNormals, VertexWelding, oct_encode
+)
 
 FLOAT32 = 'f'
 UINT32 = 'I'
+INT8 = 'b'
+
+# vtk cell type of tetrahedrons
+VTK_TETRA = 10
 
 
 class _GanyWidgetBase(Widget):
@@ -44,20 +75,61 @@ class Component(_GanyWidgetBase):
     _model_name = Unicode('ComponentModel').tag(sync=True)
 
     name = Unicode().tag(sync=True)
-    array = Union((Instance(Widget), Array())).tag(sync=True, **data_array_serialization)
+    array = Union((Instance(Widget), ChunkedArray(), Array())).tag(sync=True, **data_array_serialization)
 
-    min = CFloat(allow_none=True, default_value=None)
-    max = CFloat(allow_none=True, default_value=None)
+    # Bounds overriding the ones of the array statistics, followed by the auto-ranged effects
+    _min = CFloat(allow_none=True, default_value=None)
+    _max = CFloat(allow_none=True, default_value=None)
 
-    def __init__(self, name, array, **kwargs):
-        """Create a new Component instance given its name and array."""
-        super(Component, self).__init__(name=name, array=array, **kwargs)
+    def __init__(self, name, array, min=None, max=None, **kwargs):
+        """Create a new Component instance given its name and array.
 
-        if self.min is None:
-            self.min = np.min(self.array) if not isinstance(self.array, Widget) else np.min(self.array.array)
+        ``min`` and ``max`` override the bounds computed from the array statistics.
+        """
+        self._statistics = None
+
+        super(Component, self).__init__(name=name, array=array, _min=min, _max=max, **kwargs)
 
-        if self.max is None:
-            self.max = np.max(self.array) if not isinstance(self.array, Widget) else np.max(self.array.array)
+    @property
+    def statistics(self):
+        """Get the statistics of the array, computed lazily and cached until the array changes."""
+        if self._statistics is None:
+            values = self.array if not isinstance(self.array, Widget) else self.array.array
+            self._statistics = Statistics(values)
+
+        return self._statistics
+
+    @property
+    def min(self):
+        """Get the minimum value, ``None`` if the array is empty."""
+        return self.statistics.min if self._min is None else self._min
+
+    @min.setter
+    def min(self, value):
+        self._min = value
+
+    @property
+    def max(self):
+        """Get the maximum value, ``None`` if the array is empty."""
+        return self.statistics.max if self._max is None else self._max
+
+    @max.setter
+    def max(self, value):
+        self._max = value
+
+    def percentile(self, q):
+        """Compute percentiles of the array values, ignoring NaNs."""
+        return self.statistics.percentile(q)
+
+    @observe('array')
+    def _reset_statistics(self, change):
+        self._statistics = None
+
+        # Also watch the array of NDArrayWidgets
+        if isinstance(change['old'], Widget):
+            change['old'].unobserve(self._reset_statistics, 'array')
+        if isinstance(change['new'], Widget):
+            change['new'].observe(self._reset_statistics, 'array')
 
 
 class Data(_GanyWidgetBase):
@@ -117,6 +189,80 @@ def _grid_data_to_data_widget(grid_data):
     return data
 
 
+def _pyvista_dataset(obj):
+    """Get the pyvista module and ``obj`` wrapped as a pyvista dataset."""
+    try:
+        import pyvista as pv
+    except ImportError:
+        raise ImportError('Please install ``pyvista`` to use this feature')
+
+    # attempt to wrap non-pyvista objects
+    if pv.is_pyvista_dataset(obj):
+        return pv, obj
+
+    mesh = pv.wrap(obj)
+    if not pv.is_pyvista_dataset(mesh):
+        raise TypeError(f'Object type ({type(mesh)}) cannot be converted to '
+                        'a pyvista dataset')
+
+    return pv, mesh
+
+
+def _pyvista_data(dataset):
+    """Turn the point data of a pyvista dataset into Data widgets, without copying the arrays."""
+    point_data = dataset.point_data if hasattr(dataset, 'point_data') else dataset.point_arrays
+    vtk_point_data = dataset.GetPointData()
+
+    data = []
+    for name in point_data.keys():
+        values = np.asarray(point_data[name])
+
+        # Ignore string and boolean arrays
+        if values.dtype.kind not in ['u', 'i', 'f']:
+            continue
+
+        values = values.reshape(len(values), -1)
+        vtk_array = vtk_point_data.GetAbstractArray(name)
+
+        components = []
+        for i in range(values.shape[1]):
+            component_name = vtk_array.GetComponentName(i) if vtk_array is not None else None
+            component_name = 'X' + str(i + 1) if component_name is None else component_name
+
+            components.append(Component(component_name, values[:, i]))
+
+        data.append(Data(name, components))
+
+    return data
+
+
+def _component_array(component):
+    """Get the array of a Component widget as a NumPy array."""
+    if isinstance(component.array, Widget):
+        return np.asarray(component.array.array).ravel()
+
+    return np.asarray(component.array)
+
+
+def _derived_data_widgets(data, transform):
+    """Create new Data widgets applying ``transform`` to every component array of ``data``."""
+    return [
+        Data(d.name, [Component(c.name, transform(_component_array(c))) for c in d.components])
+        for d in data
+    ]
+
+
+@contextmanager
+def _hold_sync(block):
+    """Hold the syncs of a block and of its components, so that the new geometry and data are sent together."""
+    with ExitStack() as stack:
+        stack.enter_context(block.hold_sync())
+        for data in block.data:
+            for component in data.components:
+                stack.enter_context(component.hold_sync())
+        yield
+
+
 def _update_data_widget(grid_data, block_widget):
     """Update a given block widget with new grid data."""
     for data_name, data in grid_data.items():
@@ -125,6 +271,76 @@ def _update_data_widget(grid_data, block_widget):
             component_widget.array = component['array']
 
 
+def _vector_field(block, input):
+    """Get the ``(n, 3)`` vector field of a block given a 3-D data name or a tuple of 3 (data name, component name)."""
+    if isinstance(input, str):
+        components = block[input].components
+    else:
+        components = [block[data_name, component_name] for data_name, component_name in input]
+
+    if len(components) != 3:
+        raise TraitError('The input should be 3-dimensional')
+
+    return np.stack([_component_array(component) for component in components], axis=1)
+
+
+def _map_cell_data(cell_data, mapping):
+    """Map grid cell data onto the points, see ``vtk_loader.get_ugrid_cell_data``."""
+    return {
+        name: {
+            component_name: {'array': mapping(component['array'])}
+            for component_name, component in components.items()
+        }
+        for name, components in cell_data.items()
+    }
+
+
+def _vtk_grid_data(grid, block=None):
+    """Get the point data of a vtk grid, and its cell data mapped onto the points.
+
+    Point data take precedence over cell data of the same name. The cell mapping of ``block`` is reused if the grid has
+    the same cells, see ``CellToPoint.matches``. Returns the data and the cell mapping, which is built even without cell
+    data, so that ``set_cell_data`` always expects values per grid cell.
+    """
+    from .vtk_loader import get_ugrid_data, get_ugrid_cells, get_ugrid_cell_data
+
+    grid_data = get_ugrid_data(grid)
+    cell_data = get_ugrid_cell_data(grid)
+    mapping = block._cell_to_point if block is not None else None
+
+    connectivity, offsets = get_ugrid_cells(grid)
+    if mapping is None or not mapping.matches(connectivity, offsets, grid.GetNumberOfPoints()):
+        mapping = CellToPoint(connectivity, offsets, grid.GetNumberOfPoints())
+
+    for name, components in _map_cell_data(cell_data, mapping).items():
+        grid_data.setdefault(name, components)
+
+    return grid_data, mapping
+
+
+def _vertices_array(block):
+    """Get the vertices of a block as a ``(n, 3)`` NumPy array."""
+    vertices = block.vertices.array if isinstance(block.vertices, Widget) else block.vertices
+
+    return np.asarray(vertices).reshape(-1, 3)
+
+
+# The result of the kernel-side evaluation of a block, see ``Effect.evaluate``
+Evaluation = namedtuple('Evaluation', ['vertices', 'colors', 'alpha'])
+
+
+def _raw_array(value):
+    """Get the array held by an array trait, NDArray widgets being unwrapped."""
+    return value.array if isinstance(value, Widget) else value
+
+
+def _same_key(key, other):
+    """Compare memoization keys, arrays by identity and other values by equality."""
+    return len(key) == len(other) and all(
+        a is b or not (hasattr(a, 'shape') or hasattr(b, 'shape')) and a == b for a, b in zip(key, other)
+    )
+
+
 class Block(_GanyWidgetBase):
     """A 3-D element widget.
 
@@ -133,7 +349,7 @@ class Block(_GanyWidgetBase):
 
     _model_name = Unicode('BlockModel').tag(sync=True)
 
-    vertices = Union((Instance(Widget), Array()), default_value=array(FLOAT32)).tag(sync=True, **data_array_serialization)
+    vertices = Union((Instance(Widget), ChunkedArray(), Array()), default_value=array(FLOAT32)).tag(sync=True, **data_array_serialization)
 
     default_color = Color('#6395b0').tag(sync=True)
 
@@ -181,6 +397,28 @@ class Block(_GanyWidgetBase):
 
         return data
 
+    def export_glb(self, path, **kwargs):
+        """Export the block into a binary glTF file, see ``ipygany.gltf.export_glb`` for the options."""
+        export_glb([self], path, **kwargs)
+
+    @property
+    def can_evaluate(self):
+        """Whether ``evaluate`` can compute the block in the kernel."""
+        return True
+
+    def evaluate(self):
+        """Get the vertices of the block as an ``Evaluation``, without colors nor opacities, see ``Effect.evaluate``."""
+        return self._memoize((_raw_array(self.vertices),), lambda: Evaluation(_vertices_array(self), None, None))
+
+    def _memoize(self, key, compute):
+        """Get the result of the last evaluation if ``key`` did not change, compute it otherwise."""
+        if self._evaluation is None or not _same_key(self._evaluation[0], key):
+            self._evaluation = (key, compute())
+
+        return self._evaluation[1]
+
+    _evaluation = None
+
 
 class PolyMesh(Block):
     """A polygon-based 3-D Mesh widget."""
@@ -189,26 +427,67 @@ class PolyMesh(Block):
 
     triangle_indices = Array(default_value=array(UINT32)).tag(sync=True, **array_serialization)
 
+    # Oct-encoded vertex normals computed in the kernel, the front-end computes them if empty
+    normals = Array(default_value=array(INT8)).tag(sync=True, **array_serialization)
+    compute_normals = Bool(False)
+
     def __init__(self, vertices=[], triangle_indices=[], data=[], **kwargs):
         """Construct a PolyMesh.
 
         A PolyMesh is a triangle-based mesh. ``vertices`` is the array of points, ``triangle_indices`` is the array of triangle
-        indices.
+        indices. If ``compute_normals`` is ``True``, the vertex normals are computed in the kernel and sent along with the
+        vertices, instead of being computed by the front-end on every vertices change.
+
+        Without ``triangle_indices``, the vertices are a soup of consecutive triangles (e.g. read from an STL file). If
+        ``weld`` is ``True``, the duplicated vertices are then merged, as well as the per-vertex data, vertices closer
+        than ``weld_tolerance`` being merged if it is not null. See ``welding`` for the reduction ratio, and for merging
+        later vertices updates given as soups.
         """
-        if not isinstance(vertices, Widget):
-            vertices = np.asarray(vertices).flatten()
-        triangle_indices = np.asarray(triangle_indices).flatten()
+        compute_normals = kwargs.pop('compute_normals', False)
+        weld = kwargs.pop('weld', False)
+        weld_tolerance = kwargs.pop('weld_tolerance', 0.)
+
+        # Chunked sources are kept as is, they are only streamed at serialization time
+        if not isinstance(vertices, Widget) and not is_chunked_array(vertices):
+            vertices = np.asarray(vertices).ravel()
+        triangle_indices = np.asarray(triangle_indices).ravel()
 
         # If there are no triangle indices, assume vertices are given in the right order for constructing the triangles.
+        welding = None
         if triangle_indices.size == 0:
-            l_vertices = np.asarray(vertices.array).flatten().size if isinstance(vertices, Widget) else vertices.size
+            if weld and isinstance(vertices, np.ndarray) and vertices.size and vertices.size % 9 == 0:
+                welding = VertexWelding(vertices, weld_tolerance)
+
+                vertices = welding.vertices.ravel()
+                triangle_indices = welding.triangles()
+                if isinstance(data, dict):
+                    data = [Data(name, components) for name, components in data.items()]
+                data = _derived_data_widgets(data, welding)
+            else:
+                n_vertices = (np.size(vertices.array) if isinstance(vertices, Widget) else vertices.size) // 3
 
-            triangle_indices = np.arange(l_vertices, dtype=np.uint32)
+                triangle_indices = np.arange(n_vertices, dtype=np.uint32)
 
         super(PolyMesh, self).__init__(
             vertices=vertices, triangle_indices=triangle_indices, data=data, **kwargs
         )
 
+        self._welding = welding
+
+        # Set after the geometry, so that the normals are computed once
+        self.compute_normals = compute_normals
+
+    @property
+    def welding(self):
+        """Get the ``VertexWelding`` of the vertices given without triangle indices, ``None`` if they were not welded.
+
+        Its ``ratio`` is the reduction ratio of the number of vertices, and it can merge other per-vertex arrays of the
+        triangle soup onto the welded vertices.
+        """
+        return self._welding
+
+    _welding = None
+
     @staticmethod
     def from_vtk(path, **kwargs):
         """Pass a path to a VTK Unstructured Grid file (``.vtu``) or pass a ``vtkUnstructuredGrid`` object to use.
@@ -222,7 +501,7 @@ class PolyMesh(Block):
 
         from .vtk_loader import (
             load_vtk,
-            get_ugrid_vertices, get_ugrid_triangles, get_ugrid_data
+            get_ugrid_vertices, get_ugrid_triangles
         )
 
         if isinstance(path, str):
@@ -235,16 +514,25 @@ class PolyMesh(Block):
         else:
             raise TypeError("Only unstructured grids supported at this time.")
 
-        return PolyMesh(
+        grid_data, cell_to_point = _vtk_grid_data(grid)
+
+        mesh = PolyMesh(
             vertices=get_ugrid_vertices(grid),
             triangle_indices=get_ugrid_triangles(grid),
-            data=_grid_data_to_data_widget(get_ugrid_data(grid)),
+            data=_grid_data_to_data_widget(grid_data),
             **kwargs
         )
+        mesh._cell_to_point = cell_to_point
+
+        return mesh
 
+    @staticmethod
     def from_pyvista(obj, **kwargs):
         """Import a mesh from ``pyvista`` or ``vtk``.
 
+        The vertices, triangles and point data are read as NumPy views on the pyvista arrays, the components of
+        multi-dimensional data being column slices of them.
+
         Parameters
         ----------
         obj : pyvista compatible object
@@ -270,25 +558,11 @@ class PolyMesh(Block):
         6.1232343e-17, -1.0811902e-01, -2.1497…
 
         """
-        try:
-            import pyvista as pv
-        except ImportError:
-            raise ImportError('Please install ``pyvista`` to use this feature')
-
-        from .vtk_loader import get_ugrid_data
-
-        # attempt to wrap non-pyvista objects
-        if not pv.is_pyvista_dataset(obj):
-            mesh = pv.wrap(obj)
-            if not pv.is_pyvista_dataset(mesh):
-                raise TypeError(f'Object type ({type(mesh)}) cannot be converted to '
-                                'a pyvista dataset')
-        else:
-            mesh = obj
+        pv, mesh = _pyvista_dataset(obj)
 
         # PolyMesh requires vertices and triangles, so we need to
         # convert the mesh to an all triangle polydata
-        if not isinstance(obj, pv.PolyData):
+        if not isinstance(mesh, pv.PolyData):
             # unlikely case that mesh does not have extract_surface
             if not hasattr(mesh, 'extract_surface'):
                 mesh = mesh.cast_to_unstructured_grid()
@@ -302,19 +576,183 @@ class PolyMesh(Block):
         else:
             trimesh = surf.triangulate()
 
-        # finally, pass the triangle vertices to PolyMesh
-        triangle_indices = trimesh.faces.reshape(-1, 4)[:, 1:]
+        # finally, pass the triangle vertices to PolyMesh, the faces being stored as (3, i, j, k) quadruplets
+        triangle_indices = np.asarray(trimesh.faces).reshape(-1, 4)[:, 1:]
 
         return PolyMesh(
-            vertices=trimesh.points,
+            vertices=np.asarray(trimesh.points),
             triangle_indices=triangle_indices,
-            data=_grid_data_to_data_widget(get_ugrid_data(trimesh))
+            data=_pyvista_data(trimesh),
+            **kwargs
+        )
+
+    def partition(self, max_triangles=2 ** 16):
+        """Split the mesh into spatially coherent ``PolyMesh`` chunks of at most ``max_triangles`` triangles.
+
+        Each chunk is its own geometry in the front-end, so that it can be culled independently, and updates made through
+        the returned ``MeshPartition`` are only sent to the chunks they affect.
+        """
+        return MeshPartition(self, max_triangles)
+
+    @property
+    def triangle_bvh(self):
+        """Get the bounding volume hierarchy over the triangles, built lazily and cached until the geometry changes."""
+        if self._triangle_bvh is None:
+            self._triangle_bvh = BVH(_vertices_array(self), np.asarray(self.triangle_indices).reshape(-1, 3))
+
+        return self._triangle_bvh
+
+    @observe('vertices', 'triangle_indices')
+    def _reset_triangle_bvh(self, change):
+        self._triangle_bvh = None
+
+    def pick(self, origins, directions):
+        """Intersect rays with the mesh.
+
+        Parameters
+        ----------
+        origins : array
+            The ``(n, 3)`` ray origins, or a single ray origin.
+        directions : array
+            The ``(n, 3)`` ray directions, or a single ray direction.
+
+        Returns
+        -------
+        tuple
+            The index of the closest triangle hit by each ray (-1 if none) and the hit points (NaN if none).
+        """
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+        directions = np.asarray(directions, dtype=np.float64).reshape(-1, 3)
+
+        triangles, distances, _ = self.triangle_bvh.intersect(origins, directions)
+
+        return triangles, origins + np.where(triangles[:, np.newaxis] >= 0, distances[:, np.newaxis], np.nan) * directions
+
+    _triangle_bvh = None
+
+    def vertex_normals(self):
+        """Compute the area-weighted vertex normals, as a ``(n, 3)`` array.
+
+        The incidence of the triangles on the vertices is cached until the triangles change, so that updating the
+        vertices of an animated mesh only costs a few vectorized passes.
+        """
+        vertices = _vertices_array(self)
+
+        if self._vertex_normals is None or self._vertex_normals.n_vertices != len(vertices):
+            self._vertex_normals = VertexNormals(self.triangle_indices, len(vertices))
+
+        return self._vertex_normals(vertices)
+
+    def notify_change(self, change):
+        """Send the normals computed from new vertices or triangles in the same message as them."""
+        if change['name'] in ('vertices', 'triangle_indices') and self.compute_normals:
+            with self.hold_sync():
+                super().notify_change(change)
+        else:
+            super().notify_change(change)
+
+    @observe('compute_normals', 'vertices', 'triangle_indices')
+    def _update_normals(self, change):
+        if change['name'] == 'triangle_indices':
+            self._vertex_normals = None
+
+        if not self.compute_normals:
+            if change['name'] == 'compute_normals':
+                self.normals = array(INT8)
+            return
+
+        # When the topology changes, the vertices and the triangles are set one after the other: the normals are only
+        # computed once the triangles refer to existing vertices
+        n_vertices = len(_vertices_array(self))
+        if self._vertex_normals is None or self._vertex_normals.n_vertices != n_vertices:
+            triangle_indices = np.asarray(self.triangle_indices)
+            if triangle_indices.size and triangle_indices.max() >= n_vertices:
+                return
+
+        self.normals = oct_encode(self.vertex_normals())
+
+    _vertex_normals = None
+
+    def _cells(self):
+        return np.asarray(self.triangle_indices).reshape(-1, 3)
+
+    @property
+    def cell_to_point(self):
+        """Get the mapping of cell values onto the vertices, built lazily and cached until the topology changes.
+
+        The cells are the cells of the vtk grid for meshes loaded with ``from_vtk``, the triangles otherwise (the
+        tetrahedrons for a ``TetraMesh``).
+        """
+        n_vertices = np.size(self.vertices.array if isinstance(self.vertices, Widget) else self.vertices) // 3
+
+        if self._cell_to_point is None or self._cell_to_point.n_points != n_vertices:
+            self._cell_to_point = CellToPoint.from_cells(self._cells(), n_vertices)
+
+        return self._cell_to_point
+
+    @observe('triangle_indices')
+    def _reset_cell_to_point(self, change):
+        self._cell_to_point = None
+
+    _cell_to_point = None
+
+    def set_cell_data(self, cell_data):
+        """Set data given per cell, each vertex getting the average value of the cells it belongs to.
+
+        The mapping is cached, so that setting other values on the same mesh (e.g. the next time step) costs a single
+        weighted sum per component. Data which already exist are updated in place.
+
+        Parameters
+        ----------
+        cell_data : dict
+            ``{name: values}``, values being ``(n_cells,)`` or ``(n_cells, n_components)`` arrays.
+        """
+        mapping = self.cell_to_point
+
+        with self.hold_sync():
+            for name, values in cell_data.items():
+                values = np.asarray(values)
+                if len(values) != mapping.n_cells:
+                    raise ValueError('Expected {} cell values for {}, got {}'.format(mapping.n_cells, name, len(values)))
+
+                values = values.reshape(mapping.n_cells, -1)
+                point_values = [mapping(values[:, i]) for i in range(values.shape[1])]
+
+                existing = [data for data in self.data if data.name == name]
+                if existing and len(existing[0].components) == len(point_values):
+                    for component, component_values in zip(existing[0].components, point_values):
+                        component.array = component_values
+                else:
+                    self.data = [data for data in self.data if data.name != name] + [
+                        Data(name, [Component('X' + str(i + 1), v) for i, v in enumerate(point_values)])
+                    ]
+
+    def flat_shaded(self, cell_data={}):
+        """Create a flat-shaded copy of the mesh, in which each triangle has its own vertices.
+
+        The vertices and the data are duplicated per triangle with a single gather. ``cell_data`` given per triangle
+        (``{name: values}``, see ``set_cell_data``) is set on the copy as constant values over each triangle, without
+        averaging.
+        """
+        triangles = np.asarray(self.triangle_indices).ravel()
+        n_triangles = len(triangles) // 3
+
+        data = [d for d in _derived_data_widgets(self.data, lambda array: array[triangles]) if d.name not in cell_data]
+        for name, values in cell_data.items():
+            values = np.asarray(values).reshape(n_triangles, -1)
+            data.append(Data(name, [Component('X' + str(i + 1), np.repeat(values[:, i], 3)) for i in range(values.shape[1])]))
+
+        return PolyMesh(
+            vertices=_vertices_array(self)[triangles],
+            triangle_indices=np.arange(len(triangles), dtype=np.uint32),
+            data=data,
+            default_color=self.default_color
         )
 
     def reload(self, path, reload_vertices=False, reload_triangles=False, reload_data=True):
         """Reload a vtk file, entirely or partially."""
         from .vtk_loader import (
-            load_vtk, get_ugrid_vertices, get_ugrid_triangles, get_ugrid_data
+            load_vtk, get_ugrid_vertices, get_ugrid_triangles
         )
 
         grid = load_vtk(path)
@@ -325,7 +763,9 @@ class PolyMesh(Block):
             if reload_triangles:
                 self.triangle_indices = get_ugrid_triangles(grid)
             if reload_data:
-                _update_data_widget(get_ugrid_data(grid), self)
+                # The cell mapping is reused as long as the topology does not change
+                grid_data, self._cell_to_point = _vtk_grid_data(grid, self)
+                _update_data_widget(grid_data, self)
 
 
 class TetraMesh(PolyMesh):
@@ -341,34 +781,16 @@ class TetraMesh(PolyMesh):
         A TetraMesh is a tetrahedron-based mesh. ``vertices`` is the array of points, ``triangle_indices`` is the array of
         triangle indices defining the mesh "skin", and ``tetrahedron_indices`` are the indices for constructing the tetrahedrons.
         """
-        triangle_indices = np.asarray(triangle_indices).flatten()
-        tetrahedron_indices = np.asarray(tetrahedron_indices)
+        triangle_indices = np.asarray(triangle_indices).ravel()
+        tetrahedron_indices = np.asarray(tetrahedron_indices).ravel()
 
         # If the skin is not provided, we compute it
         if triangle_indices.size == 0:
-            if tetrahedron_indices.ndim != 2:
-                tetrahedron_indices.reshape(int(tetrahedron_indices.size / 4), 4)
-
-            # Extract all the triangle indices
-            faces = np.concatenate([
-                tetrahedron_indices[:, [2, 1, 0]],
-                tetrahedron_indices[:, [0, 3, 2]],
-                tetrahedron_indices[:, [1, 3, 0]],
-                tetrahedron_indices[:, [2, 3, 1]]
-            ])
-
-            # Sort triangles indices so that we can compare them and find duplicates
-            sorted_faces = np.sort(faces, axis=1)
-
-            # Get unique triangle indices and the number of times they appear
-            _, unique_index, counts = np.unique(sorted_faces, return_index=True, return_counts=True, axis=0)
-
-            # Extract triangles that appear exactly once
-            triangle_indices = faces[unique_index[counts == 1]].flatten()
+            triangle_indices = tetrahedron_skin(tetrahedron_indices).ravel()
 
         super(TetraMesh, self).__init__(
             vertices=vertices, triangle_indices=triangle_indices,
-            tetrahedron_indices=tetrahedron_indices.flatten(), data=data, **kwargs
+            tetrahedron_indices=tetrahedron_indices, data=data, **kwargs
         )
 
     @staticmethod
@@ -383,7 +805,7 @@ class TetraMesh(PolyMesh):
         import vtk
 
         from .vtk_loader import (
-            load_vtk, get_ugrid_vertices, get_ugrid_triangles, get_ugrid_tetrahedrons, get_ugrid_data
+            load_vtk, get_ugrid_vertices, get_ugrid_triangles, get_ugrid_tetrahedrons
         )
 
         if isinstance(path, str):
@@ -396,18 +818,101 @@ class TetraMesh(PolyMesh):
         else:
             raise TypeError("Only unstructured grids supported at this time.")
 
-        return TetraMesh(
+        grid_data, cell_to_point = _vtk_grid_data(grid)
+
+        mesh = TetraMesh(
             vertices=get_ugrid_vertices(grid),
             triangle_indices=get_ugrid_triangles(grid),
             tetrahedron_indices=get_ugrid_tetrahedrons(grid),
-            data=_grid_data_to_data_widget(get_ugrid_data(grid)),
+            data=_grid_data_to_data_widget(grid_data),
+            **kwargs
+        )
+        mesh._cell_to_point = cell_to_point
+
+        return mesh
+
+    @property
+    def tetrahedron_bvh(self):
+        """Get the bounding volume hierarchy over the tetrahedrons, built lazily and cached until the geometry changes."""
+        if self._tetrahedron_bvh is None:
+            self._tetrahedron_bvh = BVH(_vertices_array(self), np.asarray(self.tetrahedron_indices).reshape(-1, 4))
+
+        return self._tetrahedron_bvh
+
+    @observe('vertices', 'tetrahedron_indices')
+    def _reset_tetrahedron_bvh(self, change):
+        self._tetrahedron_bvh = None
+
+    def _cells(self):
+        return np.asarray(self.tetrahedron_indices).reshape(-1, 4)
+
+    @observe('tetrahedron_indices')
+    def _reset_tetrahedron_cell_to_point(self, change):
+        self._cell_to_point = None
+
+    def probe(self, points):
+        """Get the data values at the given points.
+
+        Parameters
+        ----------
+        points : array
+            The ``(n, 3)`` array of points, or a single point.
+
+        Returns
+        -------
+        dict
+            The interpolated values as a ``{data_name: {component_name: values}}`` dictionary, values are NaN for
+            points outside of the mesh.
+        """
+        bvh = self.tetrahedron_bvh
+        cells, weights = bvh.locate(points)
+
+        return {
+            data.name: {
+                component.name: bvh.interpolate(_component_array(component), cells, weights)
+                for component in data.components
+            }
+            for data in self.data
+        }
+
+    _tetrahedron_bvh = None
+
+    @staticmethod
+    def from_pyvista(obj, **kwargs):
+        """Import a volumetric mesh from ``pyvista`` or ``vtk``.
+
+        3-D cells which are not tetrahedrons are split into tetrahedrons, other cells are ignored. The skin of the mesh
+        is computed from the tetrahedrons, and the vertices and point data are read as NumPy views on the pyvista
+        arrays.
+
+        Parameters
+        ----------
+        obj : pyvista compatible object
+            Any object compatible with pyvista, e.g. a ``pyvista.UnstructuredGrid``.
+        """
+        pv, mesh = _pyvista_dataset(obj)
+
+        if not isinstance(mesh, pv.UnstructuredGrid):
+            mesh = mesh.cast_to_unstructured_grid()
+
+        if len(mesh.celltypes) and np.all(np.asarray(mesh.celltypes) == VTK_TETRA):
+            # The cells are stored as (4, i, j, k, l) quintuplets
+            tetrahedron_indices = np.asarray(mesh.cells).reshape(-1, 5)[:, 1:]
+        else:
+            mesh = mesh.triangulate()
+            tetrahedron_indices = mesh.cells_dict.get(VTK_TETRA, np.empty((0, 4)))
+
+        return TetraMesh(
+            vertices=np.asarray(mesh.points),
+            tetrahedron_indices=np.asarray(tetrahedron_indices, dtype=np.uint32),
+            data=_pyvista_data(mesh),
             **kwargs
         )
 
     def reload(self, path, reload_vertices=False, reload_triangles=False, reload_data=True, reload_tetrahedrons=False):
         """Reload a vtk file, entirely or partially."""
         from .vtk_loader import (
-            load_vtk, get_ugrid_vertices, get_ugrid_triangles, get_ugrid_tetrahedrons, get_ugrid_data
+            load_vtk, get_ugrid_vertices, get_ugrid_triangles, get_ugrid_tetrahedrons
         )
 
         grid = load_vtk(path)
@@ -420,7 +925,527 @@ class TetraMesh(PolyMesh):
             if reload_tetrahedrons:
                 self.tetrahedron_indices = get_ugrid_tetrahedrons(grid)
             if reload_data:
-                _update_data_widget(get_ugrid_data(grid), self)
+                grid_data, self._cell_to_point = _vtk_grid_data(grid, self)
+                _update_data_widget(grid_data, self)
+
+
+class _PlaneFilter(PolyMesh):
+    """A mesh computed in the kernel from a source mesh and a plane.
+
+    This class is not intended to be instantiated directly: subclasses set ``_plane_filter`` to a function of the
+    source vertices, triangle indices, tetrahedron indices (``None`` for a ``PolyMesh``) and the plane, like
+    ``ipygany.filters.clip_plane``.
+    """
+
+    source = Instance(PolyMesh)
+
+    origin = Tuple(CFloat(), CFloat(), CFloat(), default_value=(0., 0., 0.))
+    normal = Tuple(CFloat(), CFloat(), CFloat(), default_value=(1., 0., 0.))
+
+    def __init__(self, source, origin=(0., 0., 0.), normal=(1., 0., 0.), **kwargs):
+        vertices, triangle_indices, (lo, hi, t) = self._filter(source, origin, normal)
+
+        kwargs.setdefault('default_color', source.default_color)
+
+        super(_PlaneFilter, self).__init__(
+            vertices=vertices, triangle_indices=triangle_indices,
+            data=_derived_data_widgets(source.data, lambda array: interpolate(array, lo, hi, t)),
+            source=source, origin=origin, normal=normal, **kwargs
+        )
+
+        self._initialized = True
+
+    def _filter(self, source, origin, normal):
+        """Compute the mesh from the source mesh and the plane.
+
+        Returns the vertices, the triangle indices and the ``(lo, hi, t)`` arrays interpolating the source data on the
+        vertices, as returned by ``ipygany.filters.clip``.
+        """
+        tetrahedron_indices = source.tetrahedron_indices if isinstance(source, TetraMesh) else None
+
+        return self._plane_filter(_vertices_array(source), source.triangle_indices, tetrahedron_indices, origin, normal)
+
+    @observe('origin', 'normal')
+    def _update(self, change):
+        # The plane given to the constructor is already applied
+        if not self._initialized:
+            return
+
+        vertices, triangle_indices, (lo, hi, t) = self._filter(self.source, self.origin, self.normal)
+
+        with _hold_sync(self):
+            self.vertices = np.asarray(vertices).ravel()
+            self.triangle_indices = triangle_indices
+
+            for data in self.data:
+                for component in data.components:
+                    component.array = interpolate(_component_array(self.source[data.name, component.name]), lo, hi, t)
+
+    _initialized = False
+
+
+class Clip(_PlaneFilter):
+    """A mesh clipped by a plane, computed in the kernel.
+
+    The part of the ``source`` mesh lying on the side the plane ``normal`` points to is removed. If the source is a
+    ``TetraMesh``, the cut face through the volume is generated. Moving the plane only sends the clipped mesh to the
+    front-end.
+    """
+
+    _plane_filter = staticmethod(clip_plane)
+
+
+class Slice(_PlaneFilter):
+    """A slice of a ``TetraMesh`` by a plane, computed in the kernel.
+
+    Moving the plane only sends the cut face to the front-end.
+    """
+
+    _plane_filter = staticmethod(slice_plane)
+
+
+class Streamlines(PolyMesh):
+    """Streamlines of a 3-D vector field of a ``TetraMesh``, computed in the kernel and displayed as tubes.
+
+    All the seeds are integrated simultaneously using RK4 with a fixed ``step`` length along the normalized field, in
+    ``processes`` processes (``None`` for all the CPUs). The resulting tubes carry the ``source`` data interpolated
+    along the streamlines.
+    """
+
+    source = Instance(TetraMesh)
+
+    input = Union((Tuple(), Unicode()))
+    seeds = Array()
+
+    step = CFloat(allow_none=True, default_value=None)
+    max_steps = Int(1000)
+    direction = Enum(['forward', 'backward', 'both'], default_value='forward')
+
+    radius = CFloat(allow_none=True, default_value=None)
+    sides = Int(6)
+
+    processes = Int(1, allow_none=True)
+
+    def __init__(self, source, input, seeds, **kwargs):
+        """Create Streamlines given the ``source`` mesh, the ``input`` vector data name (or a tuple of 3 (data name,
+        component name) tuples), and the ``(n, 3)`` array of seed points."""
+        # Skip the PolyMesh constructor, the geometry is computed by the trait defaults
+        super(PolyMesh, self).__init__(source=source, input=input, seeds=seeds, **kwargs)
+
+    @default('vertices')
+    def _default_vertices(self):
+        return self._compute()[0]
+
+    @default('triangle_indices')
+    def _default_triangle_indices(self):
+        return self._compute()[1]
+
+    @default('data')
+    def _default_data(self):
+        return _derived_data_widgets(self.source.data, self._compute()[2])
+
+    @default('default_color')
+    def _default_default_color(self):
+        return self.source.default_color
+
+    def _compute(self):
+        if self._result is None:
+            self._result = self._streamlines()
+
+        return self._result
+
+    def _streamlines(self):
+        source = self.source
+        vertices = _vertices_array(source)
+
+        if self._locator is None:
+            self._locator = TetrahedronLocator(vertices, source.tetrahedron_indices)
+        locator = self._locator
+
+        field = _vector_field(source, self.input)
+
+        step = self.step if self.step is not None else locator.cell_size / 8.
+        radius = self.radius if self.radius is not None else step / 2.
+
+        points, lengths = integrate_streamlines(locator, field, self.seeds, step, self.max_steps, self.direction, self.processes)
+        tube_vertices, triangle_indices, point_ids = tubes(points, lengths, radius, self.sides)
+
+        cells, weights = locator.locate(points[point_ids[::self.sides]])
+
+        def transform(array):
+            return np.repeat(locator.interpolate(array, cells, weights), self.sides, axis=0)
+
+        return tube_vertices, triangle_indices, transform
+
+    @observe('input', 'seeds', 'step', 'max_steps', 'direction', 'radius', 'sides')
+    def _update(self, change):
+        # Nothing to update if the streamlines were not computed yet
+        if self._result is None:
+            return
+
+        self._result = None
+        vertices, triangle_indices, transform = self._compute()
+
+        with _hold_sync(self):
+            self.vertices = vertices
+            self.triangle_indices = triangle_indices
+
+            for data in self.data:
+                for component in data.components:
+                    component.array = transform(_component_array(self.source[data.name, component.name]))
+
+    _result = None
+    _locator = None
+
+
+def _data_arrays(data):
+    """Get the ``[(data name, [(component name, array)])]`` arrays of a list of Data widgets or of a dict of arrays."""
+    if isinstance(data, dict):
+        return [
+            (name, [
+                (component.name, _component_array(component)) for component in components
+            ] if isinstance(components, (list, tuple)) else [
+                (component_name, np.asarray(array)) for component_name, array in components.items()
+            ])
+            for name, components in data.items()
+        ]
+
+    return [(d.name, [(c.name, _component_array(c)) for c in d.components]) for d in data]
+
+
+def _kernel_io_loop():
+    """Get the IO loop of the running kernel, on which the widget messages are handled, ``None`` outside of a kernel."""
+    try:
+        from IPython import get_ipython
+    except ImportError:
+        return None
+
+    kernel = getattr(get_ipython(), 'kernel', None)
+
+    return getattr(kernel, 'io_loop', None)
+
+
+class ProgressivePolyMesh(PolyMesh):
+    """A PolyMesh sent coarse-first: a simplified version is displayed right away, then refined in the background.
+
+    The ``levels`` coarse versions are computed by vertex clustering, with ``resolution`` cells along the bounding box
+    diagonal for the coarsest one and four times more cells for each next level, before the full mesh is sent. Levels
+    are computed in a thread, and swapped on the kernel IO loop. The refinement stops if the widget is closed or if the
+    mesh is replaced using ``replace``.
+    """
+
+    def __init__(self, vertices=[], triangle_indices=[], data={}, levels=3, resolution=32, **kwargs):
+        """Construct a ProgressivePolyMesh, ``data`` should be given as arrays so that the full data is not sent."""
+        self.levels = levels
+        self.resolution = resolution
+
+        self._refinement = None
+        self._cancel = threading.Event()
+        self._lock = threading.Lock()
+
+        full = self._full_mesh(vertices, triangle_indices, data)
+
+        vertices, triangle_indices, data = self._data_widgets(*self._level(full, 0))
+        super(ProgressivePolyMesh, self).__init__(vertices=vertices, triangle_indices=triangle_indices, data=data, **kwargs)
+
+        self._refine(full)
+
+    def replace(self, vertices, triangle_indices=[], data={}):
+        """Replace the mesh, cancelling the refinement of the previous one."""
+        self._stop()
+
+        full = self._full_mesh(vertices, triangle_indices, data)
+        self._set_level(*self._level(full, 0))
+        self._refine(full)
+
+    def wait(self, timeout=None):
+        """Wait for the levels to be computed.
+
+        In a kernel, the last levels are swapped once the IO loop runs again, e.g. after the current cell.
+        """
+        if self._refinement is not None:
+            self._refinement.join(timeout)
+
+    def close(self):
+        """Close the widget, cancelling the refinement."""
+        with self._lock:
+            self._cancel.set()
+
+        super(ProgressivePolyMesh, self).close()
+
+    def _full_mesh(self, vertices, triangle_indices, data):
+        vertices = np.asarray(vertices).reshape(-1, 3)
+        triangle_indices = np.asarray(triangle_indices).reshape(-1, 3)
+
+        if triangle_indices.size == 0:
+            triangle_indices = np.arange(len(vertices), dtype=np.uint32).reshape(-1, 3)
+
+        arrays = _data_arrays(data)
+
+        # Coarse levels keep the range of the full data, so that colormaps do not change while refining
+        ranges = {}
+        for name, components in arrays:
+            for component_name, values in components:
+                statistics = Statistics(values)
+                ranges[(name, component_name)] = (statistics.min, statistics.max)
+
+        return vertices, triangle_indices, arrays, ranges
+
+    def _level(self, full, level):
+        """Compute the given level of the mesh, the full mesh being level ``self.levels``."""
+        vertices, triangle_indices, arrays, ranges = full
+
+        if level >= self.levels or not len(vertices):
+            return vertices, triangle_indices, arrays, ranges
+
+        diagonal = np.linalg.norm(vertices.max(axis=0) - vertices.min(axis=0))
+        cell_size = diagonal / (self.resolution * 4 ** level)
+
+        points, triangles, clusters = cluster_vertices(vertices, triangle_indices, cell_size)
+        arrays = [
+            (name, [(component_name, cluster_mean(array, clusters)) for component_name, array in components])
+            for name, components in arrays
+        ]
+
+        return points, triangles, arrays, ranges
+
+    @staticmethod
+    def _data_widgets(vertices, triangle_indices, arrays, ranges):
+        data = [
+            Data(name, [
+                Component(component_name, array, *ranges[(name, component_name)])
+                for component_name, array in components
+            ])
+            for name, components in arrays
+        ]
+
+        return vertices, triangle_indices, data
+
+    def _set_level(self, vertices, triangle_indices, arrays, ranges):
+        layout = [(name, [component_name for component_name, _ in components]) for name, components in arrays]
+
+        # Levels of the same mesh update the components in place
+        if layout == [(data.name, [component.name for component in data.components]) for data in self.data]:
+            with _hold_sync(self):
+                self.vertices = vertices.ravel()
+                self.triangle_indices = triangle_indices.ravel()
+
+                for data, (name, components) in zip(self.data, arrays):
+                    for component, (component_name, values) in zip(data.components, components):
+                        component.array = values
+                        component.min, component.max = ranges[(name, component_name)]
+
+            return
+
+        vertices, triangle_indices, data = self._data_widgets(vertices, triangle_indices, arrays, ranges)
+        old_data = self.data
+
+        with self.hold_sync():
+            self.vertices = vertices.ravel()
+            self.triangle_indices = triangle_indices.ravel()
+            self.data = data
+
+        for d in old_data:
+            for component in d.components:
+                component.close()
+            d.close()
+
+    def _refine(self, full):
+        cancel = self._cancel
+        io_loop = _kernel_io_loop()
+
+        def swap(level):
+            # The widget may have been closed or replaced meanwhile
+            with self._lock:
+                if not cancel.is_set():
+                    self._set_level(*level)
+
+        def refine():
+            for level in range(1, self.levels + 1):
+                result = self._level(full, level)
+
+                if cancel.is_set():
+                    return
+
+                # Traits are only modified from the thread handling the widget messages
+                if io_loop is not None:
+                    io_loop.add_callback(swap, result)
+                else:
+                    swap(result)
+
+        self._refinement = threading.Thread(target=refine, daemon=True)
+        self._refinement.start()
+
+    def _stop(self):
+        with self._lock:
+            self._cancel.set()
+        self.wait()
+        self._cancel = threading.Event()
+
+
+class VolumeBrick(_GanyWidgetBase):
+    """A brick of the grid of a ``Volume`` component, sent to the front-end as a 3-D texture.
+
+    ``offset`` is the index of the first point of the brick in the grid and ``shape`` its number of points along each
+    axis. ``values`` is the normalized texture computed by ``volume.texture``.
+    """
+
+    _model_name = Unicode('VolumeBrickModel').tag(sync=True)
+
+    offset = Tuple(Int(), Int(), Int(), default_value=(0, 0, 0)).tag(sync=True)
+    shape = Tuple(Int(), Int(), Int(), default_value=(0, 0, 0)).tag(sync=True)
+    values = Array(default_value=np.zeros(0, dtype=np.uint8)).tag(sync=True, **array_serialization)
+
+
+class Volume(PolyMesh):
+    """A dense 3-D grid of point values, defined by its ``origin`` and ``spacing``.
+
+    The cells of the grid are implicit: only the boundary of the grid and its data are sent to the front-end, so that
+    effects like ``IsoColor`` apply on it. ``IsoSurface`` and ``Threshold`` can be extracted on the whole grid in the
+    kernel, brick by brick, without building explicit cells.
+
+    Setting ``volume_input`` to a ``(data name, component name)`` key renders the grid of that component in the front-end:
+    the grid is split into ``brick_size`` bricks, each one being normalized by the component range, quantized following
+    ``quantization`` and uploaded as a separate 3-D texture.
+    """
+
+    _model_name = Unicode('VolumeModel').tag(sync=True)
+
+    origin = Tuple(CFloat(), CFloat(), CFloat(), default_value=(0., 0., 0.)).tag(sync=True)
+    spacing = Tuple(CFloat(), CFloat(), CFloat(), default_value=(1., 1., 1.)).tag(sync=True)
+    brick_size = Int(32)
+
+    volume_input = Tuple(Unicode(), Unicode(), allow_none=True, default_value=None)
+    quantization = Enum(['uint8', 'uint16', 'float32'], default_value='uint8')
+    density = CFloat(1.).tag(sync=True)
+
+    bricks = List(Instance(VolumeBrick)).tag(sync=True, **widget_serialization)
+
+    def __init__(self, data, origin=(0., 0., 0.), spacing=(1., 1., 1.), **kwargs):
+        """Create a Volume given its data as a ``{data name: {component name: grid}}`` dict, or a ``{data name: grid}``
+        dict for 1-D data. All the grids should have the same ``(nx, ny, nz)`` shape."""
+        grids = [
+            (name, list(components.items()) if isinstance(components, dict) else [('value', components)])
+            for name, components in data.items()
+        ]
+
+        shapes = {np.shape(grid) for _, components in grids for _, grid in components}
+        if len(shapes) != 1 or len(next(iter(shapes))) != 3 or min(next(iter(shapes))) < 2:
+            raise ValueError('Volume grids should all have the same (nx, ny, nz) shape, with at least 2 points per axis')
+        self.shape = shapes.pop()
+
+        triangle_indices, self._skin_ids = compact(volume.voxel_boundary(np.ones(np.subtract(self.shape, 1), dtype=bool)))
+
+        # The components carry the range of the whole grid, not only of its boundary
+        self._grids = {}
+        data = []
+        for name, components in grids:
+            data_components = []
+            for component_name, grid in components:
+                statistics = Statistics(grid)
+                component = Component(component_name, volume.sample(grid, self._skin_ids), statistics.min, statistics.max)
+
+                data_components.append(component)
+                self._grids[component] = grid
+
+            data.append(Data(name, data_components))
+
+        super(Volume, self).__init__(
+            vertices=volume.grid_points(self._skin_ids, self.shape, origin, spacing), triangle_indices=triangle_indices,
+            data=data, origin=origin, spacing=spacing, **kwargs
+        )
+
+    def grid(self, component):
+        """Get the dense grid of a component, given the ``Component`` widget or a ``(data name, component name)`` key."""
+        if not isinstance(component, Component):
+            component = self[component]
+
+        return self._grids[component]
+
+    def update(self, key, grid):
+        """Replace the grid of a component given its ``(data name, component name)`` key."""
+        component = self[key]
+        if np.shape(grid) != self.shape:
+            raise ValueError('The grid should have a {} shape'.format(self.shape))
+
+        self._grids[component] = grid
+
+        statistics = Statistics(grid)
+        component.min, component.max = statistics.min, statistics.max
+        component.array = volume.sample(grid, self._skin_ids)
+
+        if self.volume_input is not None and self[self.volume_input] is component:
+            self._stream_bricks()
+
+    def isosurface(self, component, value):
+        """Compute the isosurface of the grid of a component, returned as a new ``PolyMesh``.
+
+        ``value`` can be one or several iso values.
+        """
+        grid = self.grid(component)
+
+        surfaces = [volume.isosurface(grid, v, self.origin, self.spacing, self.brick_size) for v in np.atleast_1d(value)]
+        offsets = np.cumsum([0] + [len(points) for points, _, _ in surfaces[:-1]])
+
+        lo, hi, t = [np.concatenate(arrays) for arrays in zip(*[interpolation for _, _, interpolation in surfaces])]
+
+        return PolyMesh(
+            vertices=np.concatenate([points for points, _, _ in surfaces]),
+            triangle_indices=np.concatenate([triangles + np.uint32(offset) for (_, triangles, _), offset in zip(surfaces, offsets)]),
+            data=self._derived_data(lambda grid: volume.interpolate(grid, lo, hi, t)),
+            default_color=self.default_color
+        )
+
+    def threshold(self, component, min, max, inclusive=True):
+        """Compute the boundary of the voxels for which the values of all the corners lie in the range, as a new ``PolyMesh``."""
+        triangles, ids = compact(volume.threshold(self.grid(component), min, max, inclusive))
+
+        return PolyMesh(
+            vertices=volume.grid_points(ids, self.shape, self.origin, self.spacing),
+            triangle_indices=triangles,
+            data=self._derived_data(lambda grid: volume.sample(grid, ids)),
+            default_color=self.default_color
+        )
+
+    def _derived_data(self, transform):
+        """Create new Data widgets applying ``transform`` to the grid of every component."""
+        return [
+            Data(d.name, [Component(c.name, transform(self._grids[c])) for c in d.components])
+            for d in self.data
+        ]
+
+    @observe('origin', 'spacing')
+    def _update_vertices(self, change):
+        self.vertices = volume.grid_points(self._skin_ids, self.shape, self.origin, self.spacing).ravel()
+
+    def _brick_textures(self):
+        """Iterate over the bricks of the rendered grid, as ``(slices, texture)`` tuples."""
+        component = self[self.volume_input]
+        grid = self._grids[component]
+
+        for slices in volume.iter_bricks(self.shape, self.brick_size):
+            yield slices, volume.texture(grid[slices], component.min, component.max, self.quantization)
+
+    def _stream_bricks(self):
+        """Send again the textures of the bricks of which the values changed, every brick being a separate widget."""
+        for brick, (_, values) in zip(self.bricks, self._brick_textures()):
+            if not np.array_equal(values, brick.values):
+                brick.values = values
+
+    @observe('volume_input', 'quantization', 'brick_size')
+    def _update_bricks(self, change):
+        old_bricks = self.bricks
+
+        bricks = []
+        if self.volume_input is not None:
+            for slices, values in self._brick_textures():
+                bricks.append(VolumeBrick(
+                    offset=tuple(s.start for s in slices), shape=tuple(reversed(values.shape)), values=values
+                ))
+        self.bricks = bricks
+
+        for brick in old_bricks:
+            brick.close()
 
 
 class PointCloud(Block):
@@ -463,6 +1488,19 @@ class PointCloud(Block):
             **kwargs
         )
 
+    @staticmethod
+    def from_pyvista(obj, **kwargs):
+        """Import the points and point data of any ``pyvista`` or ``vtk`` dataset, as NumPy views on the pyvista arrays.
+
+        Parameters
+        ----------
+        obj : pyvista compatible object
+            Any object compatible with pyvista.
+        """
+        _, mesh = _pyvista_dataset(obj)
+
+        return PointCloud(vertices=np.asarray(mesh.points), data=_pyvista_data(mesh), **kwargs)
+
     def reload(self, path, reload_vertices=False, reload_data=True):
         """Reload a vtk file, entirely or partially."""
         from .vtk_loader import (
@@ -478,6 +1516,71 @@ class PointCloud(Block):
                 _update_data_widget(get_ugrid_data(grid), self)
 
 
+class Glyphs(Block):
+    """Glyphs placed at the vertices of a block, oriented and scaled by a 3-D vector data.
+
+    Only the glyph template and the per-glyph positions (the ``vertices``), ``orientations`` and ``scales`` are sent to
+    the front-end, so that the transfer scales with the number of glyphs and not with the size of their geometry. The
+    ``data`` of the glyphs are the ``source`` data at their positions.
+    """
+
+    _model_name = Unicode('GlyphsModel').tag(sync=True)
+
+    template_vertices = Array(default_value=array(FLOAT32)).tag(sync=True, **array_serialization)
+    template_triangle_indices = Array(default_value=array(UINT32)).tag(sync=True, **array_serialization)
+
+    orientations = Array(default_value=array(FLOAT32)).tag(sync=True, **array_serialization)
+    scales = Array(default_value=array(FLOAT32)).tag(sync=True, **array_serialization)
+
+    factor = CFloat(1.)
+
+    def __init__(self, source, input, factor=1., template=None, stride=1, max_glyphs=None, random=False, seed=None, **kwargs):
+        """Create Glyphs given the ``source`` block and the ``input`` vector data name (or a tuple of 3 (data name, component
+        name) tuples).
+
+        ``template`` is a ``(vertices, triangle_indices)`` tuple for a glyph pointing along the z axis, it defaults to an
+        arrow of length 1. Glyphs are drawn at every ``stride``-th vertex, and at most ``max_glyphs`` of them are kept
+        (evenly spaced, or picked at random if ``random`` is ``True``).
+        """
+        template_vertices, template_triangle_indices = arrow() if template is None else template
+
+        self._ids = subsample(len(_vertices_array(source)), stride, max_glyphs, random, seed)
+
+        vectors = _vector_field(source, input)[self._ids]
+        self._norms = np.linalg.norm(vectors, axis=1)
+
+        orientations = np.zeros_like(vectors, dtype=np.float32)
+        orientations[:, 2] = 1.
+        np.divide(vectors, self._norms[:, np.newaxis], out=orientations, where=self._norms[:, np.newaxis] > 0)
+
+        super(Glyphs, self).__init__(
+            vertices=_vertices_array(source)[self._ids].ravel(),
+            data=_derived_data_widgets(source.data, lambda array: array[self._ids]),
+            template_vertices=np.asarray(template_vertices, dtype=np.float32).ravel(),
+            template_triangle_indices=np.asarray(template_triangle_indices, dtype=np.uint32).ravel(),
+            orientations=orientations.ravel(), scales=(self._norms * factor).astype(np.float32),
+            factor=factor, default_color=source.default_color, **kwargs
+        )
+
+    @observe('factor')
+    def _update_scales(self, change):
+        self.scales = (self._norms * self.factor).astype(np.float32)
+
+    def extract(self):
+        """Build the explicit geometry of all the glyphs as a new ``PolyMesh``."""
+        vertices, triangle_indices = expand(
+            self.template_vertices, self.template_triangle_indices, _vertices_array(self), self.orientations, self.scales
+        )
+        n_template_vertices = len(np.asarray(self.template_vertices).reshape(-1, 3))
+
+        return PolyMesh(
+            vertices=vertices,
+            triangle_indices=triangle_indices,
+            data=_derived_data_widgets(self.data, lambda array: np.repeat(array, n_template_vertices)),
+            default_color=self.default_color
+        )
+
+
 class Effect(Block):
     """An effect applied to another block.
 
@@ -504,6 +1607,120 @@ class Effect(Block):
         """Input dimension."""
         return 0
 
+    @property
+    def source(self):
+        """Get the mesh at the root of the chain of effects.
+
+        It holds the topology and the data of the chain, the displayed vertices being given by ``evaluate``.
+        """
+        block = self.parent
+        while isinstance(block, Effect):
+            block = block.parent
+
+        return block
+
+    # The field of the Evaluation computed by the effect, and the traits it depends on
+    _evaluated = None
+    _evaluation_traits = ()
+
+    @property
+    def can_evaluate(self):
+        """Whether ``evaluate`` can compute the chain of effects in the kernel."""
+        return self._evaluated is not None and self.parent.can_evaluate
+
+    def evaluate(self):
+        """Evaluate the chain of effects in the kernel, the way the front-end does.
+
+        Returns an ``Evaluation`` holding the ``(n, 3)`` vertices, the ``(n, 3)`` RGB colors between 0 and 1 and the
+        ``(n,)`` opacities, colors and opacities being ``None`` if no effect of the chain sets them. Each effect computes
+        one of them, which is memoized until its input arrays, its parameters or, for warps, the vertices of its parent
+        change. Arrays are compared by identity, they should be replaced rather than modified in place. Raises a
+        ``NotImplementedError`` if an effect of the chain cannot be evaluated, see ``can_evaluate``.
+        """
+        if not self.can_evaluate:
+            raise NotImplementedError('{} cannot be evaluated in the kernel'.format(type(self).__name__))
+
+        parent = self.parent.evaluate()
+        value = self._memoize(self._evaluation_key(parent), lambda: self._evaluate(parent))
+
+        return parent._replace(**{self._evaluated: value})
+
+    def _evaluation_key(self, parent):
+        inputs = tuple(
+            _raw_array(component.array) if isinstance(component, Component) else component
+            for component in self._input_components()
+        )
+        parameters = tuple(getattr(self, name) for name in self._evaluation_traits)
+
+        # Colors and opacities only depend on the number of vertices of the parent
+        return (parent.vertices if self._evaluated == 'vertices' else len(parent.vertices), ) + inputs + parameters
+
+    def _input_components(self):
+        """Resolve ``input`` into a list of Component widgets or constant values, one per input dimension."""
+        value = self.input
+
+        if isinstance(value, str):
+            return list(self[value].components)
+
+        if isinstance(value, (float, int)):
+            return [value]
+
+        if self.input_dim == 1 and len(value) == 2 and isinstance(value[0], str):
+            return [self[value[0], value[1]]]
+
+        return [self[el[0], el[1]] if isinstance(el, (tuple, list)) else el for el in value]
+
+    def _input_arrays(self, n_vertices):
+        """Get the input as a list of per-vertex NumPy arrays, one per input dimension."""
+        return [
+            _component_array(component) if isinstance(component, Component) else np.full(n_vertices, component, dtype=np.float32)
+            for component in self._input_components()
+        ]
+
+    def _input_range(self, percentiles=None):
+        """Compute the ``(min, max)`` range of the input from the cached statistics of its component."""
+        component = self._input_components()[0]
+
+        if not isinstance(component, Component):
+            return (component, component)
+
+        if percentiles is None:
+            return (component.min, component.max)
+
+        return tuple(float(value) for value in component.percentile(percentiles))
+
+    def _auto_range(self, percentiles=None):
+        """Set the range from the input statistics, following the bounds of the input component without percentiles."""
+        self._unfollow_input()
+
+        self._auto_ranging = True
+        try:
+            self.range = self._input_range(percentiles)
+        finally:
+            self._auto_ranging = False
+
+        component = self._input_components()[0]
+        if percentiles is None and isinstance(component, Component):
+            component.observe(self._follow_input, ['array', '_min', '_max'])
+            self._followed = component
+
+    def _follow_input(self, change):
+        self._auto_range()
+
+    @observe('input')
+    def _unfollow_input(self, change=None):
+        if self._followed is not None:
+            self._followed.unobserve(self._follow_input, ['array', '_min', '_max'])
+            self._followed = None
+
+    def _range_set(self):
+        """Stop following the input bounds when the range is set explicitly."""
+        if not self._auto_ranging:
+            self._unfollow_input()
+
+    _auto_ranging = False
+    _followed = None
+
     @default('input')
     def _default_input(self):
         if not len(self.data):
@@ -594,11 +1811,28 @@ class Warp(Effect):
     offset = Union((Tuple(trait=Unicode, minlen=3, maxlen=3), CFloat(0.)), default_value=0.).tag(sync=True)
     factor = Union((Tuple(trait=Unicode, minlen=3, maxlen=3), CFloat(0.)), default_value=1.).tag(sync=True)
 
+    _evaluated = 'vertices'
+    _evaluation_traits = ('offset', 'factor')
+
     @property
     def input_dim(self):
         """Input dimension."""
         return 3
 
+    def _vector_parameter(self, name):
+        """Get the ``offset`` or ``factor`` as a float or a 3-D vector, the tuples of strings holding numbers."""
+        value = getattr(self, name)
+
+        try:
+            return np.asarray([float(el) for el in value] if isinstance(value, tuple) else value, dtype=np.float32)
+        except ValueError:
+            raise ValueError('The Warp {} should be a number or a tuple of 3 numbers, got {}'.format(name, value))
+
+    def _evaluate(self, parent):
+        vectors = np.stack(self._input_arrays(len(parent.vertices)), axis=1)
+
+        return parent.vertices + self._vector_parameter('factor') * (vectors + self._vector_parameter('offset'))
+
 
 class WarpByScalar(Effect):
     """A warp-by-scalar effect to another block."""
@@ -607,17 +1841,37 @@ class WarpByScalar(Effect):
 
     factor = CFloat(1.).tag(sync=True)
 
+    _evaluated = 'vertices'
+    _evaluation_traits = ('factor', )
+
     @property
     def input_dim(self):
         """Input dimension."""
         return 1
 
+    @property
+    def can_evaluate(self):
+        """Whether ``evaluate`` can compute the chain of effects in the kernel, which requires a ``PolyMesh`` source."""
+        return super().can_evaluate and isinstance(self.source, PolyMesh)
+
+    def _evaluation_key(self, parent):
+        return super()._evaluation_key(parent) + (self.source.triangle_indices, )
+
+    def _evaluate(self, parent):
+        # Vertices are moved along the normals of the mesh at the root of the chain
+        scalars = self._input_arrays(len(parent.vertices))[0]
+        normals = self.source.vertex_normals()
+
+        return (parent.vertices + self.factor * scalars[:, np.newaxis] * normals).astype(parent.vertices.dtype)
+
 
 class Alpha(Effect):
     """An transparency effect to another block."""
 
     _model_name = Unicode('AlphaModel').tag(sync=True)
 
+    _evaluated = 'alpha'
+
     @default('input')
     def _default_input(self):
         return 0.7
@@ -627,17 +1881,25 @@ class Alpha(Effect):
         """Input dimension."""
         return 1
 
+    def _evaluate(self, parent):
+        return self._input_arrays(len(parent.vertices))[0].astype(np.float32)
+
 
 class RGB(Effect):
     """A color effect to another block."""
 
     _model_name = Unicode('RGBModel').tag(sync=True)
 
+    _evaluated = 'colors'
+
     @property
     def input_dim(self):
         """Input dimension."""
         return 3
 
+    def _evaluate(self, parent):
+        return np.stack(self._input_arrays(len(parent.vertices)), axis=1).astype(np.float32)
+
 
 class IsoColor(Effect):
     """An IsoColor effect to another block."""
@@ -650,6 +1912,9 @@ class IsoColor(Effect):
     colormap = Any(allow_none=False, default_value=colormaps.Viridis).tag(sync=True)
     type = Enum(['linear', 'log'], default_value='linear').tag(sync=True)
 
+    _evaluated = 'colors'
+    _evaluation_traits = ('min', 'max', 'colormap', 'type')
+
     def __init__(self, parent, **kwargs):
         super().__init__(parent, **kwargs)
         self.range = (self.min, self.max)
@@ -659,6 +1924,32 @@ class IsoColor(Effect):
         """Input dimension."""
         return 1
 
+    def _evaluate(self, parent):
+        """Map the input onto the colormap, this requires matplotlib."""
+        values = self._input_arrays(len(parent.vertices))[0]
+
+        return (apply_colormap(values, self.min, self.max, self.colormap, self.type) / 255.).astype(np.float32)
+
+    @observe('min', 'max')
+    def _update_range(self, change):
+        self.range = (self.min, self.max)
+
+    @observe('range')
+    def _update_min_max(self, change):
+        self._range_set()
+
+        with self.hold_trait_notifications():
+            self.min, self.max = self.range
+
+    def auto_range(self, percentiles=None):
+        """Set the range from the statistics of the input component.
+
+        ``percentiles`` can be a ``(low, high)`` tuple, e.g. ``(2, 98)``, in order to ignore outliers. Without
+        percentiles, the range follows the bounds of the component (e.g. updated by a ``MeshPartition``) until it is set
+        explicitly.
+        """
+        self._auto_range(percentiles)
+
     @validate('colormap')
     def _valid_colormap(self, proposal):
         """Validate colormap. """
@@ -710,6 +2001,33 @@ class IsoSurface(Effect):
         """Input dimension."""
         return 1
 
+    def extract(self, values=None):
+        """Compute the isosurface in the kernel and return it as a new ``PolyMesh``.
+
+        Contrary to the ``IsoSurface`` effect, only the surface and its interpolated data are sent to the front-end.
+        ``values`` can be one or several iso values, it defaults to the ``value`` attribute.
+        """
+        mesh = self.source
+        if isinstance(mesh, Volume):
+            return mesh.isosurface(self._input_components()[0], self.value if values is None else values)
+
+        if not isinstance(mesh, TetraMesh):
+            raise TypeError('IsoSurface can only be extracted from a TetraMesh or a Volume')
+
+        # The vertices as displayed, e.g. warped
+        vertices = self.parent.evaluate().vertices
+        points, triangles, (lo, hi, t) = isosurface(
+            vertices, mesh.tetrahedron_indices, self._input_arrays(len(vertices))[0],
+            self.value if values is None else values
+        )
+
+        return PolyMesh(
+            vertices=points,
+            triangle_indices=triangles,
+            data=_derived_data_widgets(mesh.data, lambda array: interpolate(array, lo, hi, t)),
+            default_color=mesh.default_color
+        )
+
 
 class Threshold(Effect):
     """An Threshold effect to another block."""
@@ -731,6 +2049,67 @@ class Threshold(Effect):
         """Input dimension."""
         return 1
 
+    @observe('min', 'max')
+    def _update_range(self, change):
+        self.range = (self.min, self.max)
+
+    @observe('range')
+    def _update_min_max(self, change):
+        self._range_set()
+
+        with self.hold_trait_notifications():
+            self.min, self.max = self.range
+
+    def auto_range(self, percentiles=None):
+        """Set the range from the statistics of the input component.
+
+        ``percentiles`` can be a ``(low, high)`` tuple, e.g. ``(2, 98)``, in order to ignore outliers. Without
+        percentiles, the range follows the bounds of the component (e.g. updated by a ``MeshPartition``) until it is set
+        explicitly.
+        """
+        self._auto_range(percentiles)
+
+    def extract(self):
+        """Evaluate the threshold in the kernel and return the kept part of the mesh as a new block.
+
+        Contrary to the ``Threshold`` effect, only the reduced geometry and its data are sent to the front-end.
+        A cell is kept if the input value of all its vertices lies in the range. The boundary of the kept cells
+        is returned as a ``PolyMesh``, or a ``PointCloud`` if the source is a point-cloud.
+        """
+        mesh = self.source
+        if isinstance(mesh, Volume):
+            return mesh.threshold(self._input_components()[0], self.min, self.max, self.inclusive)
+
+        # The vertices as displayed, e.g. warped
+        vertices = self.parent.evaluate().vertices
+        values = self._input_arrays(len(vertices))[0]
+
+        if isinstance(mesh, PointCloud):
+            vertex_ids = np.flatnonzero(in_range(values, self.min, self.max, self.inclusive))
+
+            return PointCloud(
+                vertices=vertices[vertex_ids],
+                data=_derived_data_widgets(mesh.data, lambda array: array[vertex_ids]),
+                default_color=mesh.default_color
+            )
+
+        if isinstance(mesh, TetraMesh):
+            tetrahedrons = np.asarray(mesh.tetrahedron_indices).reshape(-1, 4)
+            kept = tetrahedrons[threshold_cells(tetrahedrons, values, self.min, self.max, self.inclusive)]
+            triangles = tetrahedron_skin(kept)
+        else:
+            triangles = np.asarray(mesh.triangle_indices).reshape(-1, 3)
+            triangles = triangles[threshold_cells(triangles, values, self.min, self.max, self.inclusive)]
+
+        triangles, vertex_ids = compact(triangles, len(vertices))
+
+        return PolyMesh(
+            vertices=vertices[vertex_ids],
+            triangle_indices=triangles,
+            data=_derived_data_widgets(mesh.data, lambda array: array[vertex_ids]),
+            default_color=mesh.default_color
+        )
+
 
 class UnderWater(Effect):
     """An nice UnderWater effect to another block."""
@@ -772,6 +2151,87 @@ class Scene(_GanyDOMWidgetBase):
 
     camera = Dict(allow_none=True, default_value=None).tag(sync=True)
 
+    _click_handled = Bool(False).tag(sync=True)
+
     def __init__(self, children=[], **kwargs):
         """Construct a Scene."""
         super(Scene, self).__init__(children=children, **kwargs)
+
+        self._click_handlers = CallbackDispatcher()
+        self._evaluated_bvhs = weakref.WeakKeyDictionary()
+        self.on_msg(self._handle_scene_msg)
+
+    def export_glb(self, path, **kwargs):
+        """Export the blocks of the scene into a binary glTF file, see ``ipygany.gltf.export_glb`` for the options."""
+        export_glb(self.children, path, **kwargs)
+
+    def render_png(self, path, width=800, height=600, **kwargs):
+        """Render the scene into a PNG file without a browser, see ``ipygany.raster.render`` for the options."""
+        render_png(self, path, width, height, **kwargs)
+
+    def on_click(self, callback, remove=False):
+        """Register a callback to execute when a block of the scene is clicked.
+
+        The callback will be called with three arguments: the clicked block, the index of the clicked triangle and the
+        clicked point.
+
+        Parameters
+        ----------
+        remove: bool (optional)
+            Set to true to remove the callback from the list of callbacks.
+        """
+        self._click_handlers.register_callback(callback, remove=remove)
+
+        # The front-end only sends the clicks when there is a callback
+        self._click_handled = len(self._click_handlers.callbacks) > 0
+
+    def pick(self, origin, direction):
+        """Find the block hit first by a ray.
+
+        Blocks are picked as displayed, i.e. after the effects moving their vertices. Returns a ``(block,
+        triangle_index, point)`` tuple, or ``None`` if no block is hit.
+        """
+        origin = np.asarray(origin, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+
+        closest = None
+        closest_distance = np.inf
+
+        for block in self.children:
+            mesh = block.source if isinstance(block, Effect) else block
+            if not block.can_evaluate or not isinstance(mesh, PolyMesh):
+                continue
+
+            vertices = block.evaluate().vertices
+
+            triangles, distances, _ = self._pick_bvh(block, vertices, mesh).intersect(origin, direction)
+            if triangles[0] < 0:
+                continue
+
+            if distances[0] < closest_distance:
+                closest = (block, triangles[0], origin + distances[0] * direction)
+                closest_distance = distances[0]
+
+        return closest
+
+    def _pick_bvh(self, block, vertices, mesh):
+        """Get the BVH of the triangles of a block with its evaluated vertices, cached until they change."""
+        if vertices is mesh.evaluate().vertices:
+            return mesh.triangle_bvh
+
+        cached = self._evaluated_bvhs.get(block)
+        if cached is None or cached[0] is not vertices:
+            cached = (vertices, BVH(vertices, np.asarray(mesh.triangle_indices).reshape(-1, 3)))
+            self._evaluated_bvhs[block] = cached
+
+        return cached[1]
+
+    def _handle_scene_msg(self, _, content, buffers):
+        if not self._click_handlers.callbacks:
+            return
+
+        if content.get('event', '') == 'click':
+            hit = self.pick(content['origin'], content['direction'])
+
+            if hit is not None:
+                self._click_handlers(*hit)
@@ -0,0 +1,121 @@
+"""Spatial partitioning of meshes into chunks which can be culled and updated independently."""
+
+import numpy as np
+
+from .bvh import morton_codes
+from .filters import compact
+from .statistics import Statistics
+
+
+def partition_triangles(vertices, triangle_indices, max_triangles=2 ** 16):
+    """Split triangles into spatially coherent chunks of at most ``max_triangles`` triangles.
+
+    Triangles are sorted along a Morton curve of their centroids, then split in order. Returns a list of
+    ``(vertex_ids, local_triangle_indices, bounding_box)`` tuples, where ``vertex_ids`` are the indices of the vertices
+    used by the chunk, ``local_triangle_indices`` index into ``vertex_ids``, and ``bounding_box`` is the ``(min, max)``
+    corners of the chunk.
+    """
+    vertices = np.asarray(vertices).reshape(-1, 3)
+    triangle_indices = np.asarray(triangle_indices).reshape(-1, 3)
+
+    if not len(triangle_indices):
+        return []
+
+    order = np.argsort(morton_codes(vertices[triangle_indices].mean(axis=1)), kind='stable')
+
+    chunks = []
+    for start in range(0, len(order), max_triangles):
+        local_triangles, vertex_ids = compact(triangle_indices[order[start:start + max_triangles]])
+        chunk_vertices = vertices[vertex_ids]
+
+        chunks.append((vertex_ids, local_triangles, (chunk_vertices.min(axis=0), chunk_vertices.max(axis=0))))
+
+    return chunks
+
+
+class MeshPartition:
+    """A mesh split into spatially coherent ``PolyMesh`` chunks.
+
+    Every chunk is a separate block in the front-end, which means a separate GPU geometry that the renderer can cull on
+    its own. Updates of the vertices or of the data are only sent to the chunks they affect: new values are compared to
+    the arrays of the chunks, so that the partition does not hold a copy of the mesh.
+    """
+
+    def __init__(self, mesh, max_triangles=2 ** 16):
+        """Partition a ``PolyMesh`` or a ``TetraMesh`` (its skin) into chunks of at most ``max_triangles`` triangles."""
+        from .ipygany import PolyMesh, Data, Component, _component_array, _vertices_array
+
+        self.mesh = mesh
+
+        vertices = _vertices_array(mesh)
+        partition = partition_triangles(vertices, mesh.triangle_indices, max_triangles)
+
+        self.vertex_ids = [vertex_ids for vertex_ids, _, _ in partition]
+        self.bounding_boxes = [bounding_box for _, _, bounding_box in partition]
+
+        self.chunks = [
+            PolyMesh(
+                vertices=vertices[vertex_ids],
+                triangle_indices=local_triangles,
+                data=[
+                    Data(data.name, [
+                        # Keep the range of the whole mesh, so that effects are consistent across chunks
+                        Component(
+                            component.name, _component_array(component)[vertex_ids],
+                            min=component.min, max=component.max
+                        )
+                        for component in data.components
+                    ])
+                    for data in mesh.data
+                ],
+                default_color=mesh.default_color
+            )
+            for vertex_ids, local_triangles, _ in partition
+        ]
+
+    def _changed_chunks(self, values, chunk_values):
+        """Get the indices of the chunks for which ``values`` differ from the ``chunk_values(i)`` arrays, NaNs being equal
+        to each other."""
+        return [
+            i for i, vertex_ids in enumerate(self.vertex_ids)
+            if not np.array_equal(
+                values[vertex_ids], np.asarray(chunk_values(i)).reshape(values[vertex_ids].shape), equal_nan=True
+            )
+        ]
+
+    def update_vertices(self, vertices):
+        """Update the vertices, only sending the chunks which moved. Returns the indices of the updated chunks."""
+        from .ipygany import _vertices_array
+
+        vertices = np.asarray(vertices).reshape(-1, 3)
+
+        updated = self._changed_chunks(vertices, lambda i: _vertices_array(self.chunks[i]))
+        for i in updated:
+            chunk_vertices = vertices[self.vertex_ids[i]]
+
+            self.chunks[i].vertices = chunk_vertices
+            self.bounding_boxes[i] = (chunk_vertices.min(axis=0), chunk_vertices.max(axis=0))
+
+        return updated
+
+    def update_data(self, key, array):
+        """Update the array of a component given its ``(data name, component name)`` key.
+
+        Only the chunks for which the values changed are updated. The bounds of the components of all the chunks are set
+        to the ones of the new array, effects following them through ``auto_range`` being updated as well. Returns the
+        indices of the updated chunks.
+        """
+        from .ipygany import _component_array
+
+        array = np.asarray(array)
+
+        updated = self._changed_chunks(array, lambda i: _component_array(self.chunks[i][key]))
+        for i in updated:
+            self.chunks[i][key].array = array[self.vertex_ids[i]]
+
+        statistics = Statistics(array)
+        for chunk in self.chunks:
+            chunk[key].min = statistics.min
+            chunk[key].max = statistics.max
+
+        return updated
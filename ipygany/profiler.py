@@ -0,0 +1,241 @@
+"""Instrumentation of the serialization and of the comm traffic of ipygany widgets."""
+
+import json
+import time
+import uuid
+from collections import Counter
+
+from ipywidgets import Widget
+from ipywidgets.widgets import widget as widget_module
+
+from . import serialization
+from ._frontend import module_name
+
+COUNTERS = ('messages', 'bytes', 'buffer_bytes', 'encodes', 'encode_time')
+
+_active = None
+
+
+class TraitStatistics:
+    """Counters of one trait of one widget class."""
+
+    def __init__(self):
+        self.messages = 0
+        self.bytes = 0
+        self.buffer_bytes = 0
+        self.encodes = 0
+        self.encode_time = 0.
+        self.conversions = Counter()
+
+    def as_dict(self):
+        statistics = {counter: getattr(self, counter) for counter in COUNTERS}
+        statistics['conversions'] = dict(self.conversions)
+
+        return statistics
+
+
+class FakeComm:
+    """A comm standing in for the front-end, which records the messages sent to it.
+
+    It makes the widget traffic observable in tests and CI, where no kernel is running. ``messages`` holds the
+    ``{'method', 'data', 'buffers'}`` of each message, starting with the ``'open'`` message holding the initial state.
+    """
+
+    def __init__(self, target_name='', data=None, metadata=None, buffers=None, comm_id=None, **kwargs):
+        self.target_name = target_name
+        self.comm_id = comm_id if comm_id is not None else uuid.uuid4().hex
+        self.messages = [{'method': 'open', 'data': data, 'buffers': list(buffers or [])}]
+        self.closed = False
+
+        self._msg_callback = None
+
+    def send(self, data=None, metadata=None, buffers=None):
+        self.messages.append({'method': data.get('method'), 'data': data, 'buffers': list(buffers or [])})
+
+    def close(self, data=None, metadata=None, buffers=None, deleting=False):
+        self.closed = True
+
+    def on_msg(self, callback):
+        self._msg_callback = callback
+
+    def on_close(self, callback):
+        pass
+
+    def receive(self, data, buffers=None):
+        """Simulate a message sent by the front-end, e.g. ``{'method': 'update', 'state': {...}}``."""
+        if self._msg_callback is not None:
+            self._msg_callback({'content': {'data': data}, 'buffers': buffers or []})
+
+
+def _format_bytes(n):
+    for unit in ('B', 'kB', 'MB'):
+        if n < 1024:
+            return '{:.4g} {}'.format(n, unit)
+        n /= 1024
+
+    return '{:.4g} GB'.format(n)
+
+
+class Profiler:
+    """Record, per widget class and trait, the state messages sent by ipygany widgets and the cost of encoding them.
+
+    For each trait, the profiler counts the messages and bytes sent (initial states and updates), the number and
+    duration of encodings to the wire format, and the dtype conversions (e.g. ``float64`` arrays cast to
+    ``float32``).
+
+    >>> with Profiler() as profiler:
+    ...     mesh = PolyMesh(vertices=vertices, triangle_indices=triangles)
+    ...     mesh.vertices = new_vertices
+    >>> print(profiler.summary())
+
+    Parameters
+    ----------
+    fake_comm : bool
+        If ``True``, widgets created in the context are given a ``FakeComm`` instead of a kernel comm.
+    hooks : list of callables
+        Called as ``hook(widget_name, trait, counter, value)`` each time a counter is incremented, e.g. to export the
+        counters to a monitoring system.
+    """
+
+    def __init__(self, fake_comm=False, hooks=()):
+        self.fake_comm = fake_comm
+        self.hooks = list(hooks)
+        self.statistics = {}
+
+        self._current = None
+        self._opening = None
+        self._originals = []
+
+    def reset(self):
+        """Reset all the counters."""
+        self.statistics = {}
+
+    def _tracked(self, widget):
+        return getattr(widget, '_model_module', None) == module_name
+
+    def _add(self, widget, key, **increments):
+        statistics = self.statistics.setdefault((type(widget).__name__, key), TraitStatistics())
+
+        for counter, value in increments.items():
+            if counter == 'conversions':
+                statistics.conversions[value] += 1
+                value = 1
+            else:
+                setattr(statistics, counter, getattr(statistics, counter) + value)
+
+            for hook in self.hooks:
+                hook(type(widget).__name__, key, counter, value)
+
+    def _record_message(self, widget, data, buffers):
+        buffer_bytes = Counter()
+        for path, buffer in zip(data.get('buffer_paths', []), buffers or []):
+            buffer_bytes[path[0]] += memoryview(buffer).nbytes
+
+        for key, value in data.get('state', {}).items():
+            json_bytes = len(json.dumps(value, separators=(',', ':'), default=str))
+            self._add(
+                widget, key,
+                messages=1, bytes=json_bytes + buffer_bytes[key], buffer_bytes=buffer_bytes[key]
+            )
+
+    def _on_serialization(self, obj, array, dtype):
+        if self._current is not None and array.dtype != dtype:
+            widget, key = self._current
+            self._add(widget, key, conversions='{}->{}'.format(array.dtype, dtype))
+
+    def _patch(self, owner, name, replacement):
+        self._originals.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, replacement)
+
+    def __enter__(self):
+        global _active
+
+        if _active is not None:
+            raise RuntimeError('Another Profiler is already active')
+        _active = self
+
+        profiler = self
+        get_state = Widget.get_state
+        send = Widget._send
+
+        def profiled_get_state(widget, key=None, drop_defaults=False):
+            if not profiler._tracked(widget):
+                return get_state(widget, key=key, drop_defaults=drop_defaults)
+
+            keys = widget.keys if key is None else ([key] if isinstance(key, str) else key)
+
+            state = {}
+            for k in keys:
+                profiler._current = (widget, k)
+                start = time.perf_counter()
+                try:
+                    state.update(get_state(widget, key=k, drop_defaults=drop_defaults))
+                finally:
+                    profiler._current = None
+                profiler._add(widget, k, encodes=1, encode_time=time.perf_counter() - start)
+
+            return state
+
+        def profiled_send(widget, msg, buffers=None):
+            if profiler._tracked(widget) and msg.get('method') in ('update', 'echo_update'):
+                profiler._record_message(widget, msg, buffers)
+
+            return send(widget, msg, buffers=buffers)
+
+        # The initial state is sent when creating the comm, ipywidgets 7 uses the ipykernel Comm class directly
+        comm_owner, comm_name = (widget_module, 'Comm') if hasattr(widget_module, 'Comm') else (widget_module.comm, 'create_comm')
+        create_comm = getattr(comm_owner, comm_name)
+        open_ = Widget.open
+
+        def profiled_create_comm(*args, **kwargs):
+            if profiler._opening is not None:
+                profiler._record_message(profiler._opening, kwargs.get('data') or {}, kwargs.get('buffers'))
+
+            return (FakeComm if profiler.fake_comm else create_comm)(*args, **kwargs)
+
+        def profiled_open(widget):
+            profiler._opening = widget if profiler._tracked(widget) else None
+            try:
+                open_(widget)
+            finally:
+                profiler._opening = None
+
+        self._patch(Widget, 'get_state', profiled_get_state)
+        self._patch(Widget, '_send', profiled_send)
+        self._patch(Widget, 'open', profiled_open)
+        self._patch(comm_owner, comm_name, profiled_create_comm)
+        serialization.serialization_hooks.append(self._on_serialization)
+
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+
+        serialization.serialization_hooks.remove(self._on_serialization)
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals = []
+
+        _active = None
+
+    def as_dicts(self):
+        """Get the counters as a list of dictionaries, one per widget class and trait."""
+        return [
+            dict(widget=widget, trait=trait, **statistics.as_dict())
+            for (widget, trait), statistics in self.statistics.items()
+        ]
+
+    def summary(self, sort='bytes'):
+        """Get a table of the counters, sorted in decreasing order of the ``sort`` counter."""
+        rows = sorted(self.as_dicts(), key=lambda row: row[sort], reverse=True)
+
+        header = ('widget', 'trait', 'messages', 'bytes', 'encodes', 'encode time', 'conversions')
+        lines = [header] + [(
+            row['widget'], row['trait'], str(row['messages']), _format_bytes(row['bytes']), str(row['encodes']),
+            '{:.3f} ms'.format(row['encode_time'] * 1e3),
+            ', '.join('{} x{}'.format(conversion, n) for conversion, n in row['conversions'].items())
+        ) for row in rows]
+
+        widths = [max(len(line[i]) for line in lines) for i in range(len(header))]
+
+        return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() for line in lines)
@@ -0,0 +1,357 @@
+"""Headless software rendering of scenes to PNG images, for thumbnails and batch reports."""
+
+import re
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+FOV = 50.
+
+# Number of candidate fragments processed at once in a tile
+MAX_FRAGMENTS = 2 ** 21
+
+
+def parse_color(color, default=(1., 1., 1.)):
+    """Convert a CSS color into RGB floats between 0 and 1. Named colors other than black and white require matplotlib."""
+    if isinstance(color, str):
+        if re.fullmatch('#[0-9a-fA-F]{6}', color):
+            return tuple(int(color[i:i + 2], 16) / 255. for i in (1, 3, 5))
+        if re.fullmatch('#[0-9a-fA-F]{3}', color):
+            return tuple(int(c * 2, 16) / 255. for c in color[1:])
+        if color in ('white', 'black'):
+            return (1., 1., 1.) if color == 'white' else (0., 0., 0.)
+
+        try:
+            from matplotlib.colors import to_rgb
+            return to_rgb(color)
+        except (ImportError, ValueError):
+            pass
+
+    return default
+
+
+class Camera:
+    """A perspective camera looking from ``position`` at ``target``."""
+
+    def __init__(self, position, target, up=(0., 1., 0.), fov=FOV, near=None):
+        self.position = np.asarray(position, dtype=np.float64)
+        self.target = np.asarray(target, dtype=np.float64)
+
+        forward = self.target - self.position
+        forward /= np.linalg.norm(forward)
+        right = np.cross(forward, up)
+        if np.linalg.norm(right) < 1e-12:
+            right = np.cross(forward, (0., 0., 1.) if abs(forward[2]) < 0.9 else (1., 0., 0.))
+        right /= np.linalg.norm(right)
+
+        # Rows of the world to view rotation, the view z axis pointing forward
+        self.rotation = np.stack((right, np.cross(right, forward), forward))
+        self.focal = 1. / np.tan(np.radians(fov) / 2.)
+        self.near = near if near is not None else 1e-6 * np.linalg.norm(self.target - self.position)
+
+    @staticmethod
+    def fit(vertices, fov=FOV):
+        """Frame points the same way as the front-end: looking down the z axis at their bounding sphere."""
+        lo, hi = vertices.min(axis=0), vertices.max(axis=0)
+        center = (lo + hi) / 2.
+        radius = max(np.linalg.norm(hi - lo) / 2., 1e-12)
+
+        return Camera(center + (0., 0., 2.5 * radius), center, fov=fov, near=radius / 3.)
+
+    def project(self, vertices, width, height):
+        """Project points into ``(x, y, depth)`` pixel coordinates, the depth being the distance along the view axis."""
+        view = (np.asarray(vertices, dtype=np.float64) - self.position) @ self.rotation.T
+        depth = view[:, 2]
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = (1. + self.focal * view[:, 0] / (depth * width / height)) * width / 2.
+            y = (1. - self.focal * view[:, 1] / depth) * height / 2.
+
+        return np.stack((x, y, depth), axis=1)
+
+
+def _shade(vertices, triangles, colors, camera):
+    """Compute the per-corner colors of triangles lit by a headlight, both faces being lit."""
+    a, b, c = (vertices[triangles[:, i]] for i in range(3))
+    normals = np.cross(b - a, c - a)
+    norms = np.linalg.norm(normals, axis=1)
+
+    to_camera = camera.position - (a + b + c) / 3.
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cos = np.abs(np.einsum('ij,ij->i', normals, to_camera)) / (norms * np.linalg.norm(to_camera, axis=1))
+
+    intensity = 0.35 + 0.65 * np.nan_to_num(cos)
+
+    return colors[triangles] * intensity[:, np.newaxis, np.newaxis]
+
+
+def _resolve_fragments(pixels, depths, colors, depth_buffer, color_buffer):
+    """Keep the nearest fragment per pixel, and write it if it is nearer than the depth buffer."""
+    order = np.lexsort((depths, pixels))
+    pixels, depths, colors = pixels[order], depths[order], colors[order]
+
+    first = np.ones(len(pixels), dtype=bool)
+    first[1:] = pixels[1:] != pixels[:-1]
+    pixels, depths, colors = pixels[first], depths[first], colors[first]
+
+    nearer = depths < depth_buffer[pixels]
+    depth_buffer[pixels[nearer]] = depths[nearer]
+    color_buffer[pixels[nearer]] = colors[nearer]
+
+
+def _rasterize_tile(tile, corners, corner_colors, depth_buffer, color_buffer):
+    """Rasterize triangles given by their ``(n, 3, 3)`` projected corners into the buffers of a tile.
+
+    ``tile`` is the ``(x0, y0, x1, y1)`` pixel range of the tile, and the buffers are flat arrays over its pixels.
+    """
+    tx0, ty0, tx1, ty1 = tile
+    tile_width = tx1 - tx0
+
+    x, y, z = corners[:, :, 0], corners[:, :, 1], corners[:, :, 2]
+
+    # Bounding boxes of the pixel centers covered by the triangles, clipped to the tile
+    bx0 = np.maximum(np.ceil(x.min(axis=1) - 0.5).astype(np.int64), tx0)
+    by0 = np.maximum(np.ceil(y.min(axis=1) - 0.5).astype(np.int64), ty0)
+    bx1 = np.minimum(np.floor(x.max(axis=1) - 0.5).astype(np.int64) + 1, tx1)
+    by1 = np.minimum(np.floor(y.max(axis=1) - 0.5).astype(np.int64) + 1, ty1)
+
+    widths = np.maximum(bx1 - bx0, 0)
+    counts = widths * np.maximum(by1 - by0, 0)
+
+    area = (x[:, 1] - x[:, 0]) * (y[:, 2] - y[:, 0]) - (x[:, 2] - x[:, 0]) * (y[:, 1] - y[:, 0])
+
+    # Process the triangles in batches bounding the number of candidate fragments
+    ends = np.cumsum(counts)
+    start = 0
+    while start < len(counts):
+        limit = (ends[start - 1] if start else 0) + MAX_FRAGMENTS
+        stop = max(int(np.searchsorted(ends, limit, side='right')), start + 1)
+        batch = np.arange(start, stop)
+        start = stop
+
+        batch = batch[(counts[batch] > 0) & (area[batch] != 0.)]
+        if not len(batch):
+            continue
+
+        # Enumerate the pixels of the bounding boxes
+        ids = np.repeat(batch, counts[batch])
+        offsets = np.arange(len(ids)) - np.repeat(np.cumsum(counts[batch]) - counts[batch], counts[batch])
+        px = bx0[ids] + offsets % widths[ids]
+        py = by0[ids] + offsets // widths[ids]
+
+        cx, cy = px + 0.5, py + 0.5
+        xs, ys = x[ids], y[ids]
+
+        # Barycentric coordinates, positive inside the triangle whatever its orientation
+        l0 = ((xs[:, 1] - cx) * (ys[:, 2] - cy) - (xs[:, 2] - cx) * (ys[:, 1] - cy)) / area[ids]
+        l1 = ((xs[:, 2] - cx) * (ys[:, 0] - cy) - (xs[:, 0] - cx) * (ys[:, 2] - cy)) / area[ids]
+        l2 = 1. - l0 - l1
+
+        inside = (l0 >= 0.) & (l1 >= 0.) & (l2 >= 0.)
+        ids, px, py = ids[inside], px[inside], py[inside]
+        weights = np.stack((l0[inside], l1[inside], l2[inside]), axis=1)
+
+        depths = np.einsum('ij,ij->i', weights, z[ids])
+        colors = np.einsum('ij,ijk->ik', weights, corner_colors[ids])
+
+        _resolve_fragments((py - ty0) * tile_width + (px - tx0), depths, colors, depth_buffer, color_buffer)
+
+
+def rasterize(primitives, camera, width, height, background=(1., 1., 1.), tile_size=64, point_size=2):
+    """Rasterize primitives into a ``(height, width, 3)`` array of RGB bytes.
+
+    ``primitives`` is a list of ``(vertices, triangles, colors)``, ``colors`` being per-vertex RGB floats, and
+    ``triangles`` being ``None`` for point clouds. Triangles are set up in bulk, binned into square tiles, and each tile
+    is rasterized into its own z-buffer with vectorized barycentric tests.
+    """
+    corners = [np.empty((0, 3, 3))]
+    corner_colors = [np.empty((0, 3, 3))]
+    points = [np.empty((0, 3))]
+    point_colors = [np.empty((0, 3))]
+
+    for vertices, triangles, colors in primitives:
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        colors = np.asarray(colors, dtype=np.float64).reshape(-1, 3)
+        projected = camera.project(vertices, width, height)
+
+        if triangles is None:
+            visible = projected[:, 2] > camera.near
+            points.append(projected[visible])
+            point_colors.append(colors[visible])
+            continue
+
+        triangles = np.asarray(triangles, dtype=np.int64).reshape(-1, 3)
+
+        # Triangles crossing the near plane are dropped
+        visible = np.all(projected[triangles, 2] > camera.near, axis=1)
+        corners.append(projected[triangles[visible]])
+        corner_colors.append(_shade(vertices, triangles[visible], colors, camera))
+
+    corners = np.concatenate(corners)
+    corner_colors = np.concatenate(corner_colors)
+    points = np.concatenate(points)
+    point_colors = np.concatenate(point_colors)
+
+    image = np.empty((height, width, 3))
+    image[:] = background
+
+    # Bin the triangles into tiles
+    n_tiles_x = -(-width // tile_size)
+    n_tiles_y = -(-height // tile_size)
+    with np.errstate(invalid='ignore'):
+        lo = np.floor(corners[:, :, :2].min(axis=1) / tile_size)
+        hi = np.floor(corners[:, :, :2].max(axis=1) / tile_size)
+    on_screen = np.all(np.isfinite(lo) & np.isfinite(hi), axis=1) & (hi[:, 0] >= 0) & (hi[:, 1] >= 0) & \
+        (lo[:, 0] < n_tiles_x) & (lo[:, 1] < n_tiles_y)
+
+    lo = np.clip(lo[on_screen], 0, (n_tiles_x - 1, n_tiles_y - 1)).astype(np.int64)
+    hi = np.clip(hi[on_screen], 0, (n_tiles_x - 1, n_tiles_y - 1)).astype(np.int64)
+    triangle_ids = np.flatnonzero(on_screen)
+
+    span = hi - lo + 1
+    counts = span[:, 0] * span[:, 1]
+    pairs = np.repeat(np.arange(len(triangle_ids)), counts)
+    offsets = np.arange(len(pairs)) - np.repeat(np.cumsum(counts) - counts, counts)
+    tiles = (lo[pairs, 1] + offsets // span[pairs, 0]) * n_tiles_x + lo[pairs, 0] + offsets % span[pairs, 0]
+
+    order = np.argsort(tiles, kind='stable')
+    tiles, pairs = tiles[order], triangle_ids[pairs[order]]
+    bounds = np.searchsorted(tiles, np.arange(n_tiles_x * n_tiles_y + 1))
+
+    # Points are drawn as squares
+    point_pixels = np.floor(points[:, :2]).astype(np.int64) if len(points) else np.empty((0, 2), dtype=np.int64)
+    square = [(dx, dy) for dx in range(point_size) for dy in range(point_size)]
+    point_pixels = np.concatenate([point_pixels + d for d in square]) if len(points) else point_pixels
+    point_depths = np.tile(points[:, 2], len(square))
+    point_colors = np.tile(point_colors, (len(square), 1))
+
+    for tile_index in range(n_tiles_x * n_tiles_y):
+        tx0 = tile_index % n_tiles_x * tile_size
+        ty0 = tile_index // n_tiles_x * tile_size
+        tile = (tx0, ty0, min(tx0 + tile_size, width), min(ty0 + tile_size, height))
+        tile_width, tile_height = tile[2] - tx0, tile[3] - ty0
+
+        depth_buffer = np.full(tile_width * tile_height, np.inf)
+        color_buffer = image[ty0:tile[3], tx0:tile[2]].reshape(-1, 3).copy()
+
+        in_tile = pairs[bounds[tile_index]:bounds[tile_index + 1]]
+        if len(in_tile):
+            _rasterize_tile(tile, corners[in_tile], corner_colors[in_tile], depth_buffer, color_buffer)
+
+        if len(point_pixels):
+            px, py = point_pixels[:, 0], point_pixels[:, 1]
+            mask = (px >= tx0) & (px < tile[2]) & (py >= ty0) & (py < tile[3])
+            if np.any(mask):
+                _resolve_fragments(
+                    (py[mask] - ty0) * tile_width + (px[mask] - tx0), point_depths[mask], point_colors[mask],
+                    depth_buffer, color_buffer
+                )
+
+        image[ty0:tile[3], tx0:tile[2]] = color_buffer.reshape(tile_height, tile_width, 3)
+
+    return np.round(np.clip(image, 0., 1.) * 255.).astype(np.uint8)
+
+
+def write_png(file, image):
+    """Write a ``(height, width, 3)`` array of RGB bytes as a PNG image, to a path or a binary file object."""
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width = image.shape[:2]
+
+    # Each row starts with its filter type, 0 for no filtering
+    rows = np.concatenate((np.zeros((height, 1), dtype=np.uint8), image.reshape(height, -1)), axis=1)
+
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff)
+
+    png = b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)) + \
+        chunk(b'IDAT', zlib.compress(rows.tobytes(), 6)) + chunk(b'IEND', b'')
+
+    if isinstance(file, str):
+        with open(file, 'wb') as f:
+            f.write(png)
+    else:
+        file.write(png)
+
+
+def _scene_primitives(scene):
+    """Extract the geometry and vertex colors of the blocks of a scene, or of a list of blocks, as plain arrays."""
+    from .ipygany import PointCloud
+    from .gltf import _resolve
+
+    blocks = scene.children if hasattr(scene, 'children') else scene
+
+    primitives = []
+    for block in blocks:
+        mesh, vertices, colors = _resolve(block)
+        vertices = np.asarray(vertices, dtype=np.float64)
+
+        if colors is None:
+            colors = np.tile(parse_color(mesh.default_color, (0.39, 0.58, 0.69)), (len(vertices), 1))
+
+        triangles = None if isinstance(mesh, PointCloud) else np.asarray(mesh.triangle_indices).reshape(-1, 3)
+        primitives.append((vertices, triangles, colors))
+
+    return primitives
+
+
+def _scene_camera(scene, primitives):
+    camera = getattr(scene, 'camera', None) or {}
+
+    vertices = np.concatenate([vertices for vertices, _, _ in primitives] + [np.zeros((0, 3))])
+    fitted = Camera.fit(vertices) if len(vertices) else Camera((0., 0., 1.), (0., 0., 0.))
+
+    if 'position' not in camera:
+        return fitted
+
+    return Camera(camera['position'], camera.get('target', fitted.target), camera.get('up', (0., 1., 0.)))
+
+
+def _render_job(job):
+    primitives, camera, width, height, background, path, kwargs = job
+    image = rasterize(primitives, camera, width, height, background, **kwargs)
+
+    if path is not None:
+        write_png(path, image)
+
+    return image
+
+
+def _job(scene, width, height, path, kwargs):
+    primitives = _scene_primitives(scene)
+    background = parse_color(getattr(scene, 'background_color', 'white'))
+
+    return primitives, _scene_camera(scene, primitives), width, height, background, path, kwargs
+
+
+def render(scene, width=800, height=600, **kwargs):
+    """Render a ``Scene`` (or a list of blocks) into a ``(height, width, 3)`` array of RGB bytes, without a browser.
+
+    ``PolyMesh``, ``TetraMesh`` (their skin) and ``PointCloud`` blocks are drawn with their default color or the colors
+    of an ``IsoColor`` effect (which requires matplotlib), lit by a headlight. Other effects are drawn as their source.
+    The stored ``scene.camera`` is used if any, otherwise the blocks are framed like in the front-end.
+    """
+    return _render_job(_job(scene, width, height, None, kwargs))
+
+
+def render_png(scene, path, width=800, height=600, **kwargs):
+    """Render a ``Scene`` into a PNG file, see ``render``."""
+    _render_job(_job(scene, width, height, path, kwargs))
+
+
+def render_pngs(scenes, paths, width=800, height=600, processes=None, **kwargs):
+    """Render many scenes into PNG files, using a pool of ``processes`` worker processes.
+
+    The geometry and colors of the scenes are extracted in the current process, only plain arrays are sent to the workers.
+    """
+    jobs = [_job(scene, width, height, path, kwargs) for scene, path in zip(scenes, paths)]
+
+    if processes == 1:
+        for job in jobs:
+            _render_job(job)
+        return
+
+    with ProcessPoolExecutor(processes) as executor:
+        for _ in executor.map(_render_job, jobs):
+            pass
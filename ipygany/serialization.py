@@ -2,17 +2,26 @@ import numpy as np
 
 from ipywidgets import Widget, widget_serialization
 
+from .chunked import is_chunked_array, wire_dtype, to_buffer
+
+# Callbacks called as ``hook(obj, array, dtype)`` before each array is converted to the ``dtype`` wire buffer,
+# see ``ipygany.profiler``
+serialization_hooks = []
+
 
 def array_to_binary(ar, obj=None, force_contiguous=True):
     if ar is None:
         return None
     if ar.dtype.kind not in ['u', 'i', 'f']:  # ints and floats
         raise ValueError("unsupported dtype: %s" % (ar.dtype))
-    if ar.dtype == np.float64:  # WebGL does not support float64, case it here
-        ar = ar.astype(np.float32)
-    if ar.dtype == np.int64:  # JS does not support int64
-        ar = ar.astype(np.int32)
-    if force_contiguous and not ar.flags["C_CONTIGUOUS"]:  # make sure it's contiguous
+    dtype = wire_dtype(ar.dtype)  # WebGL does not support float64, JS does not support int64
+    for hook in serialization_hooks:
+        hook(obj, ar, dtype)
+    if is_chunked_array(ar):  # stream out-of-core arrays into the outgoing buffer
+        ar = to_buffer(ar, dtype)
+    elif ar.dtype != dtype:  # cast and make contiguous in a single copy
+        ar = ar.astype(dtype, order='C')
+    elif force_contiguous and not ar.flags["C_CONTIGUOUS"]:  # make sure it's contiguous
         ar = np.ascontiguousarray(ar)
     return {'data': memoryview(ar), 'dtype': str(ar.dtype), 'shape': ar.shape}
 
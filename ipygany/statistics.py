@@ -0,0 +1,179 @@
+"""Statistics of data arrays, computed chunk by chunk."""
+
+import numpy as np
+
+from .chunked import CHUNK_SIZE, iter_chunks, min_max, histogram
+
+# Number of bins of the histograms used for locating the values of percentiles
+PERCENTILE_BINS = 4096
+
+
+class Statistics:
+    """Statistics of an array, computed lazily and cached.
+
+    Min and max are computed in a single pass over the chunks of the array, ignoring NaNs. Histograms are computed chunk
+    by chunk too, and percentiles are located by refining the bins of a fine histogram, so no full-size temporary array
+    is created. Infinite values are counted apart from the histograms, which cover the finite values.
+    """
+
+    def __init__(self, array, chunk_size=CHUNK_SIZE):
+        self.array = array
+        self.chunk_size = chunk_size
+
+        self._min_max = None
+        self._finite = None
+        self._histograms = {}
+
+    def _compute_min_max(self):
+        if self._min_max is None:
+            self._min_max = min_max(self.array, self.chunk_size)
+
+        return self._min_max
+
+    def _compute_finite(self):
+        """Compute the min and max of the finite values, and the numbers of -inf and +inf values."""
+        if self._finite is None:
+            low, high = self._compute_min_max()
+
+            if low is None or np.isfinite(low) and np.isfinite(high):
+                self._finite = (low, high, 0, 0)
+            else:
+                lows = []
+                highs = []
+                n_negative = n_positive = 0
+                for chunk in iter_chunks(self.array, self.chunk_size):
+                    # Dask chunks are computed here
+                    chunk = np.asarray(chunk)
+                    finite = chunk[np.isfinite(chunk)]
+
+                    if finite.size:
+                        lows.append(finite.min())
+                        highs.append(finite.max())
+                    n_negative += np.count_nonzero(chunk == -np.inf)
+                    n_positive += np.count_nonzero(chunk == np.inf)
+
+                finite_range = (float(min(lows)), float(max(highs))) if lows else (None, None)
+                self._finite = finite_range + (n_negative, n_positive)
+
+        return self._finite
+
+    @property
+    def min(self):
+        """Get the minimum value, ``None`` for empty arrays."""
+        return self._compute_min_max()[0]
+
+    @property
+    def max(self):
+        """Get the maximum value, ``None`` for empty arrays."""
+        return self._compute_min_max()[1]
+
+    def histogram(self, bins=256):
+        """Compute the histogram of the finite values, between their min and max.
+
+        Returns the counts and the bin edges, like ``np.histogram``.
+        """
+        if bins not in self._histograms:
+            low, high, _, _ = self._compute_finite()
+            value_range = (low, high) if low is not None else (0., 1.)
+
+            edges = np.histogram_bin_edges([], bins=bins, range=value_range)
+            counts = histogram(self.array, edges, self.chunk_size)
+
+            self._histograms[bins] = (counts, edges)
+
+        return self._histograms[bins]
+
+    def percentile(self, q):
+        """Compute percentiles of the values, ignoring NaNs, like ``np.nanpercentile`` with linear interpolation.
+
+        The values of the ranks involved are found exactly, see ``_select``. Ranks landing on infinite values give
+        infinite percentiles.
+        """
+        counts, edges = self.histogram(PERCENTILE_BINS)
+        _, _, n_negative, n_positive = self._compute_finite()
+        n_finite = counts.sum()
+        n_values = n_negative + n_finite + n_positive
+
+        if n_values == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else np.nan
+
+        positions = np.asarray(q, dtype=np.float64) / 100. * (n_values - 1)
+        lower = np.floor(positions).astype(np.int64)
+        upper = np.minimum(lower + 1, n_values - 1)
+
+        ranks = np.unique(np.concatenate((lower.ravel(), upper.ravel())))
+        values = np.where(ranks < n_negative, -np.inf, np.inf)
+        finite = (ranks >= n_negative) & (ranks < n_negative + n_finite)
+        values[finite] = self._select(ranks[finite] - n_negative, counts, edges)
+
+        lower_values = values[np.searchsorted(ranks, lower)]
+        upper_values = values[np.searchsorted(ranks, upper)]
+        with np.errstate(invalid='ignore'):
+            result = np.where(
+                (positions == lower) | (lower_values == upper_values), lower_values, lower_values + (positions - lower) * (upper_values - lower_values)
+            )
+
+        return result if np.ndim(q) else float(result)
+
+    def _select(self, ranks, counts, edges):
+        """Find the values of the given ranks in the sorted non-NaN values, given a histogram of the values.
+
+        Each pass over the chunks either gathers the values of a bin holding ranks, if there are less than
+        ``chunk_size`` of them, or computes the histogram of that bin for the next pass.
+        """
+        result = np.empty(len(ranks))
+        pending = self._bins(ranks, np.arange(len(ranks)), 0, counts, edges)
+
+        while pending:
+            # Bins which only hold one value are solved without pass
+            kept = []
+            for lo, hi, closed, below, size, ids in pending:
+                if lo == hi or not closed and np.nextafter(lo, np.inf) >= hi:
+                    result[ids] = lo
+                else:
+                    kept.append((lo, hi, closed, below, size, ids))
+
+            if not kept:
+                break
+
+            gather = [size <= self.chunk_size for _, _, _, _, size, _ in kept]
+            sub_edges = [None if g else np.unique(np.linspace(lo, hi, PERCENTILE_BINS + 1)) for g, (lo, hi, _, _, _, _) in zip(gather, kept)]
+            gathered = [[] for _ in kept]
+            sub_counts = [None if g else np.zeros(len(e), dtype=np.int64) for g, e in zip(gather, sub_edges)]
+
+            for chunk in iter_chunks(self.array, self.chunk_size):
+                # Dask chunks are computed here
+                chunk = np.asarray(chunk)
+
+                for i, (lo, hi, closed, _, _, _) in enumerate(kept):
+                    values = chunk[(chunk >= lo) & ((chunk <= hi) if closed else (chunk < hi))]
+
+                    if gather[i]:
+                        gathered[i].append(values)
+                    else:
+                        # The last sub-bin holds the values equal to the upper edge
+                        sub_counts[i] += np.bincount(np.searchsorted(sub_edges[i], values, side='right') - 1, minlength=len(sub_edges[i]))
+
+            pending = []
+            for i, (lo, hi, closed, below, _, ids) in enumerate(kept):
+                if gather[i]:
+                    result[ids] = np.sort(np.concatenate(gathered[i]))[ranks[ids] - below]
+                else:
+                    pending.extend(self._bins(ranks, ids, below, sub_counts[i], np.append(sub_edges[i], hi)))
+
+        return result
+
+    @staticmethod
+    def _bins(ranks, ids, below, counts, edges):
+        """Group the ranks ``ranks[ids]`` by bin, given the number of values below the bins, the bin counts and the
+        ``len(counts) + 1`` edges. Bins are half-open like the ones of ``np.histogram``, except the last one.
+
+        Returns a ``(lower edge, upper edge, closed, number of values below, number of values, rank ids)`` tuple per bin.
+        """
+        cumulative = below + np.concatenate(([0], np.cumsum(counts)))
+        bins = np.searchsorted(cumulative, ranks[ids], side='right') - 1
+
+        return [
+            (edges[b], edges[b + 1], b == len(counts) - 1, cumulative[b], counts[b], ids[bins == b])
+            for b in np.unique(bins)
+        ]
@@ -0,0 +1,298 @@
+"""Vectorized streamline integration over tetrahedral meshes."""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .bvh import barycentric_coordinates, interpolate_cells
+
+
+class TetrahedronLocator:
+    """A uniform grid index over tetrahedrons, used for finding the tetrahedrons containing points.
+
+    Each tetrahedron is referenced by all the grid cells its bounding box overlaps.
+    """
+
+    def __init__(self, vertices, tetrahedron_indices, cell_size=None):
+        """Build the index. ``cell_size`` defaults to the mean size of the tetrahedrons."""
+        self.vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 3)
+        self.tetrahedrons = np.asarray(tetrahedron_indices).reshape(-1, 4)
+
+        corners = self.vertices[self.tetrahedrons]
+        mins = corners.min(axis=1)
+        maxs = corners.max(axis=1)
+        del corners
+
+        self.origin = self.vertices.min(axis=0)
+        extent = self.vertices.max(axis=0) - self.origin
+
+        self.cell_size = np.mean(maxs - mins) if cell_size is None else float(cell_size)
+        if self.cell_size <= 0:
+            self.cell_size = 1.
+        self.shape = (np.floor(extent / self.cell_size) + 1).astype(np.int64)
+
+        # Bounding boxes are considered half-open, so that a tetrahedron touching a cell boundary is not referenced twice
+        lo = self._cell_coordinates(mins)
+        hi = np.clip(np.ceil((maxs - self.origin) / self.cell_size).astype(np.int64) - 1, lo, self.shape - 1)
+        span = hi - lo + 1
+        counts = np.prod(span, axis=1)
+
+        # Enumerate all the (cell, tetrahedron) pairs
+        tetrahedron_ids = np.repeat(np.arange(len(self.tetrahedrons), dtype=np.int64), counts)
+        local = np.arange(len(tetrahedron_ids)) - np.repeat(np.cumsum(counts) - counts, counts)
+        span = span[tetrahedron_ids]
+        cell_coordinates = lo[tetrahedron_ids] + np.stack((
+            local % span[:, 0],
+            (local // span[:, 0]) % span[:, 1],
+            local // (span[:, 0] * span[:, 1])
+        ), axis=1)
+        cells = self._linear_index(cell_coordinates)
+
+        order = np.argsort(cells, kind='stable')
+        self.cell_tetrahedrons = tetrahedron_ids[order]
+        self.cell_start = np.searchsorted(cells[order], np.arange(np.prod(self.shape) + 1))
+
+    def _cell_coordinates(self, points):
+        return np.clip(np.floor((points - self.origin) / self.cell_size).astype(np.int64), 0, self.shape - 1)
+
+    def _linear_index(self, cell_coordinates):
+        return (cell_coordinates[:, 0] * self.shape[1] + cell_coordinates[:, 1]) * self.shape[2] + cell_coordinates[:, 2]
+
+    def interpolate(self, array, cells, weights):
+        """Interpolate per-vertex values at located points. ``array`` can have more than one dimension."""
+        return interpolate_cells(array, self.tetrahedrons, cells, weights)
+
+    def locate(self, points, hint=None, tolerance=1e-9):
+        """Find the tetrahedrons containing the points.
+
+        ``hint`` is an optional array of tetrahedron indices to test first, e.g. the tetrahedrons containing the points
+        at a previous step. Returns the tetrahedron index of each point (-1 if outside of the mesh) and the barycentric
+        coordinates.
+        """
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+
+        result = np.full(len(points), -1, dtype=np.int64)
+        weights = np.zeros((len(points), 4))
+
+        remaining = np.arange(len(points))
+        if hint is not None:
+            hint = np.asarray(hint)
+            known = np.flatnonzero(hint >= 0)
+
+            coordinates = barycentric_coordinates(points[known], self.vertices, self.tetrahedrons[hint[known]])
+            inside = np.all(coordinates >= -tolerance, axis=1)
+
+            result[known[inside]] = hint[known[inside]]
+            weights[known[inside]] = coordinates[inside]
+
+            remaining = np.flatnonzero(result < 0)
+
+        cells, coordinates = self._grid_locate(points[remaining], tolerance)
+        result[remaining] = cells
+        weights[remaining] = coordinates
+
+        return result, weights
+
+    def _grid_locate(self, points, tolerance):
+        n_points = len(points)
+
+        outside = np.any((points < self.origin) | (points > self.origin + self.shape * self.cell_size), axis=1)
+        outside |= np.any(np.isnan(points), axis=1)
+        cells = self._linear_index(self._cell_coordinates(np.nan_to_num(points)))
+
+        start = self.cell_start[cells]
+        counts = np.where(outside, 0, self.cell_start[cells + 1] - start)
+
+        # Test all the candidate tetrahedrons at once
+        queries = np.repeat(np.arange(n_points), counts)
+        candidates = self.cell_tetrahedrons[
+            np.repeat(start, counts) + np.arange(len(queries)) - np.repeat(np.cumsum(counts) - counts, counts)
+        ]
+        coordinates = barycentric_coordinates(points[queries], self.vertices, self.tetrahedrons[candidates])
+        inside = np.all(coordinates >= -tolerance, axis=1)
+
+        hits, first = np.unique(queries[inside], return_index=True)
+
+        result = np.full(n_points, -1, dtype=np.int64)
+        result[hits] = candidates[inside][first]
+
+        weights = np.zeros((n_points, 4))
+        weights[hits] = coordinates[inside][first]
+
+        return result, weights
+
+
+def _direction(locator, field, points, hint):
+    """Get the normalized field direction at the given points, NaN outside of the mesh or where the field vanishes."""
+    cells, weights = locator.locate(points, hint)
+    velocity = locator.interpolate(field, cells, weights)
+
+    norm = np.linalg.norm(velocity, axis=1, keepdims=True)
+    norm[norm == 0] = np.nan
+
+    return velocity / norm, cells
+
+
+def _integrate(locator, field, seeds, step, max_steps):
+    """Integrate all the seeds at once using RK4, with a fixed step length along the normalized field.
+
+    Only the seeds still inside of the mesh are advanced and stored at each step. Returns the points of all the steps
+    with, for each point, its seed index and its step index.
+    """
+    # Seeds outside of the mesh have no streamline
+    cells, _ = locator.locate(seeds)
+    active = np.flatnonzero(cells >= 0)
+    cells = cells[active]
+    p = seeds[active]
+
+    seed_ids = [active]
+    points = [p]
+
+    for i in range(max_steps):
+        if not active.size:
+            break
+
+        # The sub-steps are most likely in the same tetrahedron or close to it
+        k1, _ = _direction(locator, field, p, cells)
+        k2, _ = _direction(locator, field, p + step / 2. * k1, cells)
+        k3, _ = _direction(locator, field, p + step / 2. * k2, cells)
+        k4, _ = _direction(locator, field, p + step * k3, cells)
+
+        new = p + step / 6. * (k1 + 2. * k2 + 2. * k3 + k4)
+
+        # Stop the streamlines leaving the mesh
+        cells, _ = locator.locate(new, np.where(np.any(np.isnan(new), axis=1), -1, cells))
+        valid = cells >= 0
+
+        active = active[valid]
+        cells = cells[valid]
+        p = new[valid]
+
+        seed_ids.append(active)
+        points.append(p)
+
+    step_ids = np.repeat(np.arange(len(seed_ids)), [len(ids) for ids in seed_ids])
+
+    return np.concatenate(points), np.concatenate(seed_ids), step_ids
+
+
+_worker_state = {}
+
+
+def _init_worker(locator, field):
+    _worker_state['locator'] = locator
+    _worker_state['field'] = field
+
+
+def _integrate_worker(seeds, step, max_steps):
+    return _integrate(_worker_state['locator'], _worker_state['field'], seeds, step, max_steps)
+
+
+def integrate_streamlines(locator, field, seeds, step, max_steps=1000, direction='forward', processes=1):
+    """Integrate streamlines of a per-vertex vector field from many seeds simultaneously.
+
+    ``field`` is a ``(n_vertices, 3)`` array, ``direction`` is one of ``'forward'``, ``'backward'`` or ``'both'``. The
+    integration can be spread over ``processes`` processes, ``None`` meaning all the CPUs.
+
+    Returns the polylines as a ``(n_points, 3)`` array of points and the number of points of each polyline.
+    """
+    field = np.asarray(field, dtype=np.float64).reshape(-1, 3)
+    seeds = np.asarray(seeds, dtype=np.float64).reshape(-1, 3)
+
+    if direction not in ('forward', 'backward', 'both'):
+        raise ValueError('Invalid direction {}'.format(direction))
+
+    if processes is None:
+        processes = os.cpu_count()
+
+    steps = [step] if direction == 'forward' else [-step] if direction == 'backward' else [step, -step]
+
+    results = []
+    if processes > 1:
+        chunks = np.array_split(seeds, processes)
+        offsets = np.cumsum([0] + [len(chunk) for chunk in chunks])
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(locator, field)) as executor:
+            for h in steps:
+                chunk_results = list(executor.map(_integrate_worker, chunks, [h] * len(chunks), [max_steps] * len(chunks)))
+                results.append((
+                    np.concatenate([points for points, _, _ in chunk_results]),
+                    np.concatenate([seed_ids + offset for (_, seed_ids, _), offset in zip(chunk_results, offsets)]),
+                    np.concatenate([step_ids for _, _, step_ids in chunk_results])
+                ))
+    else:
+        results = [_integrate(locator, field, seeds, h, max_steps) for h in steps]
+
+    if direction == 'both':
+        # Join the backward and forward parts, which share the seed
+        (forward, forward_seeds, forward_steps), (backward, backward_seeds, backward_steps) = results
+        after_seed = backward_steps > 0
+        points = np.concatenate((forward, backward[after_seed]))
+        seed_ids = np.concatenate((forward_seeds, backward_seeds[after_seed]))
+        step_ids = np.concatenate((forward_steps, -backward_steps[after_seed]))
+    else:
+        points, seed_ids, step_ids = results[0]
+
+    # Gather the polylines, seed by seed
+    order = np.lexsort((step_ids, seed_ids))
+    lengths = np.bincount(seed_ids, minlength=len(seeds))
+
+    return points[order], lengths[lengths > 0]
+
+
+def tubes(points, lengths, radius, sides=6):
+    """Build triangulated tubes around polylines.
+
+    Polylines of less than 2 points are skipped. Returns the tube vertices, the triangle indices and, for each tube
+    vertex, the index of its polyline point.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    lengths = np.asarray(lengths)
+
+    # Polylines of a single point have no direction
+    point_ids = np.flatnonzero(np.repeat(lengths >= 2, lengths))
+    points = points[point_ids]
+    lengths = lengths[lengths >= 2]
+
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+
+    # Tangents using finite differences, clamped at the polyline ends
+    next_ids = np.arange(1, len(points) + 1)
+    next_ids[ends - 1] = ends - 1
+    previous_ids = np.arange(-1, len(points) - 1)
+    previous_ids[starts] = starts
+    tangents = points[next_ids] - points[previous_ids]
+
+    # Coincident points get an arbitrary frame
+    norms = np.linalg.norm(tangents, axis=1, keepdims=True)
+    tangents = np.where(norms > 0, tangents / np.where(norms > 0, norms, 1.), [[0., 0., 1.]])
+
+    # Build a frame around each tangent
+    axis = np.where(np.abs(tangents[:, :1]) < 0.9, [[1., 0., 0.]], [[0., 1., 0.]])
+    u = np.cross(tangents, axis)
+    u /= np.linalg.norm(u, axis=1, keepdims=True)
+    v = np.cross(tangents, u)
+
+    angles = np.linspace(0., 2. * np.pi, sides, endpoint=False)
+    vertices = points[:, np.newaxis] + radius * (
+        np.cos(angles)[:, np.newaxis] * u[:, np.newaxis] + np.sin(angles)[:, np.newaxis] * v[:, np.newaxis]
+    )
+
+    # Connect the rings of consecutive points of the same polyline
+    connected = np.ones(len(points), dtype=bool)
+    connected[ends - 1] = False
+    rings = np.flatnonzero(connected)[:, np.newaxis] * sides
+
+    side = np.arange(sides)
+    a = rings + side
+    b = rings + (side + 1) % sides
+    c = a + sides
+    d = b + sides
+
+    triangles = np.concatenate((
+        np.stack((a, b, d), axis=-1).reshape(-1, 3),
+        np.stack((a, d, c), axis=-1).reshape(-1, 3),
+    )).astype(np.uint32)
+
+    return vertices.reshape(-1, 3), triangles, np.repeat(point_ids, sides)
@@ -0,0 +1,168 @@
+"""Filters evaluated on the implicit cells of dense 3-D grids."""
+
+from functools import lru_cache
+
+import numpy as np
+
+from .filters import in_range, _isosurface_corners, _snap, _weld_surface
+
+# Split of a voxel into 6 tetrahedrons, voxel corners being numbered ``di + 2 * dj + 4 * dk``
+VOXEL_TETRAHEDRONS = np.array([[0, 1, 3, 7], [0, 1, 7, 5], [0, 2, 7, 3], [0, 2, 6, 7], [0, 4, 5, 7], [0, 4, 7, 6]])
+
+
+def grid_points(ids, shape, origin, spacing):
+    """Compute the positions of grid points given their flat indices."""
+    return np.stack(np.unravel_index(ids, shape), axis=1) * np.asarray(spacing) + np.asarray(origin)
+
+
+def sample(grid, ids):
+    """Get the values of a grid at the given flat point indices, without flattening the grid."""
+    return grid[np.unravel_index(ids, grid.shape)]
+
+
+def interpolate(grid, lo, hi, t):
+    """Interpolate the values of a grid on new points defined as ``lo + t * (hi - lo)``, given flat point indices."""
+    lo_values = sample(grid, lo)
+
+    return lo_values + t * (sample(grid, hi) - lo_values)
+
+
+def grid_tetrahedrons(shape):
+    """Compute the tetrahedron indices of a grid of points of the given shape, 6 tetrahedrons per voxel."""
+    nx, ny, nz = shape
+    i, j, k = [a.ravel() for a in np.meshgrid(np.arange(nx - 1), np.arange(ny - 1), np.arange(nz - 1), indexing='ij')]
+
+    corners = np.stack([
+        np.ravel_multi_index((i + di, j + dj, k + dk), shape)
+        for dk in (0, 1) for dj in (0, 1) for di in (0, 1)
+    ], axis=1)
+
+    return corners[:, VOXEL_TETRAHEDRONS].reshape(-1, 4)
+
+
+def iter_bricks(shape, brick_size):
+    """Iterate over the bricks of ``brick_size`` voxels of a grid, as point slices overlapping by one point."""
+    nx, ny, nz = shape
+    for i in range(0, nx - 1, brick_size):
+        for j in range(0, ny - 1, brick_size):
+            for k in range(0, nz - 1, brick_size):
+                yield (slice(i, i + brick_size + 1), slice(j, j + brick_size + 1), slice(k, k + brick_size + 1))
+
+
+@lru_cache(maxsize=16)
+def brick_topology(shape):
+    """Get the point coordinates and the tetrahedron indices of a brick of the given shape, with unit spacing.
+
+    The arrays are cached and read-only, as all the bricks of a grid but the last ones along each axis share the same shape.
+    """
+    points = np.stack(np.unravel_index(np.arange(np.prod(shape)), shape), axis=1).astype(np.float64)
+    tetrahedrons = grid_tetrahedrons(shape)
+
+    points.setflags(write=False)
+    tetrahedrons.setflags(write=False)
+
+    return points, tetrahedrons
+
+
+def _global_ids(ids, local_shape, offset, shape):
+    """Convert flat point indices of a brick into flat point indices of the grid."""
+    coordinates = np.unravel_index(ids, local_shape)
+
+    return np.ravel_multi_index(tuple(c + o for c, o in zip(coordinates, offset)), shape)
+
+
+def isosurface(grid, value, origin=(0., 0., 0.), spacing=(1., 1., 1.), brick_size=32):
+    """Compute the isosurface of a dense grid of point values, using marching tetrahedra brick by brick.
+
+    The cells are implicit: only the tetrahedrons of one brick exist at a time. Returns the same as
+    ``ipygany.filters.isosurface``, the ``(lo, hi, t)`` interpolation arrays holding flat grid point indices, which can
+    be used with ``sample``.
+    """
+    shape = grid.shape
+    a = [np.empty((0, 3), dtype=np.int64)]
+    b = [np.empty((0, 3), dtype=np.int64)]
+
+    for brick in iter_bricks(shape, brick_size):
+        values = grid[brick]
+        local_shape = values.shape
+
+        # Unit spacing does not change the orientation of the triangles
+        local_points, local_tetrahedrons = brick_topology(local_shape)
+        brick_a, brick_b = _snap(values.ravel(), value, *_isosurface_corners(local_points, local_tetrahedrons, values.ravel(), value))
+
+        offset = [s.start for s in brick]
+        a.append(_global_ids(brick_a, local_shape, offset, shape))
+        b.append(_global_ids(brick_b, local_shape, offset, shape))
+
+    lo, hi, triangles = _weld_surface(np.concatenate(a), np.concatenate(b), grid.size)
+
+    lo_values = sample(grid, lo)
+    t = np.divide(value - lo_values, sample(grid, hi) - lo_values, out=np.zeros(len(lo)), where=lo != hi)
+
+    lo_points = grid_points(lo, shape, origin, spacing)
+    points = lo_points + t[:, np.newaxis] * (grid_points(hi, shape, origin, spacing) - lo_points)
+
+    return points, triangles, (lo, hi, t)
+
+
+def voxel_boundary(kept):
+    """Compute the boundary of a set of voxels, as outward oriented triangles of flat grid point indices.
+
+    ``kept`` is the boolean mask of the ``(nx - 1, ny - 1, nz - 1)`` voxels of a ``(nx, ny, nz)`` grid of points.
+    """
+    shape = tuple(np.add(kept.shape, 1))
+    triangles = []
+
+    for axis in range(3):
+        padding = [(0, 0)] * 3
+        padding[axis] = (1, 1)
+        padded = np.pad(kept, padding)
+
+        n = kept.shape[axis] + 1
+        lower = np.take(padded, np.arange(n), axis=axis)
+        upper = np.take(padded, np.arange(1, n + 1), axis=axis)
+
+        # The two other axes, so that (axis, b, c) is direct
+        b = np.eye(3, dtype=np.int64)[(axis + 1) % 3]
+        c = np.eye(3, dtype=np.int64)[(axis + 2) % 3]
+
+        for faces, reverse in ((lower & ~upper, False), (~lower & upper, True)):
+            base = np.stack(np.nonzero(faces), axis=1)
+            quads = [base, base + b, base + b + c, base + c]
+            if reverse:
+                quads = quads[::-1]
+
+            p00, p10, p11, p01 = [np.ravel_multi_index(tuple(q.T), shape) for q in quads]
+            triangles.append(np.stack((p00, p10, p11), axis=1))
+            triangles.append(np.stack((p00, p11, p01), axis=1))
+
+    return np.concatenate(triangles)
+
+
+def threshold(grid, min, max, inclusive=True):
+    """Compute the boundary of the voxels for which the values at all the corners lie between min and max."""
+    mask = in_range(grid, min, max, inclusive)
+
+    kept = np.ones(tuple(np.subtract(grid.shape, 1)), dtype=bool)
+    for di in (0, 1):
+        for dj in (0, 1):
+            for dk in (0, 1):
+                kept &= mask[di:mask.shape[0] - 1 + di, dj:mask.shape[1] - 1 + dj, dk:mask.shape[2] - 1 + dk]
+
+    return voxel_boundary(kept)
+
+
+def texture(values, min, max, dtype):
+    """Normalize a brick of grid values between ``min`` and ``max`` into a 3-D texture of the given dtype.
+
+    Unsigned integer dtypes are quantized onto their whole range, and NaNs are mapped to 0. The texture is transposed so
+    that the x index varies the fastest, as expected by WebGL.
+    """
+    scale = 1. / (max - min) if max > min else 0.
+    normalized = np.nan_to_num(np.clip((np.asarray(values, dtype=np.float32) - min) * scale, 0., 1.))
+
+    dtype = np.dtype(dtype)
+    if dtype.kind == 'u':
+        normalized = np.rint(normalized * np.iinfo(dtype).max)
+
+    return np.ascontiguousarray(normalized.astype(dtype).T)
@@ -1,5 +1,7 @@
 import os.path as osp
 from array import array
+
+import numpy as np
 import vtk
 
 FLOAT32 = 'f'
@@ -132,6 +134,63 @@ def get_ugrid_data(grid):
     return out
 
 
+def get_ugrid_cells(grid):
+    """Get the cells of the grid as a flat connectivity array of point indices and the offsets of the cells in it."""
+    from vtk.util.numpy_support import vtk_to_numpy
+
+    if not grid.IsA('vtkUnstructuredGrid'):
+        grid = append_filter(grid)
+
+    cells = grid.GetCells()
+    if cells is None:
+        return np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64)
+
+    if hasattr(cells, 'GetOffsetsArray'):
+        return vtk_to_numpy(cells.GetConnectivityArray()), vtk_to_numpy(cells.GetOffsetsArray())
+
+    # VTK < 9 only has the legacy (n, id_1, ..., id_n) layout, the grid storing the position of each cell in it
+    legacy = vtk_to_numpy(cells.GetData())
+    locations = vtk_to_numpy(grid.GetCellLocationsArray()).astype(np.int64)
+
+    sizes = legacy[locations].astype(np.int64)
+    offsets = np.concatenate(([0], np.cumsum(sizes)))
+
+    ids = np.ones(len(legacy), dtype=bool)
+    ids[locations] = False
+
+    return legacy[ids], offsets
+
+
+def get_ugrid_cell_data(grid):
+    """Get the numeric cell data of the grid, as NumPy arrays with the same layout as ``get_ugrid_data``."""
+    from vtk.util.numpy_support import vtk_to_numpy
+
+    data = grid.GetCellData()
+    out = {}
+    if not data:
+        return out
+
+    for i_arr in range(data.GetNumberOfArrays()):
+        arr = data.GetArray(i_arr)
+
+        # Non-numeric arrays
+        if arr is None:
+            continue
+
+        values = vtk_to_numpy(arr).reshape(arr.GetNumberOfTuples(), -1)
+
+        components = {}
+        for i_comp in range(values.shape[1]):
+            component_name = arr.GetComponentName(i_comp)
+            component_name = 'X' + str(i_comp + 1) if component_name is None else component_name
+
+            components[component_name] = {'array': values[:, i_comp]}
+
+        out[arr.GetName()] = components
+
+    return out
+
+
 def load_vtk(filepath):
     file_extension = osp.splitext(filepath)[1]
     if file_extension == '.vtu':
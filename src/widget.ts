@@ -36,14 +36,125 @@ const colormaps: string[] = [
 ]
 
 
+/**
+ * Embedded states can hold buffers as external files or as compressed base64 strings, see ipygany.embed
+ */
+function is_embedded_buffer (data: any) : boolean {
+  return data.url !== undefined || data.compressed !== undefined || data.hash !== undefined;
+}
+
+/**
+ * Compressed buffers are stored once in the state, other occurrences only holding their hash. Models can be
+ * deserialized in any order, so each hash maps to a promise resolved by the model holding the data.
+ */
+const compressedBuffers = new Map<string, { promise: Promise<ArrayBuffer>, resolve: (buffer: Promise<ArrayBuffer>) => void }>();
+
+function compressed_buffer (hash: string) {
+  let entry = compressedBuffers.get(hash);
+
+  if (entry === undefined) {
+    let resolve: (buffer: Promise<ArrayBuffer>) => void = () => {};
+    const promise = new Promise<ArrayBuffer>((r) => { resolve = r; });
+
+    entry = { promise, resolve };
+    compressedBuffers.set(hash, entry);
+  }
+
+  return entry;
+}
+
+async function fetch_embedded_buffer (data: any) : Promise<ArrayBuffer> {
+  if (data.url !== undefined) {
+    const response = await fetch(data.url);
+
+    return response.arrayBuffer();
+  }
+
+  if (data.compressed === undefined) {
+    return compressed_buffer(data.hash).promise;
+  }
+
+  const bytes = Uint8Array.from(atob(data.compressed), (c: string) => c.charCodeAt(0));
+  const stream = new Blob([bytes]).stream().pipeThrough(new (window as any).DecompressionStream('deflate'));
+  const buffer = new Response(stream).arrayBuffer();
+
+  if (data.hash !== undefined) {
+    compressed_buffer(data.hash).resolve(buffer);
+  }
+
+  return buffer;
+}
+
 function deserialize_float32array (data: any, manager: any) {
+    if (is_embedded_buffer(data.data)) {
+      return fetch_embedded_buffer(data.data).then((buffer: ArrayBuffer) => new Float32Array(buffer));
+    }
+
     return new Float32Array(data.data.buffer);
 }
 
 function deserialize_uint32array (data: any, manager: any) {
+    if (is_embedded_buffer(data.data)) {
+      return fetch_embedded_buffer(data.data).then((buffer: ArrayBuffer) => new Uint32Array(buffer));
+    }
+
     return new Uint32Array(data.data.buffer);
 }
 
+function deserialize_int8array (data: any, manager: any) {
+    if (is_embedded_buffer(data.data)) {
+      return fetch_embedded_buffer(data.data).then((buffer: ArrayBuffer) => new Int8Array(buffer));
+    }
+
+    return new Int8Array(data.data.buffer);
+}
+
+/**
+ * Decode the oct-encoded normals computed in the kernel, see ipygany.filters.oct_encode
+ */
+function decode_oct_normals (encoded: Int8Array) : Float32Array {
+  const normals = new Float32Array(encoded.length / 2 * 3);
+
+  for (let i = 0; i < encoded.length / 2; i++) {
+    let x = encoded[2 * i] / 127.;
+    let y = encoded[2 * i + 1] / 127.;
+    const z = 1. - Math.abs(x) - Math.abs(y);
+
+    const t = Math.max(-z, 0.);
+    x -= x >= 0. ? t : -t;
+    y -= y >= 0. ? t : -t;
+
+    const norm = Math.sqrt(x * x + y * y + z * z);
+    normals[3 * i] = x / norm;
+    normals[3 * i + 1] = y / norm;
+    normals[3 * i + 2] = z / norm;
+  }
+
+  return normals;
+}
+
+/**
+ * Float32 views of the arrays held by NDArray widgets, so that all the blocks and components referencing the same
+ * NDArray widget share the same typed array instead of each holding a converted copy.
+ */
+const sharedArrays = new WeakMap<object, Float32Array>();
+
+function shared_float32array (array: any) : Float32Array {
+  const data = array.getNDArray().data;
+
+  if (data instanceof Float32Array) {
+    return data;
+  }
+
+  let shared = sharedArrays.get(data);
+  if (shared === undefined) {
+    shared = new Float32Array(data);
+    sharedArrays.set(data, shared);
+  }
+
+  return shared;
+}
+
 function deserialize_data_array (value: any, manager: any) {
   if (typeof value == 'string') {
     return unpack_models(value, manager);
@@ -102,7 +213,7 @@ class ComponentModel extends _GanyWidgetModel {
     const array = this.get('array');
 
     if (array.hasOwnProperty('name') && array.name == 'NDArrayModel') {
-      return new Float32Array(array.getNDArray().data);
+      return shared_float32array(array);
     } else {
       return array;
     }
@@ -177,16 +288,96 @@ abstract class BlockModel extends _GanyWidgetModel {
     super.initialize(attributes, options);
 
     this.block = this.createBlock();
-    this.block.defaultColor = this.defaultColor;
+    this.sceneBlocks = new Map<string, Block>();
+    this.sceneResources = new Map<string, any[]>();
+    this.initBlock(this.block);
 
     this.initEventListeners();
   }
 
+  /**
+   * Set up a block created by ``createBlock``.
+   */
+  initBlock (block: Block) {
+    block.defaultColor = this.defaultColor;
+  }
+
+  /**
+   * Get the block displayed by a scene. A three.js object has a single parent, so each scene gets its own block: the
+   * first scene uses ``block``, the others get new blocks whose meshes use the geometries and materials of ``block``,
+   * see ``shareResources``. The geometries and materials are reference-counted page-wide, see ``acquireResources``.
+   */
+  acquireBlock (sceneId: string) : Block {
+    let block = this.sceneBlocks.get(sceneId);
+
+    if (block === undefined) {
+      const used = Array.from(this.sceneBlocks.values()).indexOf(this.block) != -1;
+
+      block = used ? this.createBlock() : this.block;
+      if (used) {
+        this.initBlock(block);
+        this.shareResources(block);
+      }
+
+      this.sceneBlocks.set(sceneId, block);
+      this.sceneResources.set(sceneId, acquireResources(block));
+    }
+
+    return block;
+  }
+
+  /**
+   * Make the meshes of a block created for another scene use the geometries and materials of ``block``, which are then
+   * uploaded once per renderer and share their shader programs. The block still receives the model changes through
+   * ``forEachBlock``, but its own geometries and materials are never rendered.
+   */
+  shareResources (block: Block) {
+    const shared: any[] = (this.block as any).meshes || [];
+
+    ((block as any).meshes || []).forEach((mesh: any, i: number) => {
+      if (i < shared.length && shared[i].geometry && shared[i].material) {
+        mesh.geometry = shared[i].geometry;
+        mesh.material = shared[i].material;
+      }
+    });
+  }
+
+  /**
+   * Release the block of a scene, and the geometries and materials it acquired, which are disposed of once no scene uses
+   * them anymore. This is the only place where blocks are disposed of, scenes releasing their blocks when a block or the
+   * scene is closed, and releasing a scene which holds no block does nothing.
+   */
+  releaseBlock (sceneId: string) {
+    const block = this.sceneBlocks.get(sceneId);
+
+    if (block === undefined) {
+      return;
+    }
+
+    releaseResources(block, this.sceneResources.get(sceneId) || []);
+
+    this.sceneBlocks.delete(sceneId);
+    this.sceneResources.delete(sceneId);
+  }
+
+  /**
+   * Apply a change to ``block`` and to the blocks of the other scenes.
+   */
+  forEachBlock (update: (block: any) => void) {
+    update(this.block);
+
+    this.sceneBlocks.forEach((block: Block) => {
+      if (block !== this.block) {
+        update(block);
+      }
+    });
+  }
+
   get vertices () {
     const array = this.get('vertices');
 
     if (array.hasOwnProperty('name') && array.name == 'NDArrayModel') {
-      return new Float32Array(array.getNDArray().data);
+      return shared_float32array(array);
     } else {
       return array;
     }
@@ -205,10 +396,12 @@ abstract class BlockModel extends _GanyWidgetModel {
   }
 
   initEventListeners() : void {
-    this.on('change:default_color', () => { this.block.defaultColor = this.defaultColor; });
+    this.on('change:default_color', () => { this.forEachBlock((block: Block) => { block.defaultColor = this.defaultColor; }); });
   }
 
   block: Block;
+  sceneBlocks: Map<string, Block>;
+  sceneResources: Map<string, any[]>;
 
   abstract createBlock() : Block;
 
@@ -231,6 +424,7 @@ class PolyMeshModel extends BlockModel {
     return {...super.defaults(),
       _model_name: PolyMeshModel.model_name,
       triangle_indices: [],
+      normals: [],
     };
   }
 
@@ -238,15 +432,41 @@ class PolyMeshModel extends BlockModel {
     return new PolyMesh(this.vertices, this.triangleIndices, this.data, {environmentMeshes: this.environmentMeshes});
   }
 
+  initBlock (block: Block) {
+    super.initBlock(block);
+
+    this.setNormals(block);
+  }
+
   get triangleIndices () : Uint32Array {
     return this.get('triangle_indices');
   }
 
+  /**
+   * Set the normals computed in the kernel, if any, on the block geometry. They override the normals computed by the
+   * block, so they are set again whenever the geometry changes.
+   */
+  setNormals (block: Block) {
+    const encoded: Int8Array = this.get('normals');
+    const geometry = (block as any).geometry;
+
+    if (!encoded || encoded.length == 0 || !geometry || !geometry.setAttribute) {
+      return;
+    }
+
+    geometry.setAttribute('normal', new THREE.BufferAttribute(decode_oct_normals(encoded), 3));
+  }
+
   initEventListeners () : void {
     super.initEventListeners();
 
-    this.on('change:vertices', () => { this.block.vertices = this.vertices; });
-    this.on('change:triangle_indices', () => { this.block.triangleIndices = this.triangleIndices; });
+    this.on('change:vertices', () => {
+      this.forEachBlock((block: PolyMesh) => { block.vertices = this.vertices; this.setNormals(block); });
+    });
+    this.on('change:triangle_indices', () => {
+      this.forEachBlock((block: PolyMesh) => { block.triangleIndices = this.triangleIndices; this.setNormals(block); });
+    });
+    this.on('change:normals', () => { this.forEachBlock(this.setNormals.bind(this)); });
   }
 
   block: PolyMesh;
@@ -254,6 +474,7 @@ class PolyMeshModel extends BlockModel {
   static serializers: ISerializers = {
     ...BlockModel.serializers,
     triangle_indices: { deserialize: deserialize_uint32array },
+    normals: { deserialize: deserialize_int8array },
   }
 
   static model_name = 'PolyMeshModel';
@@ -310,7 +531,7 @@ class PointCloudModel extends BlockModel {
   initEventListeners () : void {
     super.initEventListeners();
 
-    this.on('change:vertices', () => { this.block.vertices = this.vertices; });
+    this.on('change:vertices', () => { this.forEachBlock((block: PointCloud) => { block.vertices = this.vertices; }); });
   }
 
   block: PointCloud;
@@ -320,6 +541,559 @@ class PointCloudModel extends BlockModel {
 }
 
 
+/**
+ * Deserialize the texture of a volume brick, given its dtype.
+ */
+function deserialize_brick_values (data: any, manager: any) {
+  const arrayTypes: Dict<any> = { uint8: Uint8Array, uint16: Uint16Array, float32: Float32Array };
+  const ArrayType = arrayTypes[data.dtype];
+
+  if (is_embedded_buffer(data.data)) {
+    return fetch_embedded_buffer(data.data).then((buffer: ArrayBuffer) => new ArrayType(buffer));
+  }
+
+  return new ArrayType(data.data.buffer);
+}
+
+
+export
+class VolumeBrickModel extends _GanyWidgetModel {
+
+  defaults() {
+    return {...super.defaults(),
+      _model_name: VolumeBrickModel.model_name,
+      offset: [0, 0, 0],
+      shape: [0, 0, 0],
+      values: null,
+    };
+  }
+
+  get offset () : number[] {
+    return this.get('offset');
+  }
+
+  get shape () : number[] {
+    return this.get('shape');
+  }
+
+  /**
+   * Create the 3-D texture of the brick. 8-bit values are uploaded as normalized bytes, 16-bit values are converted to
+   * floats as WebGL has no filterable 16-bit format.
+   */
+  createTexture () : THREE.DataTexture3D {
+    const values = this.get('values');
+    const [nx, ny, nz] = this.shape;
+
+    let data: Uint8Array | Float32Array = values;
+    let type: THREE.TextureDataType = THREE.UnsignedByteType;
+    if (!(values instanceof Uint8Array)) {
+      data = values instanceof Uint16Array ? Float32Array.from(values, (value: number) => value / 65535) : values;
+      type = THREE.FloatType;
+    }
+
+    const texture = new THREE.DataTexture3D(data, nx, ny, nz);
+    texture.format = THREE.RedFormat;
+    texture.type = type;
+    texture.minFilter = THREE.LinearFilter;
+    texture.magFilter = THREE.LinearFilter;
+    texture.unpackAlignment = 1;
+    texture.needsUpdate = true;
+
+    return texture;
+  }
+
+  static serializers: ISerializers = {
+    ..._GanyWidgetModel.serializers,
+    values: { deserialize: deserialize_brick_values },
+  }
+
+  static model_name = 'VolumeBrickModel';
+
+}
+
+
+const volumeVertexShader = `
+varying vec3 vPosition;
+varying vec3 vCamera;
+
+void main() {
+  vPosition = position;
+  vCamera = (inverse(modelMatrix) * vec4(cameraPosition, 1.)).xyz;
+
+  gl_Position = projectionMatrix * modelViewMatrix * vec4(position, 1.);
+}
+`;
+
+const volumeFragmentShader = `
+precision highp float;
+precision highp sampler3D;
+
+uniform sampler3D volume;
+uniform vec3 shape;
+uniform float density;
+uniform vec3 color;
+
+varying vec3 vPosition;
+varying vec3 vCamera;
+
+void main() {
+  vec3 direction = normalize(vPosition - vCamera);
+
+  // The fragments are on the back faces of the unit box, the ray enters the box at near
+  vec3 t0 = -vCamera / direction;
+  vec3 t1 = (vec3(1.) - vCamera) / direction;
+  vec3 tMin = min(t0, t1);
+  float near = max(max(max(tMin.x, tMin.y), tMin.z), 0.);
+  float far = length(vPosition - vCamera);
+
+  // One sample per voxel along the longest axis of the brick
+  float stepSize = 1. / max(max(shape.x, shape.y), shape.z);
+
+  vec4 accumulated = vec4(0.);
+  for (int i = 0; i < 1024; i++) {
+    float t = near + (float(i) + 0.5) * stepSize;
+    if (t > far || accumulated.a > 0.99) {
+      break;
+    }
+
+    // The texel centers are the grid points, the first and last ones lying on the box faces
+    vec3 position = vCamera + t * direction;
+    float value = texture(volume, (position * (shape - 1.) + 0.5) / shape).r;
+
+    float alpha = (1. - exp(-density * value)) * (1. - accumulated.a);
+    accumulated += vec4(alpha * color, alpha);
+  }
+
+  gl_FragColor = accumulated;
+}
+`;
+
+/**
+ * The materials raymarching the textures of the volume bricks, shared by the blocks of all the scenes.
+ */
+const brickMaterials = new WeakMap<VolumeBrickModel, THREE.ShaderMaterial>();
+
+/**
+ * The groups holding the brick meshes of the volume blocks.
+ */
+const volumeGroups = new WeakMap<Block, THREE.Group>();
+
+let unitBox: THREE.BoxBufferGeometry | null = null;
+
+/**
+ * Get the geometry of the brick meshes, a unit box with a corner at the origin, scaled and moved onto each brick.
+ */
+function unit_box () : THREE.BoxBufferGeometry {
+  if (unitBox === null) {
+    unitBox = new THREE.BoxBufferGeometry(1, 1, 1);
+    unitBox.translate(0.5, 0.5, 0.5);
+  }
+
+  return unitBox;
+}
+
+
+/**
+ * A dense 3-D grid. The block is the ganyjs PolyMesh of the grid boundary; when the kernel sends bricks of a component,
+ * a box mesh per brick is added to the block, raymarching the 3-D texture of the brick, and the boundary is hidden.
+ * The texture of a brick is only uploaded again when the values of this brick change.
+ */
+export
+class VolumeModel extends PolyMeshModel {
+
+  defaults() {
+    return {...super.defaults(),
+      _model_name: VolumeModel.model_name,
+      origin: [0, 0, 0],
+      spacing: [1, 1, 1],
+      density: 1.,
+      bricks: [],
+    };
+  }
+
+  initBlock (block: Block) {
+    super.initBlock(block);
+
+    const meshes: any[] = (block as any).meshes || [];
+    if (meshes.length == 0) {
+      return;
+    }
+
+    const group = new THREE.Group();
+    meshes[0].add(group);
+    volumeGroups.set(block, group);
+
+    this.setBricks(block);
+  }
+
+  get bricks () : VolumeBrickModel[] {
+    return this.get('bricks');
+  }
+
+  get density () : number {
+    return this.get('density');
+  }
+
+  brickMaterial (brick: VolumeBrickModel) : THREE.ShaderMaterial {
+    let material = brickMaterials.get(brick);
+
+    if (material === undefined) {
+      material = new THREE.ShaderMaterial({
+        uniforms: {
+          volume: { value: brick.createTexture() },
+          shape: { value: new THREE.Vector3().fromArray(brick.shape) },
+          density: { value: this.density },
+          color: { value: this.defaultColor },
+        },
+        vertexShader: volumeVertexShader,
+        fragmentShader: volumeFragmentShader,
+        side: THREE.BackSide,
+        transparent: true,
+        depthWrite: false,
+        premultipliedAlpha: true,
+      });
+      brickMaterials.set(brick, material);
+
+      this.listenTo(brick, 'change:values', () => { this.updateBrickTexture(brick); });
+      this.listenTo(brick, 'destroy', () => { this.disposeBrick(brick); });
+    }
+
+    return material;
+  }
+
+  /**
+   * Upload the texture of a single brick again.
+   */
+  updateBrickTexture (brick: VolumeBrickModel) {
+    const material = brickMaterials.get(brick);
+
+    if (material !== undefined) {
+      material.uniforms.volume.value.dispose();
+      material.uniforms.volume.value = brick.createTexture();
+    }
+  }
+
+  disposeBrick (brick: VolumeBrickModel) {
+    const material = brickMaterials.get(brick);
+
+    if (material !== undefined) {
+      material.uniforms.volume.value.dispose();
+      material.dispose();
+      brickMaterials.delete(brick);
+    }
+
+    this.stopListening(brick);
+  }
+
+  /**
+   * Place a box mesh per brick in a block, from the first grid point of the brick to its last one.
+   */
+  setBricks (block: Block) {
+    const group = volumeGroups.get(block);
+    if (group === undefined) {
+      return;
+    }
+
+    group.remove(...group.children);
+
+    const origin: number[] = this.get('origin');
+    const spacing: number[] = this.get('spacing');
+    for (const brick of this.bricks) {
+      const mesh = new THREE.Mesh(unit_box(), this.brickMaterial(brick));
+
+      mesh.position.fromArray([0, 1, 2].map((axis: number) => origin[axis] + brick.offset[axis] * spacing[axis]));
+      mesh.scale.fromArray([0, 1, 2].map((axis: number) => (brick.shape[axis] - 1) * spacing[axis]));
+
+      group.add(mesh);
+    }
+
+    // The boundary is hidden while the volume is rendered
+    for (const mesh of (block as any).meshes || []) {
+      if (mesh.material) {
+        mesh.material.visible = this.bricks.length == 0;
+      }
+    }
+  }
+
+  setUniform (name: string, value: any) {
+    for (const brick of this.bricks) {
+      this.brickMaterial(brick).uniforms[name].value = value;
+    }
+  }
+
+  initEventListeners () : void {
+    super.initEventListeners();
+
+    this.on('change:bricks', () => {
+      for (const brick of this.previous('bricks') || []) {
+        if (this.bricks.indexOf(brick) == -1) {
+          this.disposeBrick(brick);
+        }
+      }
+
+      this.forEachBlock(this.setBricks.bind(this));
+    });
+    this.on('change:origin change:spacing', () => { this.forEachBlock(this.setBricks.bind(this)); });
+    this.on('change:density', () => { this.setUniform('density', this.density); });
+    this.on('change:default_color', () => { this.setUniform('color', this.defaultColor); });
+  }
+
+  static serializers: ISerializers = {
+    ...PolyMeshModel.serializers,
+    bricks: { deserialize: (unpack_models as any) },
+  }
+
+  static model_name = 'VolumeModel';
+
+}
+
+
+/**
+ * Compute the per-instance transforms of glyphs: the template is scaled, rotated from the z axis onto the orientation,
+ * and translated to the position of each instance.
+ */
+function glyphMatrices (positions: Float32Array, orientations: Float32Array, scales: Float32Array) : Float32Array {
+  const nInstances = positions.length / 3;
+  const matrices = new Float32Array(16 * nInstances);
+
+  const zAxis = new THREE.Vector3(0, 0, 1);
+  const orientation = new THREE.Vector3();
+  const rotation = new THREE.Quaternion();
+  const position = new THREE.Vector3();
+  const scale = new THREE.Vector3();
+  const matrix = new THREE.Matrix4();
+
+  for (let i = 0; i < nInstances; i++) {
+    orientation.set(orientations[3 * i], orientations[3 * i + 1], orientations[3 * i + 2]);
+    rotation.setFromUnitVectors(zAxis, orientation);
+    position.set(positions[3 * i], positions[3 * i + 1], positions[3 * i + 2]);
+    scale.setScalar(scales[i]);
+
+    matrices.set(matrix.compose(position, rotation, scale).elements, 16 * i);
+  }
+
+  return matrices;
+}
+
+
+/**
+ * The template components of the glyph blocks, with the component models holding their per-instance values.
+ */
+const glyphComponents = new WeakMap<Block, Map<Component, ComponentModel>>();
+
+/**
+ * The ganyjs template meshes of the instanced meshes of the glyph blocks, holding their geometry and material.
+ */
+const glyphTemplateMeshes = new WeakMap<THREE.Object3D, any>();
+
+
+/**
+ * Glyphs drawn with GPU instancing. The block is a ganyjs PolyMesh of the glyph template, which holds the geometry, the
+ * material and the data of the template. Its meshes are replaced by THREE.InstancedMesh objects drawing the template
+ * once per glyph, their geometry holding the template attributes and the per-glyph data as InstancedBufferAttributes.
+ */
+export
+class GlyphsModel extends BlockModel {
+
+  defaults() {
+    return {...super.defaults(),
+      _model_name: GlyphsModel.model_name,
+      template_vertices: [],
+      template_triangle_indices: [],
+      orientations: [],
+      scales: [],
+    };
+  }
+
+  createBlock () {
+    const components = new Map<Component, ComponentModel>();
+    const block = new PolyMesh(
+      this.templateVertices, this.templateTriangleIndices, this.templateData(components),
+      {environmentMeshes: this.environmentMeshes}
+    );
+
+    glyphComponents.set(block, components);
+
+    return block;
+  }
+
+  /**
+   * Replace the meshes of a new block by instanced meshes, before it is added to a scene.
+   */
+  initBlock (block: Block) {
+    super.initBlock(block);
+
+    const meshes: any[] = (block as any).meshes || [];
+    meshes.forEach((mesh: any, i: number) => {
+      const instanced = new THREE.InstancedMesh(mesh.geometry, mesh.material, 0);
+
+      // The bounding sphere of the template does not contain the glyphs
+      instanced.frustumCulled = false;
+
+      glyphTemplateMeshes.set(instanced, mesh);
+      meshes[i] = instanced;
+    });
+
+    this.setInstances(block, this.instanceMatrix());
+  }
+
+  get templateVertices () : Float32Array {
+    return this.get('template_vertices');
+  }
+
+  get templateTriangleIndices () : Uint32Array {
+    return this.get('template_triangle_indices');
+  }
+
+  get nInstances () : number {
+    return this.vertices.length / 3;
+  }
+
+  get componentModels () : ComponentModel[] {
+    return ([] as ComponentModel[]).concat(...this.get('data').map((dataModel: DataModel) => dataModel.get('components')));
+  }
+
+  /**
+   * Create the data of the template, holding placeholder arrays of the template size. They are replaced by the
+   * per-instance values of their component model in the instanced geometries, see ``setInstances``.
+   */
+  templateData (components: Map<Component, ComponentModel>) : Data[] {
+    const nTemplateVertices = this.templateVertices.length / 3;
+
+    return this.get('data').map((dataModel: DataModel) => {
+      return new Data(dataModel.get('name'), dataModel.get('components').map((componentModel: ComponentModel) => {
+        const component = new Component(componentModel.get('name'), new Float32Array(nTemplateVertices));
+        components.set(component, componentModel);
+
+        return component;
+      }));
+    });
+  }
+
+  instanceMatrix () : THREE.InstancedBufferAttribute {
+    return new THREE.InstancedBufferAttribute(glyphMatrices(this.vertices, this.get('orientations'), this.get('scales')), 16);
+  }
+
+  /**
+   * Build the geometries of the instanced meshes of a block from its template meshes: template attributes are shared,
+   * and the placeholder data attributes are replaced by InstancedBufferAttributes holding the per-instance values. The
+   * current per-instance transforms are kept if ``instanceMatrix`` is not given.
+   */
+  setInstances (block: Block, instanceMatrix?: THREE.InstancedBufferAttribute) {
+    const instanceValues = new Map<any, Float32Array>();
+    (glyphComponents.get(block) || new Map<Component, ComponentModel>()).forEach((componentModel: ComponentModel, component: Component) => {
+      instanceValues.set(component.array, componentModel.array);
+    });
+
+    const found = new Set<any>();
+    for (const instanced of (block as any).meshes || []) {
+      const mesh = glyphTemplateMeshes.get(instanced);
+      if (mesh === undefined) {
+        continue;
+      }
+
+      const geometry = new THREE.BufferGeometry();
+      geometry.setIndex(mesh.geometry.index);
+
+      for (const name of Object.keys(mesh.geometry.attributes)) {
+        const attribute = mesh.geometry.attributes[name];
+        const values = instanceValues.get(attribute.array);
+
+        if (values !== undefined) {
+          found.add(attribute.array);
+          geometry.setAttribute(name, new THREE.InstancedBufferAttribute(values, attribute.itemSize));
+        } else {
+          geometry.setAttribute(name, attribute);
+        }
+      }
+
+      // Geometries shared with other scenes are disposed of by releaseResources
+      if (instanced.geometry !== mesh.geometry && !gpuResources.has(instanced.geometry)) {
+        instanced.geometry.dispose();
+      }
+      instanced.geometry = geometry;
+      instanced.material = mesh.material;
+
+      if (instanceMatrix !== undefined) {
+        instanced.instanceMatrix = instanceMatrix;
+      }
+      instanced.count = this.nInstances;
+    }
+
+    if (found.size < instanceValues.size) {
+      console.warn('ipygany: some glyph data could not be set per instance, the template attributes were not found');
+    }
+  }
+
+  updateInstances () {
+    const instanceMatrix = this.instanceMatrix();
+
+    this.forEachBlock((block: PolyMesh) => { this.setInstances(block, instanceMatrix); });
+  }
+
+  updateInstanceData () {
+    this.forEachBlock((block: PolyMesh) => { this.setInstances(block); });
+  }
+
+  /**
+   * Update the per-instance data when the arrays of the components change. New data can only be displayed by new
+   * glyphs, the template data being set when the blocks are created.
+   */
+  listenToComponents () {
+    for (const componentModel of this.listenedComponents || []) {
+      this.stopListening(componentModel, 'change:array');
+    }
+
+    this.listenedComponents = this.componentModels;
+    for (const componentModel of this.listenedComponents) {
+      this.listenTo(componentModel, 'change:array', this.updateInstanceData);
+    }
+  }
+
+  initEventListeners () : void {
+    super.initEventListeners();
+
+    this.on('change:template_vertices change:template_triangle_indices', () => {
+      const nTemplateVertices = this.templateVertices.length / 3;
+
+      this.forEachBlock((block: PolyMesh) => {
+        block.vertices = this.templateVertices;
+        block.triangleIndices = this.templateTriangleIndices;
+
+        // New placeholders of the template size
+        (glyphComponents.get(block) || new Map<Component, ComponentModel>()).forEach((componentModel: ComponentModel, component: Component) => {
+          component.array = new Float32Array(nTemplateVertices);
+        });
+      });
+      this.updateInstances();
+    });
+    this.on('change:vertices change:orientations change:scales', this.updateInstances.bind(this));
+    this.on('change:default_color', this.updateInstanceData.bind(this));
+
+    this.listenToComponents();
+    this.on('change:data', () => {
+      this.listenToComponents();
+      this.updateInstanceData();
+    });
+  }
+
+  block: PolyMesh;
+
+  listenedComponents: ComponentModel[];
+
+  static serializers: ISerializers = {
+    ...BlockModel.serializers,
+    template_vertices: { deserialize: deserialize_float32array },
+    template_triangle_indices: { deserialize: deserialize_uint32array },
+    orientations: { deserialize: deserialize_float32array },
+    scales: { deserialize: deserialize_float32array },
+  }
+
+  static model_name = 'GlyphsModel';
+
+}
+
+
 abstract class EffectModel extends BlockModel {
 
   defaults() {
@@ -345,9 +1119,11 @@ abstract class EffectModel extends BlockModel {
   }
 
   updateInput () {
-    if (this.block.inputDimension != 0) {
-      this.block.setInput(this.input);
-    }
+    this.forEachBlock((block: Effect) => {
+      if (block.inputDimension != 0) {
+        block.setInput(this.input);
+      }
+    });
   }
 
   block: Effect;
@@ -402,8 +1178,8 @@ class WarpModel extends EffectModel {
   initEventListeners () : void {
     super.initEventListeners();
 
-    this.on('change:factor', () => { this.block.factor = this.factor; });
-    this.on('change:offset', () => { this.block.offset = this.offset; });
+    this.on('change:factor', () => { this.forEachBlock((block: Warp) => { block.factor = this.factor; }); });
+    this.on('change:offset', () => { this.forEachBlock((block: Warp) => { block.offset = this.offset; }); });
   }
 
   block: Warp;
@@ -437,7 +1213,7 @@ class WarpByScalarModel extends EffectModel {
   initEventListeners () : void {
     super.initEventListeners();
 
-    this.on('change:factor', () => { this.block.factor = this.factor; });
+    this.on('change:factor', () => { this.forEachBlock((block: WarpByScalar) => { block.factor = this.factor; }); });
   }
 
   block: WarpByScalar;
@@ -557,19 +1333,19 @@ class IsoColorModel extends EffectModel {
     super.initEventListeners();
 
     this.on('change:min', () => {
-      this.block.min = this.min;
+      this.forEachBlock((block: any) => { block.min = this.min; });
       this.range = [this.min, this.range[1]];
     });
     this.on('change:max', () => {
-      this.block.max = this.max;
+      this.forEachBlock((block: any) => { block.max = this.max; });
       this.range = [this.range[0], this.max];
     });
     this.on('change:range', () => {
       this.min = this.range[0];
       this.max = this.range[1];
     });
-    this.on('change:colormap', () => { this.block.colorMap = this.colormap; });
-    this.on('change:type', () => { this.block.type = this.type; });
+    this.on('change:colormap', () => { this.forEachBlock((block: IsoColor) => { block.colorMap = this.colormap; }); });
+    this.on('change:type', () => { this.forEachBlock((block: IsoColor) => { block.type = this.type; }); });
   }
 
   block: IsoColor;
@@ -701,7 +1477,7 @@ class IsoSurfaceModel extends EffectModel {
   initEventListeners () : void {
     super.initEventListeners();
 
-    this.on('change:value', () => { this.block.value = this.value });
+    this.on('change:value', () => { this.forEachBlock((block: IsoSurface) => { block.value = this.value; }); });
   }
 
   block: IsoSurface;
@@ -774,18 +1550,18 @@ class ThresholdModel extends EffectModel {
     super.initEventListeners();
 
     this.on('change:min', () => {
-      this.block.min = this.min;
+      this.forEachBlock((block: any) => { block.min = this.min; });
       this.range = [this.min, this.range[1]];
     });
     this.on('change:max', () => {
-      this.block.max = this.max;
+      this.forEachBlock((block: any) => { block.max = this.max; });
       this.range = [this.range[0], this.max];
     });
     this.on('change:range', () => {
       this.min = this.range[0];
       this.max = this.range[1];
     });
-    this.on('change:inclusive', () => { this.block.inclusive = this.inclusive });
+    this.on('change:inclusive', () => { this.forEachBlock((block: Threshold) => { block.inclusive = this.inclusive; }); });
   }
 
   block: Threshold;
@@ -833,7 +1609,8 @@ class UnderWaterModel extends EffectModel {
     const image = this.get('texture');
 
     if (image === null) {
-      this.block.texture = null;
+      this.texture = null;
+      this.forEachBlock((block: UnderWater) => { block.texture = null; });
 
       return;
     }
@@ -842,11 +1619,20 @@ class UnderWaterModel extends EffectModel {
       const textureLoader = new THREE.TextureLoader();
 
       textureLoader.load(imageView.el.src, (texture: THREE.Texture) => {
-        this.block.texture = texture;
+        this.texture = texture;
+        this.forEachBlock((block: UnderWater) => { block.texture = texture; });
       });
     });
   }
 
+  initBlock (block: Block) {
+    super.initBlock(block);
+
+    if (this.texture) {
+      (block as UnderWater).texture = this.texture;
+    }
+  }
+
   createBlock () {
     return new UnderWater(this.parent.block, this.input, { defaultColor: this.defaultColor, textureScale: this.textureScale, texturePosition: this.texturePosition });
   }
@@ -858,14 +1644,15 @@ class UnderWaterModel extends EffectModel {
       this.setTexture();
     });
     this.on('change:texture_scale', () => {
-      this.block.textureScale = this.textureScale;
+      this.forEachBlock((block: UnderWater) => { block.textureScale = this.textureScale; });
     });
     this.on('change:texture_position', () => {
-      this.block.texturePosition = this.texturePosition;
+      this.forEachBlock((block: UnderWater) => { block.texturePosition = this.texturePosition; });
     });
   }
 
   block: UnderWater;
+  texture: THREE.Texture | null;
 
   static model_name = 'UnderWaterModel';
 
@@ -920,8 +1707,8 @@ class WaterModel extends EffectModel {
   initEventListeners () : void {
     super.initEventListeners();
 
-    this.on('change:caustics_enabled', () => { this.block.causticsEnabled = this.causticsEnabled });
-    this.on('change:caustics_factor', () => { this.block.causticsFactor = this.causticsFactor });
+    this.on('change:caustics_enabled', () => { this.forEachBlock((block: Water) => { block.causticsEnabled = this.causticsEnabled; }); });
+    this.on('change:caustics_factor', () => { this.forEachBlock((block: Water) => { block.causticsFactor = this.causticsFactor; }); });
   }
 
   block: Water;
@@ -936,6 +1723,89 @@ class WaterModel extends EffectModel {
 }
 
 
+/**
+ * Remove a block from a ganyjs scene, detaching its meshes from the three.js scene.
+ */
+function removeBlock (scene: Scene, block: Block) {
+  const ganyScene = scene as any;
+
+  if (typeof ganyScene.removeBlock === 'function') {
+    ganyScene.removeBlock(block);
+    return;
+  }
+
+  ganyScene.blocks = (ganyScene.blocks || []).filter((other: Block) => other !== block);
+  for (const mesh of (block as any).meshes || []) {
+    ganyScene.scene.remove(mesh);
+  }
+}
+
+/**
+ * Page-wide reference counts of the geometries and materials displayed by the scenes, keyed by three.js object. They
+ * are shared by the blocks of a model in several scenes, and by effect blocks built on the geometry of their parent.
+ */
+const gpuResources = new Map<any, number>();
+
+/**
+ * Get the geometries and materials of the meshes of a block.
+ */
+function blockResources (block: Block) : any[] {
+  const resources = new Set<any>();
+
+  for (const mesh of (block as any).meshes || []) {
+    if (mesh.geometry) {
+      resources.add(mesh.geometry);
+    }
+
+    const materials = Array.isArray(mesh.material) ? mesh.material : [mesh.material];
+    for (const material of materials) {
+      if (material) {
+        resources.add(material);
+      }
+    }
+  }
+
+  return Array.from(resources);
+}
+
+/**
+ * Count a new user of the geometries and materials of a block, returning them for ``releaseResources``.
+ */
+function acquireResources (block: Block) : any[] {
+  const resources = blockResources(block);
+
+  for (const resource of resources) {
+    gpuResources.set(resource, (gpuResources.get(resource) || 0) + 1);
+  }
+
+  return resources;
+}
+
+/**
+ * Release the geometries and materials acquired for a block, disposing of the ones which are not used anymore. The
+ * geometries and materials the block created since then (e.g. when its input changed) are only used by this block, and
+ * are disposed of too. three.js uploads them again if the block is rendered later on.
+ */
+function releaseResources (block: Block, acquired: any[]) {
+  for (const resource of acquired) {
+    const count = (gpuResources.get(resource) || 1) - 1;
+
+    if (count > 0) {
+      gpuResources.set(resource, count);
+    } else {
+      gpuResources.delete(resource);
+      resource.dispose();
+    }
+  }
+
+  for (const resource of blockResources(block)) {
+    if (acquired.indexOf(resource) == -1 && !gpuResources.has(resource)) {
+      resource.dispose();
+    }
+  }
+}
+
+
 export
 class SceneModel extends _GanyDOMWidgetModel {
 
@@ -947,6 +1817,7 @@ class SceneModel extends _GanyDOMWidgetModel {
       background_opacity: 1.,
       children: [],
       camera: null,
+      _click_handled: false,
     };
   }
 
@@ -954,10 +1825,18 @@ class SceneModel extends _GanyDOMWidgetModel {
     super.initialize(attributes, options);
 
     this.scene = new Scene();
+    this.blockModels = new Map<string, BlockModel>();
 
     this.updateChildren();
     this.on('change:children', this.updateChildren.bind(this));
     this.on('change:camera', this.updateCamera.bind(this));
+
+    // The blocks of a closed scene are released
+    this.once('destroy', () => {
+      for (const child of Array.from(this.blockModels.values())) {
+        this.removeChild(child);
+      }
+    });
   }
 
   get backgroundColor () : string {
@@ -977,15 +1856,23 @@ class SceneModel extends _GanyDOMWidgetModel {
   }
 
   updateCamera () {
-    const blocks: Block[] = this.get('children').map((child: BlockModel) => child.block);
+    const blocks: Block[] = this.get('children').map((child: BlockModel) => child.sceneBlocks.get(this.model_id) || child.block);
+
+    // Fit the bounding sphere of all the blocks
+    const box = new THREE.Box3();
+    for (const block of blocks) {
+      const sphere: THREE.Sphere = block.boundingSphere;
+
+      if (sphere && !sphere.isEmpty() && isFinite(sphere.radius)) {
+        box.union(sphere.getBoundingBox(new THREE.Box3()));
+      }
+    }
 
-    if (blocks.length == 0) {
+    if (box.isEmpty()) {
       return;
     }
 
-    // TODO Compute mean radius and mean center of all the blocks
-    const radius = blocks[0].boundingSphere.radius;
-    const center = blocks[0].boundingSphere.center;
+    const { radius, center } = box.getBoundingSphere(new THREE.Sphere());
 
     const modelCameraPosition = this.camera ? this.camera['position'] || null : null;
     const modelCameraRotation = this.camera ? this.camera['rotation'] || null : null;
@@ -1018,23 +1905,51 @@ class SceneModel extends _GanyDOMWidgetModel {
     this.trigger('update_camera');
   }
 
+  /**
+   * Diff the children by model id: blocks which are not children anymore are removed from the scene and released, new
+   * blocks are added, and the blocks which are kept are left untouched.
+   */
   private updateChildren () {
-    // TODO: Remove old children
-
-    const blocks: Block[] = this.get('children').map((child: BlockModel) => child.block);
+    const children: BlockModel[] = this.get('children');
+    const ids = new Set(children.map((child: BlockModel) => child.model_id));
 
-    if (blocks.length == 0) {
-      return;
+    for (const [id, child] of Array.from(this.blockModels)) {
+      if (!ids.has(id)) {
+        this.removeChild(child);
+      }
     }
 
-    for (const block of blocks) {
-      this.scene.addBlock(block);
+    for (const child of children) {
+      if (!this.blockModels.has(child.model_id)) {
+        this.blockModels.set(child.model_id, child);
+        this.scene.addBlock(child.acquireBlock(this.model_id));
+
+        // A child closed from the kernel is removed from the scene
+        this.listenTo(child, 'destroy', () => { this.removeChild(child); });
+      }
     }
 
     this.updateCamera();
   }
 
+  private removeChild (child: BlockModel) {
+    if (!this.blockModels.delete(child.model_id)) {
+      return;
+    }
+
+    this.stopListening(child);
+
+    const block = child.sceneBlocks.get(this.model_id);
+    if (block !== undefined) {
+      removeBlock(this.scene, block);
+      child.releaseBlock(this.model_id);
+
+      this.trigger('remove_block', block);
+    }
+  }
+
   scene: Scene;
+  blockModels: Map<string, BlockModel>;
 
   cameraPosition: THREE.Vector3;
   cameraRotation: THREE.Quaternion;
@@ -1074,14 +1989,19 @@ class SceneView extends DOMWidgetView {
   }
 
   initEventListeners () {
-    window.addEventListener('resize', this.resize.bind(this), false);
+    this.resizeListener = this.resize.bind(this);
+    window.addEventListener('resize', this.resizeListener, false);
 
-    this.model.on('change:background_color', () => { this.renderer.backgroundColor = this.model.backgroundColor; });
-    this.model.on('change:background_opacity', () => { this.renderer.backgroundOpacity = this.model.backgroundOpacity; });
+    // Listeners on the model are removed with the view, so that removed views can be garbage collected
+    this.listenTo(this.model, 'change:background_color', () => { this.renderer.backgroundColor = this.model.backgroundColor; });
+    this.listenTo(this.model, 'change:background_opacity', () => { this.renderer.backgroundOpacity = this.model.backgroundOpacity; });
 
-    this.model.on('update_camera', this.updateCamera.bind(this));
+    this.listenTo(this.model, 'update_camera', this.updateCamera);
 
     this.renderer.controls.addEventListener('change', this.handleCameraMove.bind(this));
+
+    this.el.addEventListener('pointerdown', this.handlePointerDown.bind(this));
+    this.el.addEventListener('pointerup', this.handlePointerUp.bind(this));
   }
 
   updateCamera () {
@@ -1110,6 +2030,38 @@ class SceneView extends DOMWidgetView {
     };
   }
 
+  handlePointerDown (event: PointerEvent) {
+    this.pointerDownPosition = new THREE.Vector2(event.clientX, event.clientY);
+  }
+
+  handlePointerUp (event: PointerEvent) {
+    // Nothing to send if the kernel has no click callback
+    if (!this.model.get('_click_handled')) {
+      return;
+    }
+
+    // Ignore the end of camera moves
+    if (this.pointerDownPosition.distanceTo(new THREE.Vector2(event.clientX, event.clientY)) > 3) {
+      return;
+    }
+
+    // Forward the clicked ray to the kernel, which performs the picking
+    const rect = this.el.getBoundingClientRect();
+    const pointer = new THREE.Vector2(
+      ((event.clientX - rect.left) / rect.width) * 2 - 1,
+      -((event.clientY - rect.top) / rect.height) * 2 + 1
+    );
+
+    const raycaster = new THREE.Raycaster();
+    raycaster.setFromCamera(pointer, this.renderer.camera);
+
+    this.send({
+      event: 'click',
+      origin: raycaster.ray.origin.toArray(),
+      direction: raycaster.ray.direction.toArray(),
+    });
+  }
+
   processPhosphorMessage (msg: Message) {
     super.processPhosphorMessage(msg);
 
@@ -1122,6 +2074,10 @@ class SceneView extends DOMWidgetView {
   }
 
   remove () {
+    if (this.resizeListener) {
+      window.removeEventListener('resize', this.resizeListener, false);
+    }
+
     this.renderer.dispose();
 
     return super.remove();
@@ -1133,6 +2089,10 @@ class SceneView extends DOMWidgetView {
 
   renderer: Renderer;
 
+  resizeListener: () => void;
+
+  pointerDownPosition: THREE.Vector2 = new THREE.Vector2();
+
   model: SceneModel;
 
 }
@@ -0,0 +1,110 @@
+import numpy as np
+
+from ipygany import PolyMesh, TetraMesh, IsoColor, Warp, Scene
+from ipygany.bvh import BVH
+
+from .utils import get_tetra_assets
+
+
+def test_intersect():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons)
+
+    bvh = BVH(vertices, mesh.triangle_indices.reshape(-1, 3), leaf_size=4)
+
+    origins = np.array([[-1., 1.5, 1.5], [2.5, 2.5, 10.], [-1., -1., -1.]])
+    directions = np.array([[1., 0., 0.], [0., 0., -2.], [-1., 0., 0.]])
+    triangles, distances, weights = bvh.intersect(origins, directions)
+
+    assert np.all(triangles[:2] >= 0)
+    assert triangles[2] == -1
+    assert np.allclose(distances[:2], [1., 3.])
+
+    # The hit points can be interpolated from the barycentric coordinates
+    hit = bvh.vertices[bvh.cells[triangles[:2]]]
+    assert np.allclose(np.einsum('ij,ijk->ik', weights[:2], hit), origins[:2] + distances[:2, np.newaxis] * directions[:2])
+
+
+def test_locate():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    bvh = BVH(vertices, tetrahedrons)
+
+    points = np.random.default_rng(0).uniform(0., 4., (100, 3))
+    cells, weights = bvh.locate(np.concatenate((points, [[5., 5., 5.]])))
+
+    assert np.all(cells[:-1] >= 0)
+    assert cells[-1] == -1
+    assert np.allclose(bvh.interpolate(vertices, cells, weights)[:-1], points)
+
+
+def test_pick_and_probe():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'x': {'value': vertices[:, 0]}})
+
+    triangles, points = mesh.pick([2.5, 2.5, 10.], [0., 0., -1.])
+    assert triangles[0] >= 0
+    assert np.allclose(points, [[2.5, 2.5, 4.]])
+
+    values = mesh.probe([[1.25, 2., 3.], [10., 0., 0.]])
+    assert np.isclose(values['x']['value'][0], 1.25)
+    assert np.isnan(values['x']['value'][1])
+
+    # The hierarchies are rebuilt when the geometry changes
+    bvh = mesh.triangle_bvh
+    assert mesh.triangle_bvh is bvh
+
+    mesh.vertices = vertices + 1.
+    assert mesh.triangle_bvh is not bvh
+    assert np.isclose(mesh.probe([1.25, 2., 3.])['x']['value'][0], 0.25)
+
+
+def test_scene_click():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'x': {'value': vertices[:, 0]}})
+    other = PolyMesh(vertices=vertices + (0., 0., 10.), triangle_indices=mesh.triangle_indices)
+
+    colored = IsoColor(mesh)
+    scene = Scene([colored, other])
+
+    # Without callback, clicks are not sent by the front-end and ignored by the kernel
+    assert not scene._click_handled
+    scene._handle_scene_msg(None, {'event': 'click', 'origin': [2.5, 2.5, 8.], 'direction': [0., 0., -1.]}, [])
+
+    clicks = []
+
+    def callback(block, triangle, point):
+        clicks.append((block, triangle, point))
+
+    scene.on_click(callback)
+    assert scene._click_handled
+
+    scene._handle_scene_msg(None, {'event': 'click', 'origin': [2.5, 2.5, 8.], 'direction': [0., 0., -1.]}, [])
+    scene._handle_scene_msg(None, {'event': 'click', 'origin': [2.5, 2.5, 20.], 'direction': [0., 0., -1.]}, [])
+    scene._handle_scene_msg(None, {'event': 'click', 'origin': [20., 20., 20.], 'direction': [0., 0., -1.]}, [])
+
+    assert len(clicks) == 2
+    assert clicks[0][0] is colored
+    assert np.allclose(clicks[0][2], [2.5, 2.5, 4.])
+    assert clicks[1][0] is other
+    assert np.allclose(clicks[1][2], [2.5, 2.5, 14.])
+
+    scene.on_click(callback, remove=True)
+    assert not scene._click_handled
+
+
+def test_scene_pick_warp():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'x': {'value': vertices[:, 0]}})
+
+    # Blocks are picked as displayed, through effects moving their vertices
+    warp = Warp(mesh, input=(0., 0., 10.))
+    scene = Scene([IsoColor(warp, input='x', min=0., max=4.)])
+
+    block, triangle, point = scene.pick([2.5, 2.5, 20.], [0., 0., -1.])
+    assert block is scene.children[0]
+    assert np.allclose(point, [2.5, 2.5, 14.])
+
+    assert np.allclose(scene.pick([2.5, 2.5, -5.], [0., 0., 1.])[2], [2.5, 2.5, 10.])
+
+    warp.factor = 2.
+    assert np.allclose(scene.pick([2.5, 2.5, 40.], [0., 0., -1.])[2], [2.5, 2.5, 24.])
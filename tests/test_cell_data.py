@@ -0,0 +1,110 @@
+import sys
+import types
+
+import numpy as np
+
+import pytest
+
+from ipygany import PolyMesh, TetraMesh
+from ipygany.filters import CellToPoint
+
+from .utils import get_tetra_assets
+
+
+def test_cell_to_point():
+    # Two cells of different sizes sharing the points 1 and 2, the point 4 is not used
+    mapping = CellToPoint([0, 1, 2, 1, 2, 3, 5], [0, 3, 7], 6)
+
+    assert np.allclose(mapping([2., 4.])[[0, 1, 2, 3, 5]], [2., 3., 3., 4., 4.])
+    assert np.isnan(mapping([2., 4.])[4])
+
+    with pytest.raises(ValueError):
+        mapping([1., 2., 3.])
+
+    # Mappings are matched on the cells themselves, not only on their counts
+    assert mapping.matches(np.array([0, 1, 2, 1, 2, 3, 5], dtype=np.int32), [0, 3, 7], 6)
+    assert not mapping.matches([0, 1, 2, 1, 2, 3, 4], [0, 3, 7], 6)
+    assert not mapping.matches([0, 1, 2, 1, 2, 3, 5], [0, 4, 7], 6)
+
+
+def test_set_cell_data():
+    vertices = np.array([[0., 0., 0.], [1., 0., 0.], [0., 1., 0.], [1., 1., 0.]])
+    triangles = np.array([[0, 1, 2], [1, 3, 2]])
+
+    mesh = PolyMesh(vertices=vertices, triangle_indices=triangles)
+    mesh.set_cell_data({'pressure': [1., 3.], 'velocity': [[1., 0., 0.], [3., 0., 0.]]})
+
+    assert np.allclose(mesh['pressure', 'X1'].array, [1., 2., 2., 3.])
+    assert [c.name for c in mesh['velocity'].components] == ['X1', 'X2', 'X3']
+
+    # The next time step updates the components in place, reusing the mapping
+    component = mesh['pressure', 'X1']
+    mapping = mesh.cell_to_point
+    mesh.set_cell_data({'pressure': [5., 7.]})
+
+    assert mesh.cell_to_point is mapping
+    assert mesh['pressure', 'X1'] is component
+    assert np.allclose(component.array, [5., 6., 6., 7.])
+
+    mesh.triangle_indices = triangles[::-1].ravel()
+    assert mesh.cell_to_point is not mapping
+
+    with pytest.raises(ValueError):
+        mesh.set_cell_data({'pressure': [1., 2., 3.]})
+
+
+class FakeGrid:
+    """A grid of a single quad cell, without point nor cell data."""
+
+    def GetNumberOfPoints(self):
+        return 4
+
+
+def test_vtk_cell_data(monkeypatch):
+    vertices = np.array([[0., 0., 0.], [1., 0., 0.], [1., 1., 0.], [0., 1., 0.]])
+    triangles = np.array([0, 1, 2, 0, 2, 3], dtype=np.uint32)
+
+    # The vtk loader is faked, vtk may not be installed
+    monkeypatch.setitem(sys.modules, 'ipygany.vtk_loader', types.SimpleNamespace(
+        load_vtk=lambda path: FakeGrid(),
+        get_ugrid_vertices=lambda grid: vertices,
+        get_ugrid_triangles=lambda grid: triangles,
+        get_ugrid_data=lambda grid: {},
+        get_ugrid_cell_data=lambda grid: {},
+        get_ugrid_cells=lambda grid: (np.arange(4), np.array([0, 4])),
+    ))
+
+    mesh = PolyMesh(vertices=vertices, triangle_indices=triangles)
+    mesh.reload('quad.vtu', reload_triangles=True)
+
+    # Cell data are given per grid cell, even if the grid has no cell data
+    assert mesh.cell_to_point.n_cells == 1
+    mesh.set_cell_data({'pressure': [2.]})
+    assert np.allclose(mesh['pressure', 'X1'].array, 2.)
+
+    with pytest.raises(ValueError):
+        mesh.set_cell_data({'pressure': [1., 2.]})
+
+
+def test_tetramesh_cell_data():
+    vertices, tetrahedrons = get_tetra_assets()
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons)
+
+    # The cells of a TetraMesh are its tetrahedrons
+    mesh.set_cell_data({'ones': np.ones(len(tetrahedrons))})
+
+    assert mesh.cell_to_point.n_cells == len(tetrahedrons)
+    assert np.allclose(mesh['ones', 'X1'].array, 1.)
+
+
+def test_flat_shaded():
+    vertices = np.array([[0., 0., 0.], [1., 0., 0.], [0., 1., 0.], [1., 1., 0.]])
+    triangles = np.array([[0, 1, 2], [1, 3, 2]])
+
+    mesh = PolyMesh(vertices=vertices, triangle_indices=triangles, data={'x': {'value': vertices[:, 0]}})
+    flat = mesh.flat_shaded({'pressure': [1., 3.]})
+
+    assert np.array_equal(np.asarray(flat.vertices).reshape(-1, 3), vertices[triangles.ravel()])
+    assert np.array_equal(flat.triangle_indices, np.arange(6))
+    assert np.array_equal(flat['x', 'value'].array, vertices[triangles.ravel(), 0])
+    assert np.array_equal(flat['pressure', 'X1'].array, [1., 1., 1., 3., 3., 3.])
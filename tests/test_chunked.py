@@ -0,0 +1,85 @@
+import numpy as np
+
+from ipygany import PolyMesh, PointCloud, Component
+from ipygany.chunked import is_chunked_array
+from ipygany.serialization import array_to_binary
+
+
+class ChunkedSource:
+    """A minimal out-of-core array source, recording the size of the biggest read."""
+
+    def __init__(self, array):
+        self._array = array
+        self.shape = array.shape
+        self.dtype = array.dtype
+        self.size = array.size
+        self.chunks = (1000,) + array.shape[1:]
+        self.max_read = 0
+
+    def __getitem__(self, key):
+        chunk = self._array[key]
+        self.max_read = max(self.max_read, chunk.size)
+        return chunk
+
+    def __array__(self, dtype=None, copy=None):
+        return self._array
+
+
+class ArrayLike:
+    """An in-memory array-like object, which is not a chunked source."""
+
+    def __init__(self, array):
+        self.shape = array.shape
+        self.dtype = array.dtype
+        self._array = array
+
+    def __getitem__(self, key):
+        return self._array[key]
+
+
+def test_is_chunked_array():
+    values = np.arange(10.)
+
+    assert is_chunked_array(ChunkedSource(values))
+    assert not is_chunked_array(values)
+    assert not is_chunked_array(ArrayLike(values))
+
+
+def test_chunked_component():
+    values = np.arange(300000, dtype=np.float64)
+    source = ChunkedSource(values)
+
+    component = Component('x', source)
+    assert component.array is source
+
+    assert component.min == 0.
+    assert component.max == 299999.
+
+    serialized = array_to_binary(component.array)
+    assert serialized['dtype'] == 'float32'
+    assert np.array_equal(np.frombuffer(serialized['data'], dtype=np.float32), values.astype(np.float32))
+
+    component.statistics.chunk_size = 1000
+    component.statistics._min_max = None
+    source.max_read = 0
+    assert component.max == 299999.
+    assert source.max_read == 1000
+
+
+def test_chunked_vertices():
+    vertices = np.random.rand(100, 3)
+    source = ChunkedSource(vertices)
+
+    cloud = PointCloud(vertices=source)
+    assert cloud.vertices is source
+
+    serialized = array_to_binary(cloud.vertices)
+    assert serialized['shape'] == (100, 3)
+
+
+def test_memmap_vertices(tmp_path):
+    vertices = np.memmap(tmp_path / 'vertices.bin', dtype=np.float32, mode='w+', shape=(8, 3))
+    vertices[:] = np.random.rand(8, 3)
+
+    mesh = PolyMesh(vertices=vertices, triangle_indices=[0, 1, 2])
+    assert np.shares_memory(mesh.vertices, vertices)
@@ -0,0 +1,120 @@
+import numpy as np
+import pytest
+
+from ipygany import PolyMesh, TetraMesh, Clip, Slice
+
+from .utils import get_tetra_assets
+
+
+def get_closed_edges_counts(triangles):
+    edges = np.sort(np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]]), axis=1)
+    _, counts = np.unique(edges, axis=0, return_counts=True)
+
+    return counts
+
+
+def test_clip_tetramesh():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'x': {'value': vertices[:, 0]}})
+
+    clipped = Clip(mesh, origin=(2.5, 2., 2.), normal=(1., 0., 0.))
+
+    points = clipped.vertices.reshape(-1, 3)
+    triangles = clipped.triangle_indices.reshape(-1, 3)
+
+    assert np.isclose(points[:, 0].max(), 2.5)
+    assert np.allclose(clipped['x', 'value'].array, points[:, 0])
+
+    # The clipped skin and the cut face are welded into a closed surface
+    assert np.all(get_closed_edges_counts(triangles) == 2)
+
+    # All triangles are facing outwards
+    normals = np.cross(points[triangles[:, 1]] - points[triangles[:, 0]], points[triangles[:, 2]] - points[triangles[:, 0]])
+    assert np.all(np.einsum('ij,ij->i', normals, points[triangles[:, 0]] - (1.25, 2., 2.)) > 0)
+
+
+def test_clip_update():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'x': {'value': vertices[:, 0]}})
+
+    clipped = Clip(mesh, origin=(2.5, 2., 2.), normal=(1., 0., 0.))
+    component = clipped['x', 'value']
+
+    clipped.origin = (1.2, 2., 2.)
+
+    points = clipped.vertices.reshape(-1, 3)
+    assert np.isclose(points[:, 0].max(), 1.2)
+    assert clipped['x', 'value'] is component
+    assert np.allclose(component.array, points[:, 0])
+
+
+def test_clip_polymesh():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons)
+    poly = PolyMesh(vertices=vertices, triangle_indices=mesh.triangle_indices)
+
+    clipped = Clip(poly, origin=(2.5, 2., 2.), normal=(-1., 0., 0.))
+
+    points = clipped.vertices.reshape(-1, 3)
+    triangles = clipped.triangle_indices.reshape(-1, 3)
+
+    assert np.isclose(points[:, 0].min(), 2.5)
+
+    # No cut face for surfaces: the boundary edges are left open
+    counts = get_closed_edges_counts(triangles)
+    assert np.any(counts == 1)
+    assert np.all(counts <= 2)
+
+
+def test_slice():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'x': {'value': vertices[:, 0]}})
+
+    sliced = Slice(mesh, origin=(2., 2., 2.3), normal=(0., 0., 2.))
+
+    points = sliced.vertices.reshape(-1, 3)
+    assert np.allclose(points[:, 2], 2.3)
+    assert np.allclose(sliced['x', 'value'].array, points[:, 0])
+
+    sliced.normal = (1., 0., 0.)
+    assert np.allclose(sliced.vertices.reshape(-1, 3)[:, 0], 2.)
+
+    poly = PolyMesh(vertices=vertices, triangle_indices=mesh.triangle_indices)
+    with pytest.raises(TypeError):
+        Slice(poly)
+
+
+def test_clip_through_vertices():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'x': {'value': vertices[:, 0]}})
+
+    for x in (2., 4.):
+        clipped = Clip(mesh, origin=(x, 2., 2.), normal=(1., 0., 0.))
+
+        points = clipped.vertices.reshape(-1, 3)
+        triangles = clipped.triangle_indices.reshape(-1, 3)
+
+        # Cut corners lying on a vertex are welded with it, without collapsed triangles
+        assert len(np.unique(points, axis=0)) == len(points)
+        assert np.all(np.linalg.norm(np.cross(points[triangles[:, 1]] - points[triangles[:, 0]], points[triangles[:, 2]] - points[triangles[:, 0]]), axis=1) > 0)
+        assert np.all(get_closed_edges_counts(triangles) == 2)
+
+
+def test_slice_through_vertices(monkeypatch):
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'x': {'value': vertices[:, 0]}})
+
+    calls = []
+    _filter = Slice._filter
+    monkeypatch.setattr(Slice, '_filter', lambda self, *args: calls.append(args) or _filter(self, *args))
+
+    sliced = Slice(mesh, origin=(2., 2., 2.), normal=(1., 0., 0.))
+    assert len(calls) == 1
+
+    points = sliced.vertices.reshape(-1, 3)
+    triangles = sliced.triangle_indices.reshape(-1, 3)
+
+    # The plane goes through the 5 x 5 grid vertices at x = 2
+    assert len(points) == 25 and len(np.unique(points, axis=0)) == 25
+    assert np.all(np.linalg.norm(np.cross(points[triangles[:, 1]] - points[triangles[:, 0]], points[triangles[:, 2]] - points[triangles[:, 0]]), axis=1) > 0)
+    assert np.isclose(np.abs(np.cross(points[triangles[:, 1]] - points[triangles[:, 0]], points[triangles[:, 2]] - points[triangles[:, 0]])).sum() / 2., 16.)
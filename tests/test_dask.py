@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from ipygany import PolyMesh, Component
+from ipygany.serialization import array_to_binary
+
+da = pytest.importorskip('dask.array')
+
+
+def test_dask_component():
+    values = np.random.rand(100000)
+    values[10] = np.nan
+    array = da.from_array(values, chunks=10000)
+
+    component = Component('x', array)
+    assert component.array is array
+
+    assert component.min == np.nanmin(values)
+    assert component.max == np.nanmax(values)
+    assert abs(component.percentile(50) - np.nanmedian(values)) < 1e-3
+
+    serialized = array_to_binary(component.array)
+    assert serialized['dtype'] == 'float32'
+    assert np.array_equal(np.frombuffer(serialized['data'], dtype=np.float32), values.astype(np.float32), equal_nan=True)
+
+
+def test_dask_vertices():
+    vertices = da.random.random((1000, 3), chunks=(100, 3))
+
+    mesh = PolyMesh(vertices=vertices, triangle_indices=np.arange(999, dtype=np.uint32))
+    assert mesh.vertices is vertices
+
+    serialized = array_to_binary(mesh.vertices)
+    assert serialized['shape'] == (1000, 3)
+    assert np.allclose(np.frombuffer(serialized['data'], dtype=np.float32).reshape(-1, 3), vertices.compute())
@@ -0,0 +1,54 @@
+import base64
+import json
+import os
+import zlib
+
+import numpy as np
+
+from ipygany import PolyMesh, PointCloud, Scene
+from ipygany.embed import embed_state, embed_minimal_html
+
+
+def get_scene():
+    vertices = np.random.rand(100, 3).astype(np.float32)
+
+    return vertices, Scene([
+        PolyMesh(vertices=vertices, triangle_indices=np.arange(99, dtype=np.uint32), data={'x': {'value': vertices[:, 0]}}),
+        PointCloud(vertices=vertices),
+    ])
+
+
+def test_external_buffers(tmp_path):
+    vertices, scene = get_scene()
+
+    state = embed_state(scene, directory=str(tmp_path / 'buffers'))
+
+    # The state is plain JSON, and the shared vertices are written once: vertices, triangles, the component, and the
+    # empty normals
+    json.dumps(state)
+    assert len(os.listdir(tmp_path / 'buffers')) == 4
+
+    mesh_state = next(model['state'] for model in state.values() if model['model_name'] == 'PolyMeshModel')
+    url = mesh_state['vertices']['data']['url']
+    assert url.startswith('buffers/')
+
+    with open(tmp_path / url, 'rb') as f:
+        assert np.array_equal(np.frombuffer(f.read(), dtype=np.float32), vertices.ravel())
+
+
+def test_compressed_buffers(tmp_path):
+    vertices, scene = get_scene()
+
+    state = embed_state(scene, compress=True)
+
+    # The vertices shared by the mesh and the point cloud are stored once, and referenced by hash
+    references = [model['state']['vertices']['data'] for model in state.values() if model['model_name'] in ('PolyMeshModel', 'PointCloudModel')]
+    stored = [reference for reference in references if 'compressed' in reference]
+
+    assert len(stored) == 1 and all(reference['hash'] == stored[0]['hash'] for reference in references)
+
+    data = zlib.decompress(base64.b64decode(stored[0]['compressed']))
+    assert np.array_equal(np.frombuffer(data, dtype=np.float32), vertices.ravel())
+
+    embed_minimal_html(str(tmp_path / 'scene.html'), scene, directory=str(tmp_path / 'buffers'))
+    assert os.path.exists(tmp_path / 'scene.html')
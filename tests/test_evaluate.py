@@ -0,0 +1,123 @@
+import numpy as np
+import pytest
+
+from ipygany import PolyMesh, PointCloud, Warp, WarpByScalar, Alpha, RGB, IsoColor, Threshold, Component
+
+
+def get_mesh():
+    vertices = np.array([[0., 0., 0.], [1., 0., 0.], [0., 1., 0.], [1., 1., 0.]], dtype=np.float32)
+    triangles = np.array([0, 1, 2, 1, 3, 2], dtype=np.uint32)
+
+    data = {
+        'height': [Component('value', np.array([0., 1., 2., 3.], dtype=np.float32))],
+        'displacement': [
+            Component('x', np.array([1., 1., 1., 1.], dtype=np.float32)),
+            Component('y', np.array([0., 0., 0., 0.], dtype=np.float32)),
+            Component('z', np.array([0., 1., 2., 3.], dtype=np.float32)),
+        ],
+    }
+
+    return PolyMesh(vertices=vertices, triangle_indices=triangles, data=data)
+
+
+def test_evaluate_mesh():
+    mesh = get_mesh()
+
+    evaluation = mesh.evaluate()
+
+    assert np.array_equal(evaluation.vertices, np.asarray(mesh.vertices).reshape(-1, 3))
+    assert evaluation.colors is None and evaluation.alpha is None
+    assert mesh.evaluate() is evaluation
+
+
+def test_warp():
+    mesh = get_mesh()
+    warp = Warp(mesh, input='displacement', factor=2., offset=(1., 0., 0.))
+
+    expected = np.asarray(mesh.vertices).reshape(-1, 3) + 2. * (np.stack((np.full(4, 2.), np.zeros(4), np.arange(4.)), axis=1))
+    assert np.allclose(warp.evaluate().vertices, expected)
+
+    # Warp by a constant and a single component
+    warp = Warp(mesh, input=(0, 0, ('height', 'value')), factor=(1., 1., -1.))
+    assert np.allclose(warp.evaluate().vertices[:, 2], -np.arange(4.))
+
+    # Tuples of strings hold numbers
+    warp = Warp(mesh, input='displacement', factor=('1', '1', '-1'), offset=('0', '0', '0.5'))
+    assert np.allclose(warp.evaluate().vertices[:, 2], -np.arange(4.) - 0.5)
+
+    warp.offset = ('0', '0', 'height')
+    with pytest.raises(ValueError, match='offset'):
+        warp.evaluate()
+
+
+def test_warp_by_scalar():
+    mesh = get_mesh()
+
+    warp = WarpByScalar(mesh, input='height', factor=0.5)
+
+    assert np.allclose(warp.evaluate().vertices[:, :2], np.asarray(mesh.vertices).reshape(-1, 3)[:, :2])
+    assert np.allclose(np.abs(warp.evaluate().vertices[:, 2]), 0.5 * np.arange(4.))
+
+    cloud = PointCloud(vertices=np.zeros((4, 3), dtype=np.float32), data=mesh.data)
+    with pytest.raises(NotImplementedError):
+        WarpByScalar(cloud, input='height').evaluate()
+
+
+def test_colors():
+    mesh = get_mesh()
+
+    alpha = Alpha(RGB(mesh, input='displacement'), input=0.5)
+    evaluation = alpha.evaluate()
+
+    assert np.array_equal(evaluation.alpha, np.full(4, 0.5))
+    assert np.array_equal(evaluation.colors[:, 2], np.arange(4.))
+
+    iso_color = IsoColor(mesh, input='height', min=0., max=3., colormap='Greys')
+    colors = iso_color.evaluate().colors
+
+    assert colors.shape == (4, 3)
+    assert np.allclose(colors[0], 1., atol=0.01) and np.allclose(colors[-1], 0., atol=0.01)
+
+
+def test_memoization():
+    mesh = get_mesh()
+    warp = Warp(mesh, input='displacement')
+    iso_color = IsoColor(warp, input='height', min=0., max=3.)
+
+    first = iso_color.evaluate()
+    assert iso_color.evaluate().colors is first.colors
+    assert iso_color.evaluate().vertices is first.vertices
+
+    # Only the warp is recomputed
+    warp.factor = 2.
+    second = iso_color.evaluate()
+    assert second.colors is first.colors
+    assert not np.array_equal(second.vertices, first.vertices)
+
+    # Only the colors are recomputed
+    iso_color.max = 6.
+    third = iso_color.evaluate()
+    assert third.vertices is second.vertices
+    assert not np.array_equal(third.colors, second.colors)
+
+    # New input arrays are detected
+    mesh['displacement', 'x'].array = np.zeros(4, dtype=np.float32)
+    assert not np.array_equal(iso_color.evaluate().vertices, third.vertices)
+    assert iso_color.evaluate().colors is third.colors
+
+    mesh.vertices = np.asarray(mesh.vertices) + 1.
+    assert np.allclose(iso_color.evaluate().vertices, np.asarray(mesh.vertices).reshape(-1, 3) + (0., 0., 2.) * np.arange(4.)[:, np.newaxis])
+
+
+def test_not_evaluable():
+    mesh = get_mesh()
+
+    assert mesh.can_evaluate and Alpha(Warp(mesh), input=0.5).can_evaluate
+
+    alpha = Alpha(Threshold(mesh, input='height', min=0., max=1.))
+    assert not alpha.can_evaluate
+    with pytest.raises(NotImplementedError):
+        alpha.evaluate()
+
+    cloud = PointCloud(vertices=np.zeros((4, 3), dtype=np.float32), data=mesh.data)
+    assert not WarpByScalar(cloud, input='height').can_evaluate
@@ -0,0 +1,146 @@
+import io
+import json
+import struct
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from ipygany import PolyMesh, TetraMesh, PointCloud, IsoColor, Warp, Scene
+
+from .utils import get_tetra_assets
+
+
+def read_glb(file):
+    data = file.getvalue()
+
+    magic, version, length = struct.unpack('<4sII', data[:12])
+    assert magic == b'glTF' and version == 2 and length == len(data)
+
+    json_length, json_type = struct.unpack('<I4s', data[12:20])
+    assert json_type == b'JSON'
+    gltf = json.loads(data[20:20 + json_length])
+
+    binary_length, binary_type = struct.unpack('<I4s', data[20 + json_length:28 + json_length])
+    assert binary_type == b'BIN\0'
+    binary = data[28 + json_length:]
+    assert binary_length == len(binary) and binary_length % 4 == 0
+
+    return gltf, binary
+
+
+def read_accessor(gltf, binary, index):
+    accessor = gltf['accessors'][index]
+    view = gltf['bufferViews'][accessor['bufferView']]
+    dtype = {5121: np.uint8, 5123: np.uint16, 5125: np.uint32, 5126: np.float32}[accessor['componentType']]
+    size = {'SCALAR': 1, 'VEC3': 3, 'VEC4': 4}[accessor['type']]
+
+    array = np.frombuffer(binary[view['byteOffset']:view['byteOffset'] + view['byteLength']], dtype=dtype)
+    stride = view.get('byteStride', size * np.dtype(dtype).itemsize) // np.dtype(dtype).itemsize
+
+    return array.reshape(accessor['count'], stride)[:, :size]
+
+
+def test_export_glb():
+    vertices, tetrahedrons = get_tetra_assets()
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'x': {'value': vertices[:, 0]}})
+    cloud = PointCloud(vertices=vertices)
+
+    file = io.BytesIO()
+    Scene([mesh, cloud]).export_glb(file)
+    gltf, binary = read_glb(file)
+
+    assert len(gltf['meshes']) == 2
+    primitive = gltf['meshes'][0]['primitives'][0]
+
+    assert np.allclose(read_accessor(gltf, binary, primitive['attributes']['POSITION']), vertices)
+    assert np.array_equal(read_accessor(gltf, binary, primitive['indices']).ravel(), mesh.triangle_indices)
+    assert np.allclose(read_accessor(gltf, binary, primitive['attributes']['_X_VALUE']).ravel(), vertices[:, 0])
+
+    # Both blocks share the same vertices buffer
+    assert gltf['meshes'][1]['primitives'][0]['mode'] == 0
+    assert gltf['accessors'][gltf['meshes'][1]['primitives'][0]['attributes']['POSITION']]['bufferView'] == \
+        gltf['accessors'][primitive['attributes']['POSITION']]['bufferView']
+
+
+def test_export_glb_quantized():
+    vertices = np.random.rand(100, 3)
+    mesh = PolyMesh(vertices=vertices, triangle_indices=np.arange(99, dtype=np.uint32), data={'x': {'value': vertices[:, 0]}})
+
+    file = io.BytesIO()
+    mesh.export_glb(file, quantize=True)
+    gltf, binary = read_glb(file)
+
+    assert gltf['extensionsRequired'] == ['KHR_mesh_quantization']
+
+    node = gltf['nodes'][0]
+    primitive = gltf['meshes'][0]['primitives'][0]
+    positions = read_accessor(gltf, binary, primitive['attributes']['POSITION']) * node['scale'] + node['translation']
+
+    assert np.allclose(positions, vertices, atol=1e-4)
+    assert gltf['accessors'][primitive['indices']]['componentType'] == 5123
+
+
+def test_export_glb_colors():
+    pytest.importorskip('matplotlib')
+
+    vertices = np.random.rand(30, 3)
+    mesh = PolyMesh(vertices=vertices, data={'x': {'value': vertices[:, 0]}})
+
+    file = io.BytesIO()
+    IsoColor(mesh, input='x', min=0., max=1., colormap='Viridis').export_glb(file)
+    gltf, binary = read_glb(file)
+
+    colors = read_accessor(gltf, binary, gltf['meshes'][0]['primitives'][0]['attributes']['COLOR_0'])
+    assert colors.shape == (30, 4)
+    assert np.all(colors[:, 3] == 255)
+
+    # Colormaps computed without matplotlib, and constant inputs
+    for iso_color in (IsoColor(mesh, input='x', colormap='Sinebow'), IsoColor(mesh, input=0.5, min=0., max=1., colormap='Rainbow')):
+        file = io.BytesIO()
+        iso_color.export_glb(file)
+        gltf, binary = read_glb(file)
+
+        colors = read_accessor(gltf, binary, gltf['meshes'][0]['primitives'][0]['attributes']['COLOR_0'])
+        assert colors.shape == (30, 4)
+
+    assert np.all(colors == colors[0])
+
+
+def test_export_glb_effects():
+    pytest.importorskip('matplotlib')
+
+    vertices = np.random.rand(30, 3)
+    mesh = PolyMesh(vertices=vertices, triangle_indices=np.arange(30, dtype=np.uint32), data={'x': {'value': vertices[:, 0]}})
+
+    # Effects are exported as displayed: warped, and colored after the warp
+    file = io.BytesIO()
+    IsoColor(Warp(mesh, input=(0., 0., 1.)), input='x', min=0., max=1.).export_glb(file)
+    gltf, binary = read_glb(file)
+
+    attributes = gltf['meshes'][0]['primitives'][0]['attributes']
+    assert np.allclose(read_accessor(gltf, binary, attributes['POSITION']), vertices + (0., 0., 1.))
+    assert read_accessor(gltf, binary, attributes['COLOR_0']).shape == (30, 4)
+
+
+def test_export_glb_memory(tmp_path):
+    vertices = np.random.rand(300000, 3).astype(np.float32)
+    mesh = PolyMesh(
+        vertices=vertices, triangle_indices=np.arange(900000, dtype=np.uint32) % 300000,
+        data={'x': {'value': vertices[:, 0].copy()}}
+    )
+    path = str(tmp_path / 'mesh.glb')
+
+    # The file is streamed: neither the file nor converted copies of the arrays are built in memory
+    tracemalloc.start()
+    try:
+        mesh.export_glb(path, chunk_size=2 ** 14)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    with open(path, 'rb') as f:
+        size = len(f.read())
+
+    assert size > vertices.nbytes * 2
+    assert peak < size / 10
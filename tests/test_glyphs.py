@@ -0,0 +1,55 @@
+import numpy as np
+
+from ipygany import PointCloud, PolyMesh, Glyphs
+from ipygany.glyphs import arrow, subsample, expand
+
+
+def test_arrow():
+    vertices, triangles = arrow(sides=6)
+
+    assert vertices.shape == (3 * 6 + 3, 3)
+    assert triangles.max() < len(vertices)
+    assert vertices[:, 2].min() == 0. and vertices[:, 2].max() == 1.
+
+
+def test_subsample():
+    assert np.array_equal(subsample(10, stride=3), [0, 3, 6, 9])
+    assert len(subsample(1000, max_glyphs=10)) == 10
+    assert len(np.unique(subsample(1000, max_glyphs=10, random=True, seed=0))) == 10
+
+
+def test_expand():
+    template = np.array([[0., 0., 0.], [0., 0., 1.], [0.1, 0., 0.]])
+    positions = np.array([[0., 0., 0.], [1., 1., 1.]])
+    orientations = np.array([[1., 0., 0.], [0., 0., -1.]])
+
+    vertices, triangles = expand(template, [0, 1, 2], positions, orientations, [2., 1.])
+
+    assert np.allclose(vertices[1], (2., 0., 0.))
+    assert np.allclose(vertices[4], (1., 1., 0.))
+    assert np.array_equal(triangles, [[0, 1, 2], [3, 4, 5]])
+
+
+def test_glyphs():
+    points = np.random.rand(100, 3)
+    vectors = np.random.rand(100, 3)
+    vectors[0] = 0.
+
+    cloud = PointCloud(vertices=points, data={'v': {'x': vectors[:, 0], 'y': vectors[:, 1], 'z': vectors[:, 2]}})
+
+    glyphs = Glyphs(cloud, 'v', factor=2., stride=2)
+
+    template_vertices, _ = arrow()
+    assert len(glyphs.vertices) == 50 * 3
+    assert glyphs.template_vertices.size == template_vertices.size
+    assert np.allclose(glyphs.scales, 2. * np.linalg.norm(vectors[::2], axis=1))
+    assert np.allclose(glyphs.orientations.reshape(-1, 3)[0], (0., 0., 1.))
+    assert np.array_equal(glyphs['v', 'x'].array, vectors[::2, 0])
+
+    glyphs.factor = 1.
+    assert np.allclose(glyphs.scales, np.linalg.norm(vectors[::2], axis=1))
+
+    extracted = glyphs.extract()
+    assert isinstance(extracted, PolyMesh)
+    assert extracted.vertices.size == 50 * template_vertices.size
+    assert extracted['v', 'x'].array.size == 50 * len(template_vertices)
@@ -1,8 +1,12 @@
+import gc
+import tracemalloc
+
 import numpy as np
 
 from ipydatawidgets import NDArrayWidget
 
-from ipygany import PolyMesh, Component
+from ipygany import PolyMesh, Component, Scene
+from ipygany.profiler import Profiler
 
 from .utils import get_test_assets
 
@@ -50,3 +54,45 @@ def test_component_creation():
     assert comp.name == 'z'
     assert comp.min == 1.
     assert comp.max == 3.
+
+
+def test_scene_children_swaps():
+    vertices, triangles, data_1d, data_3d = get_test_assets()
+
+    scene = Scene()
+
+    def swap():
+        removed = scene.children
+        scene.children = [PolyMesh(vertices=vertices, triangle_indices=triangles, data=[data_1d])]
+
+        # Closing the removed blocks disposes of them in the front-end
+        for block in removed:
+            block.close()
+
+    for _ in range(10):
+        swap()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for _ in range(1000):
+            swap()
+        gc.collect()
+        current = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    assert current < 2 ** 20
+
+    # Seen from the front-end: the scene only references its current child, and every removed block model is closed,
+    # which is what releases its block and GPU resources in the page
+    with Profiler(fake_comm=True):
+        scene = Scene()
+        comms = []
+        for _ in range(10):
+            swap()
+            comms.extend(block.comm for block in scene.children)
+
+    children_updates = [message['data']['state']['children'] for message in scene.comm.messages[1:] if 'children' in message['data']['state']]
+    assert [len(children) for children in children_updates] == [1] * 10
+    assert all(comm.closed for comm in comms[:-1]) and not comms[-1].closed
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from ipygany import PolyMesh, TetraMesh, IsoSurface
+
+from .utils import get_tetra_assets
+
+
+def test_extract():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    distance = np.linalg.norm(vertices - 2., axis=1)
+
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={
+        'distance': {'value': distance},
+        'position': {'x': vertices[:, 0], 'y': vertices[:, 1], 'z': vertices[:, 2]},
+    })
+
+    surface = IsoSurface(mesh, input='distance', value=1.5).extract()
+
+    assert isinstance(surface, PolyMesh)
+
+    points = surface.vertices.reshape(-1, 3)
+    triangles = surface.triangle_indices.reshape(-1, 3)
+
+    assert np.allclose(surface['distance', 'value'].array, 1.5)
+    assert np.allclose(surface['position', 'x'].array, points[:, 0])
+
+    # Vertices are welded: the surface is closed, every edge is shared by two triangles
+    edges = np.sort(np.concatenate([triangles[:, [0, 1]], triangles[:, [1, 2]], triangles[:, [2, 0]]]), axis=1)
+    _, counts = np.unique(edges, axis=0, return_counts=True)
+    assert np.all(counts == 2)
+
+    # Triangles are oriented towards increasing values
+    normals = np.cross(points[triangles[:, 1]] - points[triangles[:, 0]], points[triangles[:, 2]] - points[triangles[:, 0]])
+    assert np.all(np.einsum('ij,ij->i', normals, points[triangles[:, 0]] - 2.) > 0)
+
+
+def test_extract_multiple_values():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    distance = np.linalg.norm(vertices - 2., axis=1)
+
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'distance': {'value': distance}})
+    isosurface = IsoSurface(mesh, input='distance')
+
+    inner = isosurface.extract(1.)
+    outer = isosurface.extract(1.5)
+    both = isosurface.extract([1., 1.5])
+
+    assert both.triangle_indices.size == inner.triangle_indices.size + outer.triangle_indices.size
+    assert np.all(both.triangle_indices < both.vertices.size // 3)
+
+
+def test_extract_polymesh():
+    vertices, tetrahedrons = get_tetra_assets()
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'x': {'value': vertices[:, 0]}})
+    poly = PolyMesh(vertices=vertices, triangle_indices=mesh.triangle_indices, data={'x': {'value': vertices[:, 0]}})
+
+    with pytest.raises(TypeError):
+        IsoSurface(poly, input='x').extract()
@@ -0,0 +1,90 @@
+import numpy as np
+
+from ipygany import PolyMesh
+from ipygany.filters import VertexNormals, oct_encode, oct_decode
+from ipygany.profiler import Profiler
+
+
+def get_pyramid():
+    vertices = np.array([[0., 0., 0.], [1., 0., 0.], [0., 1., 0.], [0., 0., 1.], [5., 5., 5.]])
+    triangles = np.array([[0, 2, 1], [0, 1, 3], [0, 3, 2], [1, 2, 3]])
+
+    return vertices, triangles
+
+
+def test_vertex_normals():
+    vertices, triangles = get_pyramid()
+
+    normals = VertexNormals(triangles, len(vertices))(vertices)
+
+    # The apex of the corner is on the diagonal, and unused vertices get null normals
+    assert np.allclose(normals[0], -np.ones(3) / np.sqrt(3))
+    assert np.allclose(np.linalg.norm(normals[:4], axis=1), 1.)
+    assert np.allclose(normals[4], 0.)
+
+    # Reference implementation with np.add.at
+    a, b, c = vertices[triangles[:, 0]], vertices[triangles[:, 1]], vertices[triangles[:, 2]]
+    expected = np.zeros_like(vertices)
+    for i in range(3):
+        np.add.at(expected, triangles[:, i], np.cross(b - a, c - a))
+    expected[:4] /= np.linalg.norm(expected[:4], axis=1, keepdims=True)
+
+    assert np.allclose(normals, expected)
+
+
+def test_oct_encoding():
+    normals = np.random.default_rng(0).normal(size=(1000, 3))
+    normals /= np.linalg.norm(normals, axis=1, keepdims=True)
+
+    encoded = oct_encode(normals)
+    assert encoded.dtype == np.int8 and encoded.shape == (1000, 2)
+
+    decoded = oct_decode(encoded)
+    assert np.all(np.einsum('ij,ij->i', decoded, normals) > np.cos(np.radians(1.5)))
+
+
+def test_polymesh_normals():
+    vertices, triangles = get_pyramid()
+
+    mesh = PolyMesh(vertices=vertices, triangle_indices=triangles)
+    assert mesh.normals.size == 0
+
+    mesh = PolyMesh(vertices=vertices, triangle_indices=triangles, compute_normals=True)
+    assert mesh.normals.shape == (5, 2)
+    assert np.allclose(oct_decode(mesh.normals)[0], -np.ones(3) / np.sqrt(3), atol=0.02)
+
+    # Moving the vertices reuses the incidence structure
+    incidence = mesh._vertex_normals
+    mesh.vertices = np.stack((vertices[:, 1], -vertices[:, 0], vertices[:, 2]), axis=1).ravel()
+    assert mesh._vertex_normals is incidence
+    assert np.allclose(oct_decode(mesh.normals)[0], np.array([-1., 1., -1.]) / np.sqrt(3), atol=0.02)
+
+    mesh.triangle_indices = triangles[:, ::-1].ravel()
+    assert mesh._vertex_normals is not incidence
+
+    mesh.compute_normals = False
+    assert mesh.normals.size == 0
+
+
+def test_polymesh_normals_topology():
+    vertices, triangles = get_pyramid()
+
+    with Profiler(fake_comm=True):
+        mesh = PolyMesh(vertices=vertices, triangle_indices=triangles, compute_normals=True)
+    n_messages = len(mesh.comm.messages)
+
+    # A single triangle with fewer vertices: the normals wait for the triangles matching the new vertices
+    mesh.vertices = vertices[:3].ravel()
+    mesh.triangle_indices = np.array([0, 1, 2])
+    assert mesh.normals.shape == (3, 2)
+    assert np.allclose(oct_decode(mesh.normals), [0., 0., 1.], atol=0.02)
+
+    # And back to more vertices, the triangles being set first
+    mesh.triangle_indices = triangles.ravel()
+    mesh.vertices = vertices.ravel()
+    assert mesh.normals.shape == (5, 2)
+    assert np.allclose(oct_decode(mesh.normals)[0], -np.ones(3) / np.sqrt(3), atol=0.02)
+
+    # The normals are sent in the same messages as the vertices or the triangles they were computed from
+    updates = [set(message['data']['state']) for message in mesh.comm.messages[n_messages:]]
+    assert updates == [{'vertices'}, {'triangle_indices', 'normals'}, {'triangle_indices'}, {'vertices', 'normals'}]
@@ -0,0 +1,86 @@
+import numpy as np
+
+from ipygany import TetraMesh, MeshPartition, IsoColor
+from ipygany.partition import partition_triangles
+
+from .utils import get_tetra_assets
+
+
+def test_partition_triangles():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons)
+    triangles = mesh.triangle_indices.reshape(-1, 3)
+
+    chunks = partition_triangles(vertices, triangles, max_triangles=20)
+
+    assert sum(len(local) for _, local, _ in chunks) == len(triangles)
+    assert all(len(local) <= 20 for _, local, _ in chunks)
+
+    # Chunks cover all the triangles exactly once
+    rebuilt = np.concatenate([np.sort(vertex_ids[local], axis=1) for vertex_ids, local, _ in chunks])
+    assert np.array_equal(np.unique(rebuilt, axis=0), np.unique(np.sort(triangles, axis=1), axis=0))
+
+    for vertex_ids, local, (lo, hi) in chunks:
+        assert np.all(vertices[vertex_ids] >= lo) and np.all(vertices[vertex_ids] <= hi)
+
+
+def test_partition_updates():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    mesh = TetraMesh(
+        vertices=vertices, tetrahedron_indices=tetrahedrons,
+        data={'x': {'value': vertices[:, 0]}}
+    )
+
+    partition = mesh.partition(max_triangles=20)
+    assert isinstance(partition, MeshPartition)
+    assert len(partition.chunks) > 1
+
+    assert partition.chunks[0]['x', 'value'].min == 0.
+    assert partition.chunks[0]['x', 'value'].max == 4.
+
+    # Only change the values of a corner vertex
+    values = vertices[:, 0].copy()
+    values[0] = -1.
+    updated = partition.update_data(('x', 'value'), values)
+
+    assert 0 < len(updated) < len(partition.chunks)
+    for i, chunk in enumerate(partition.chunks):
+        assert np.array_equal(chunk['x', 'value'].array, values[partition.vertex_ids[i]])
+        assert chunk['x', 'value'].min == -1.
+
+    assert partition.update_data(('x', 'value'), values) == []
+
+    # Chunks holding NaNs are not updated again with the same values
+    values[0] = np.nan
+    assert partition.update_data(('x', 'value'), values) == updated
+    assert partition.update_data(('x', 'value'), values.copy()) == []
+
+    moved = vertices.copy()
+    moved[0] -= 0.5
+    assert partition.update_vertices(moved) == updated
+    assert partition.update_vertices(moved) == []
+
+    for i in updated:
+        assert np.array_equal(partition.bounding_boxes[i][0], moved[partition.vertex_ids[i]].min(axis=0))
+
+
+def test_partition_range():
+    vertices, tetrahedrons = get_tetra_assets(4, 4, 4)
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'x': {'value': vertices[:, 0]}})
+
+    partition = mesh.partition(max_triangles=20)
+    colored = [IsoColor(chunk, input=('x', 'value')) for chunk in partition.chunks]
+    for effect in colored:
+        effect.auto_range()
+
+    assert all(effect.range == (0., 4.) for effect in colored)
+
+    # The effects follow the bounds of the whole mesh
+    partition.update_data(('x', 'value'), vertices[:, 0] * 2.)
+    assert all(effect.range == (0., 8.) for effect in colored)
+
+    # Until their range is set explicitly
+    colored[0].max = 5.
+    partition.update_data(('x', 'value'), vertices[:, 0] * 3.)
+    assert colored[0].range == (0., 5.)
+    assert colored[1].range == (0., 12.)
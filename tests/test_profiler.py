@@ -0,0 +1,47 @@
+import numpy as np
+
+import pytest
+
+from ipygany import PolyMesh, IsoColor
+from ipygany.profiler import Profiler, FakeComm
+
+from .utils import get_test_assets
+
+
+def test_profiler():
+    vertices, triangles, data_1d, data_3d = get_test_assets()
+    vertices = np.asarray(vertices, dtype=np.float64)
+
+    events = []
+    with Profiler(fake_comm=True, hooks=[lambda *event: events.append(event)]) as profiler:
+        mesh = PolyMesh(vertices=vertices, triangle_indices=triangles, data=[data_1d])
+        IsoColor(mesh, input='1d', min=0., max=1.)
+
+        mesh.vertices = vertices * 2.
+
+    assert isinstance(mesh.comm, FakeComm)
+    assert [message['method'] for message in mesh.comm.messages] == ['open', 'update']
+
+    statistics = profiler.statistics['PolyMesh', 'vertices']
+    assert statistics.messages == 2
+    assert statistics.buffer_bytes == 2 * vertices.size * 4
+    assert statistics.encodes == 2
+    assert statistics.conversions == {'float64->float32': 2}
+
+    assert profiler.statistics['IsoColor', 'min'].messages == 1
+    assert ('PolyMesh', 'vertices', 'buffer_bytes', vertices.size * 4) in events
+
+    summary = profiler.summary()
+    assert summary.splitlines()[1].split()[:2] == ['PolyMesh', 'vertices']
+    assert 'float64->float32 x2' in summary
+
+    # Patches are removed when leaving the context
+    other = PolyMesh(vertices=vertices, triangle_indices=triangles)
+    assert not isinstance(other.comm, FakeComm)
+
+
+def test_nested_profilers():
+    with Profiler():
+        with pytest.raises(RuntimeError):
+            with Profiler():
+                pass
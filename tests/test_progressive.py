@@ -0,0 +1,100 @@
+import numpy as np
+
+import ipygany.ipygany
+from ipygany import ProgressivePolyMesh
+from ipygany.filters import cluster_vertices, cluster_mean
+
+
+def get_grid(n):
+    x, y = np.meshgrid(np.linspace(0., 1., n), np.linspace(0., 1., n), indexing='ij')
+    vertices = np.stack((x.ravel(), y.ravel(), np.zeros(n * n)), axis=1)
+
+    r = np.arange(n * n).reshape(n, n)
+    triangles = np.concatenate((
+        np.stack((r[:-1, :-1], r[1:, :-1], r[1:, 1:]), axis=-1).reshape(-1, 3),
+        np.stack((r[:-1, :-1], r[1:, 1:], r[:-1, 1:]), axis=-1).reshape(-1, 3),
+    ))
+
+    return vertices, triangles
+
+
+def test_cluster_vertices():
+    vertices, triangles = get_grid(33)
+
+    points, clustered, clusters = cluster_vertices(vertices, triangles, 0.25)
+
+    assert len(points) == 25
+    assert len(clustered) < len(triangles)
+    assert clustered.max() < len(points)
+
+    # No degenerate nor duplicated triangles
+    assert np.all(clustered[:, 0] != clustered[:, 1]) and np.all(clustered[:, 1] != clustered[:, 2])
+    assert len(np.unique(np.sort(clustered, axis=1), axis=0)) == len(clustered)
+
+    assert np.allclose(cluster_mean(vertices, clusters), points)
+
+
+def test_progressive():
+    vertices, triangles = get_grid(65)
+
+    mesh = ProgressivePolyMesh(vertices, triangles, data={'x': {'value': vertices[:, 0]}}, levels=2, resolution=4)
+
+    # The coarse level is available right away, with the range of the full data
+    assert mesh['x', 'value'].min == 0.
+    assert mesh['x', 'value'].max == 1.
+
+    component = mesh['x', 'value']
+
+    mesh.wait()
+    assert mesh['x', 'value'] is component
+    assert np.array_equal(mesh.vertices, vertices.ravel())
+    assert np.array_equal(mesh.triangle_indices, triangles.ravel())
+    assert np.array_equal(mesh['x', 'value'].array, vertices[:, 0])
+
+    coarse_vertices, coarse_triangles = get_grid(3)
+    mesh.replace(coarse_vertices, coarse_triangles, data={'x': {'value': coarse_vertices[:, 0]}})
+    mesh.wait()
+    assert np.array_equal(mesh.vertices, coarse_vertices.ravel())
+
+    mesh.close()
+
+
+class IOLoop:
+    """Record the callbacks scheduled on the kernel IO loop."""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def add_callback(self, callback, *args):
+        self.callbacks.append((callback, args))
+
+    def run(self):
+        for callback, args in self.callbacks:
+            callback(*args)
+        self.callbacks = []
+
+
+def test_progressive_io_loop(monkeypatch):
+    io_loop = IOLoop()
+    monkeypatch.setattr(ipygany.ipygany, '_kernel_io_loop', lambda: io_loop)
+
+    vertices, triangles = get_grid(65)
+    mesh = ProgressivePolyMesh(vertices, triangles, data={'x': {'value': vertices[:, 0]}}, levels=2, resolution=4)
+    coarse = mesh.vertices
+
+    # Levels are swapped by the IO loop only
+    mesh.wait()
+    assert len(io_loop.callbacks) == 2
+    assert mesh.vertices is coarse
+
+    io_loop.run()
+    assert np.array_equal(mesh.vertices, vertices.ravel())
+
+    # Nothing is swapped after closing the widget
+    mesh.replace(vertices, triangles)
+    replaced = mesh.vertices
+
+    mesh.wait()
+    mesh.close()
+    io_loop.run()
+    assert mesh.vertices is replaced
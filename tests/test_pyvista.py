@@ -0,0 +1,53 @@
+import numpy as np
+
+import pytest
+
+from ipygany import PolyMesh, TetraMesh, PointCloud
+
+pv = pytest.importorskip('pyvista')
+
+
+def test_polymesh_from_pyvista():
+    sphere = pv.Sphere()
+    sphere.point_data['normals'] = sphere.point_normals
+    sphere.point_data['height'] = sphere.points[:, 2]
+
+    mesh = PolyMesh.from_pyvista(sphere, default_color='red')
+
+    assert mesh.default_color == 'red'
+    assert np.array_equal(np.asarray(mesh.vertices).reshape(-1, 3), sphere.points)
+    assert np.array_equal(np.asarray(mesh.triangle_indices).reshape(-1, 3), sphere.faces.reshape(-1, 4)[:, 1:])
+
+    assert [c.name for c in mesh['normals'].components] == ['X1', 'X2', 'X3']
+    assert np.array_equal(mesh['normals', 'X2'].array, sphere.point_normals[:, 1])
+    assert np.array_equal(mesh['height', 'X1'].array, sphere.points[:, 2])
+
+
+def test_tetramesh_from_pyvista():
+    grid = pv.ImageData(dimensions=(3, 4, 5)) if hasattr(pv, 'ImageData') else pv.UniformGrid(dims=(3, 4, 5))
+    grid.point_data['x'] = grid.points[:, 0]
+
+    mesh = TetraMesh.from_pyvista(grid)
+
+    # Each voxel is split into tetrahedrons covering its volume
+    tetrahedrons = np.asarray(mesh.tetrahedron_indices).reshape(-1, 4)
+    points = np.asarray(mesh.vertices).reshape(-1, 3)
+    corners = points[tetrahedrons]
+    volumes = np.abs(np.einsum('ij,ij->i', np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0]), corners[:, 3] - corners[:, 0])) / 6.
+    assert np.isclose(volumes.sum(), 2 * 3 * 4)
+
+    assert np.array_equal(mesh['x', 'X1'].array, points[:, 0])
+
+    # All-tetrahedron grids are used as is
+    again = TetraMesh.from_pyvista(pv.UnstructuredGrid({10: tetrahedrons}, points))
+    assert np.array_equal(np.asarray(again.tetrahedron_indices), np.asarray(mesh.tetrahedron_indices))
+
+
+def test_pointcloud_from_pyvista():
+    cloud = pv.PolyData(np.random.rand(100, 3))
+    cloud.point_data['value'] = np.arange(100)
+
+    points = PointCloud.from_pyvista(cloud)
+
+    assert np.array_equal(np.asarray(points.vertices).reshape(-1, 3), cloud.points)
+    assert np.array_equal(points['value', 'X1'].array, np.arange(100))
@@ -0,0 +1,127 @@
+import io
+import struct
+import zlib
+
+import numpy as np
+
+from ipygany import PolyMesh, PointCloud, IsoColor, Warp, Scene
+from ipygany.raster import render, render_png, render_pngs, write_png, parse_color
+
+
+def quad(z, color):
+    vertices = np.array([[-1, -1, z], [1, -1, z], [1, 1, z], [-1, 1, z]], dtype=np.float32)
+    return PolyMesh(vertices=vertices, triangle_indices=np.array([0, 1, 2, 0, 2, 3]), default_color=color)
+
+
+def read_png(data):
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+
+    chunks = {}
+    position = 8
+    while position < len(data):
+        length, kind = struct.unpack('>I4s', data[position:position + 8])
+        content = data[position + 8:position + 8 + length]
+        crc, = struct.unpack('>I', data[position + 8 + length:position + 12 + length])
+        assert crc == zlib.crc32(kind + content) & 0xffffffff
+        chunks[kind] = content
+        position += length + 12
+
+    width, height = struct.unpack('>II', chunks[b'IHDR'][:8])
+    rows = np.frombuffer(zlib.decompress(chunks[b'IDAT']), dtype=np.uint8).reshape(height, -1)
+    assert np.all(rows[:, 0] == 0)
+
+    return rows[:, 1:].reshape(height, width, 3)
+
+
+def test_parse_color():
+    assert parse_color('#ff0000') == (1., 0., 0.)
+    assert parse_color('#0f0') == (0., 1., 0.)
+    assert parse_color(None) == (1., 1., 1.)
+
+
+def test_render():
+    scene = Scene([quad(0., '#ff0000')], background_color='#000000')
+
+    image = render(scene, width=80, height=60)
+
+    assert image.shape == (60, 80, 3) and image.dtype == np.uint8
+
+    # The quad faces the camera, at the center of the image
+    center = image[30, 40]
+    assert center[0] > 200 and center[1] == 0 and center[2] == 0
+    assert np.all(image[0, 0] == 0)
+
+
+def test_render_depth():
+    # The nearest quad hides the other one, whatever their order
+    front, back = quad(0.5, '#00ff00'), quad(0., '#ff0000')
+
+    for blocks in ([front, back], [back, front]):
+        image = render(Scene(blocks), width=40, height=40, tile_size=16)
+        assert image[20, 20, 1] > 200 and image[20, 20, 0] == 0
+
+
+def test_render_camera():
+    scene = Scene([quad(0., '#ff0000')], camera={'position': [0, 0, -3], 'target': [0, 0, 0], 'up': [0, 1, 0]})
+
+    # The quad is seen from behind, both faces being lit
+    assert render(scene, width=40, height=40)[20, 20, 0] > 200
+
+    scene.camera = {'position': [10, 0, 0], 'target': [20, 0, 0], 'up': [0, 1, 0]}
+    assert np.all(render(scene, width=40, height=40) == 255)
+
+
+def test_render_isocolor():
+    mesh = quad(0., '#ff0000')
+    mesh.data = {'x': {'value': np.asarray(mesh.vertices).reshape(-1, 3)[:, 0]}}
+
+    image = render(Scene([IsoColor(mesh, input='x', min=-1, max=1, colormap='Greys')]), width=40, height=40)
+
+    # The colormap goes from white to black along the x axis
+    row = image[20, 10:30].astype(int).sum(axis=1)
+    assert np.all(np.diff(row) <= 0) and row[0] > row[-1]
+
+
+def test_render_warp():
+    mesh = quad(0., '#ff0000')
+
+    # The quad is moved out of the view
+    scene = Scene([Warp(mesh, input=(100., 0., 0.))], camera={'position': [0, 0, 3], 'target': [0, 0, 0], 'up': [0, 1, 0]})
+    assert np.all(render(scene, width=40, height=40) == 255)
+
+    scene.children = [Warp(mesh, input=(0., 0., 0.))]
+    assert render(scene, width=40, height=40)[20, 20, 0] > 200
+
+
+def test_render_points():
+    cloud = PointCloud(vertices=np.array([[-1, -1, 0], [1, 1, 0], [0, 0, 0]], dtype=np.float32), default_color='#0000ff')
+
+    image = render(Scene([cloud]), width=40, height=40, point_size=3)
+
+    assert np.sum(np.all(image == (0, 0, 255), axis=2)) >= 9
+
+
+def test_write_png():
+    image = np.random.randint(0, 256, (7, 5, 3), dtype=np.uint8)
+
+    file = io.BytesIO()
+    write_png(file, image)
+
+    assert np.array_equal(read_png(file.getvalue()), image)
+
+
+def test_render_pngs(tmp_path):
+    scenes = [Scene([quad(0., color)]) for color in ('#ff0000', '#00ff00')]
+    paths = [str(tmp_path / 'red.png'), str(tmp_path / 'green.png')]
+
+    render_pngs(scenes, paths, width=20, height=20, processes=2)
+
+    for scene, path in zip(scenes, paths):
+        with open(path, 'rb') as f:
+            assert np.array_equal(read_png(f.read()), render(scene, width=20, height=20))
+
+    scenes[0].render_png(paths[0], width=20, height=10)
+    with open(paths[0], 'rb') as f:
+        assert read_png(f.read()).shape == (10, 20, 3)
+
+    render_png(scenes[0], paths[0], width=10, height=10)
@@ -0,0 +1,97 @@
+import numpy as np
+
+from ipygany import PolyMesh, Component, IsoColor, Threshold
+from ipygany.statistics import Statistics
+from ipygany.chunked import iter_chunks
+
+
+def test_statistics():
+    values = np.arange(1000, dtype=np.float32).reshape(100, 10)
+    values[5, 5] = np.nan
+
+    statistics = Statistics(values, chunk_size=64)
+
+    assert len(list(iter_chunks(values, chunk_size=64))) == 17
+    assert statistics.min == 0.
+    assert statistics.max == 999.
+
+    counts, edges = statistics.histogram(10)
+    assert counts.sum() == 999
+    assert edges[0] == 0. and edges[-1] == 999.
+
+    low, high = statistics.percentile((1, 99))
+    assert abs(low - 10.) < 1.
+    assert abs(high - 989.) < 1.
+
+
+def test_percentile_outlier():
+    values = np.append(np.random.RandomState(0).uniform(0., 1., 10000), 1e6)
+
+    # Exact even when an outlier squeezes the values into a single bin of the histogram
+    statistics = Statistics(values, chunk_size=1000)
+    assert np.allclose(statistics.percentile((1, 50, 99, 100)), np.percentile(values, (1, 50, 99, 100)), rtol=1e-12)
+
+    constant = Statistics(np.full(5000, 3., dtype=np.float32), chunk_size=1000)
+    assert constant.percentile(50) == 3.
+
+
+def test_infinite_statistics():
+    component = Component('a', np.array([1., np.inf]))
+
+    assert component.percentile(50) == np.inf
+    assert component.percentile(0) == 1.
+    assert component.min == 1. and component.max == np.inf
+
+    values = np.concatenate(([-np.inf] * 10, np.arange(100.), [np.inf] * 10, [np.nan]))
+    statistics = Statistics(values, chunk_size=16)
+
+    counts, edges = statistics.histogram(10)
+    assert counts.sum() == 100 and edges[0] == 0. and edges[-1] == 99.
+
+    assert np.array_equal(statistics.percentile((0, 5, 50, 95, 100)), [-np.inf, -np.inf, 49.5, np.inf, np.inf])
+    assert np.isclose(statistics.percentile(10), np.nanpercentile(values, 10))
+
+    assert np.array_equal(Statistics(np.array([np.inf, -np.inf, np.inf])).percentile((0, 50)), [-np.inf, np.inf])
+
+
+def test_empty_statistics():
+    statistics = Statistics(np.array([], dtype=np.float32))
+
+    assert statistics.min is None
+    assert statistics.max is None
+    assert np.isnan(statistics.percentile(50))
+
+
+def test_component_statistics():
+    component = Component('x', np.array([1., 2., 3.]))
+
+    assert component.min == 1.
+    assert component.max == 3.
+
+    component.array = np.array([-1., 5.])
+    assert component.min == -1.
+    assert component.max == 5.
+
+    component = Component('x', np.array([1., 2., 3.]), min=0.)
+    assert component.min == 0.
+    assert component.max == 3.
+
+
+def test_auto_range():
+    values = np.linspace(0., 1., 10001)
+    values[-1] = 100.
+
+    mesh = PolyMesh(
+        vertices=np.zeros((10001, 3)), triangle_indices=np.zeros((1, 3), dtype=np.uint32),
+        data={'x': [Component('value', values)]}
+    )
+
+    colored = IsoColor(mesh, input=('x', 'value'))
+    colored.auto_range()
+    assert colored.range == (0., 100.)
+    assert colored.max == 100.
+
+    threshold = Threshold(mesh, input=('x', 'value'))
+    threshold.auto_range((0, 99))
+    assert threshold.min == 0.
+    assert abs(threshold.max - 0.99) < 0.05
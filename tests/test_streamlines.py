@@ -0,0 +1,92 @@
+import numpy as np
+
+from ipygany import TetraMesh, Streamlines
+from ipygany.streamlines import TetrahedronLocator, integrate_streamlines, tubes
+
+from .utils import get_tetra_assets
+
+
+def get_vortex():
+    vertices, tetrahedrons = get_tetra_assets(6, 6, 6)
+    centered = vertices - 3.
+    velocity = np.stack((-centered[:, 1], centered[:, 0], np.full(len(vertices), 0.2)), axis=1)
+
+    return vertices, tetrahedrons, velocity
+
+
+def test_locate():
+    vertices, tetrahedrons, velocity = get_vortex()
+    locator = TetrahedronLocator(vertices, tetrahedrons)
+
+    points = np.array([[0.5, 0.5, 0.5], [3.2, 1.7, 5.9], [7., 0., 0.]])
+    cells, weights = locator.locate(points)
+
+    assert np.all(cells[:2] >= 0)
+    assert cells[2] == -1
+    assert np.allclose(locator.interpolate(vertices, cells, weights)[:2], points[:2])
+    assert np.allclose(locator.interpolate(velocity, cells, weights)[:2, 2], 0.2)
+
+    # Hints are used when valid, and ignored otherwise
+    hinted, _ = locator.locate(points, hint=np.array([cells[0], cells[0], -1]))
+    assert np.all(hinted == cells)
+
+
+def test_integrate():
+    vertices, tetrahedrons, velocity = get_vortex()
+    locator = TetrahedronLocator(vertices, tetrahedrons)
+
+    seeds = np.array([[4., 3., 0.5], [5., 3., 0.5], [10., 10., 10.]])
+    points, lengths = integrate_streamlines(locator, velocity, seeds, step=0.05, max_steps=100)
+
+    # The seed outside of the mesh has no streamline
+    assert len(lengths) == 2
+    assert len(points) == lengths.sum()
+
+    # Streamlines of a vortex keep their distance to the axis
+    radius = np.linalg.norm(points[:, :2] - 3., axis=1)
+    assert np.allclose(radius[:lengths[0]], 1., atol=1e-3)
+    assert np.allclose(radius[lengths[0]:], 2., atol=1e-3)
+    assert np.all(np.diff(points[:lengths[0], 2]) > 0)
+
+    both_points, both_lengths = integrate_streamlines(locator, velocity, seeds, step=0.05, max_steps=100, direction='both')
+    assert np.all(both_lengths > lengths)
+    assert np.all(np.diff(both_points[:both_lengths[0], 2]) > 0)
+
+    pool_points, pool_lengths = integrate_streamlines(locator, velocity, seeds, step=0.05, max_steps=100, processes=2)
+    assert np.all(pool_lengths == lengths)
+    assert np.allclose(pool_points, points)
+
+
+def test_tubes():
+    points = np.array([[0., 0., 0.], [1., 0., 0.], [2., 0., 0.], [5., 5., 5.], [0., 1., 0.], [0., 1., 0.]])
+
+    vertices, triangles, point_ids = tubes(points, [3, 1, 2], radius=0.1, sides=4)
+
+    # The single point polyline is skipped, coincident points get a frame
+    assert len(vertices) == 5 * 4
+    assert np.all(np.isfinite(vertices))
+    assert np.array_equal(point_ids, np.repeat([0, 1, 2, 4, 5], 4))
+    assert np.allclose(np.linalg.norm(vertices - points[point_ids], axis=1), 0.1)
+    assert len(triangles) == 3 * 2 * 4
+
+
+def test_streamlines():
+    vertices, tetrahedrons, velocity = get_vortex()
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={
+        'velocity': {'x': velocity[:, 0], 'y': velocity[:, 1], 'z': velocity[:, 2]},
+        'height': {'value': vertices[:, 2]},
+    })
+
+    streamlines = Streamlines(mesh, 'velocity', [[4., 3., 0.5], [5., 3., 0.5]], step=0.05, max_steps=50, sides=5)
+
+    tube_vertices = streamlines.vertices.reshape(-1, 3)
+    assert len(tube_vertices) % 5 == 0
+    assert np.all(streamlines.triangle_indices < len(tube_vertices))
+    assert len(streamlines['height', 'value'].array) == len(tube_vertices)
+
+    component = streamlines['height', 'value']
+    streamlines.seeds = [[4., 3., 0.5]]
+
+    assert len(streamlines.vertices.reshape(-1, 3)) < len(tube_vertices)
+    assert streamlines['height', 'value'] is component
+    assert len(component.array) == len(streamlines.vertices.reshape(-1, 3))
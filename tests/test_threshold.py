@@ -0,0 +1,66 @@
+import numpy as np
+
+from ipygany import PolyMesh, TetraMesh, PointCloud, Threshold, IsoColor
+
+from .utils import get_tetra_assets
+
+
+def test_range():
+    vertices, tetrahedrons = get_tetra_assets()
+
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'x': {'value': vertices[:, 0]}})
+
+    threshold = Threshold(mesh, input='x', min=0., max=1.)
+    assert threshold.range == (0., 1.)
+
+    threshold.max = 2.
+    assert threshold.range == (0., 2.)
+
+    threshold.range = (0.5, 1.5)
+    assert threshold.min == 0.5
+    assert threshold.max == 1.5
+
+
+def test_extract_tetramesh():
+    vertices, tetrahedrons = get_tetra_assets()
+
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'x': {'value': vertices[:, 0]}})
+
+    extracted = Threshold(IsoColor(mesh), input='x', min=0., max=1.).extract()
+
+    assert isinstance(extracted, PolyMesh)
+    assert extracted.vertices.reshape(-1, 3).shape == (8, 3)
+    # The boundary of a cube split into tetrahedrons: 6 faces of 2 triangles
+    assert extracted.triangle_indices.size == 12 * 3
+    assert np.all(extracted['x', 'value'].array <= 1.)
+
+    extracted = Threshold(mesh, input='x', min=0., max=1., inclusive=False).extract()
+
+    assert extracted.triangle_indices.size == 0
+
+
+def test_extract_polymesh():
+    vertices, tetrahedrons = get_tetra_assets()
+    values = vertices[:, 0]
+
+    mesh = TetraMesh(vertices=vertices, tetrahedron_indices=tetrahedrons, data={'x': {'value': values}})
+    poly = PolyMesh(vertices=vertices, triangle_indices=mesh.triangle_indices, data={'x': {'value': values}})
+
+    extracted = Threshold(poly, input=('x', 'value'), min=1., max=2.).extract()
+
+    kept = extracted.vertices.reshape(-1, 3)
+    assert np.all(kept[:, 0] >= 1.)
+    assert np.all(extracted.triangle_indices < len(kept))
+    assert np.all(np.equal(extracted['x', 'value'].array, kept[:, 0]))
+
+
+def test_extract_pointcloud():
+    vertices, _ = get_tetra_assets()
+
+    cloud = PointCloud(vertices=vertices, data={'x': {'value': vertices[:, 0]}})
+
+    extracted = Threshold(cloud, input='x', min=2., max=2.).extract()
+
+    assert isinstance(extracted, PointCloud)
+    assert np.all(extracted.vertices[:, 0] == 2.)
+    assert extracted['x', 'value'].array.size == 4
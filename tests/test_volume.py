@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from ipygany import Volume, PolyMesh, IsoSurface, Threshold, IsoColor
+from ipygany.filters import isosurface, tetrahedron_skin
+from ipygany.volume import (
+    grid_tetrahedrons, brick_topology, iter_bricks, voxel_boundary, texture, isosurface as grid_isosurface
+)
+
+
+def get_grid(shape=(9, 7, 8)):
+    x, y, z = np.meshgrid(*[np.arange(n, dtype=np.float64) for n in shape], indexing='ij')
+
+    return np.sqrt((x - 4.) ** 2 + (y - 3.) ** 2 + (z - 3.5) ** 2)
+
+
+def test_grid_isosurface():
+    grid = get_grid()
+    points = np.stack(np.unravel_index(np.arange(grid.size), grid.shape), axis=1).astype(np.float64)
+
+    # Bricks give the same surface as the explicit tetrahedrons
+    bricked, triangles, _ = grid_isosurface(grid, 2.5, brick_size=3)
+    explicit, explicit_triangles, _ = isosurface(points, grid_tetrahedrons(grid.shape), grid.ravel(), 2.5)
+
+    assert len(triangles) == len(explicit_triangles)
+    assert np.allclose(np.sort(bricked, axis=0), np.sort(explicit, axis=0))
+
+    # The topology is shared by the bricks of the same shape
+    brick_topology.cache_clear()
+    grid_isosurface(grid, 2.5, brick_size=3)
+    assert brick_topology.cache_info().misses < len(list(iter_bricks(grid.shape, 3)))
+
+
+def test_voxel_boundary():
+    shape = (4, 3, 5)
+
+    boundary = voxel_boundary(np.ones(np.subtract(shape, 1), dtype=bool))
+    assert len(boundary) == len(tetrahedron_skin(grid_tetrahedrons(shape)))
+
+    # Outward normals
+    points = np.stack(np.unravel_index(np.arange(np.prod(shape)), shape), axis=1).astype(np.float64)
+    corners = points[boundary]
+    normals = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+    assert np.all(np.einsum('ij,ij->i', normals, corners.mean(axis=1) - points.mean(axis=0)) > 0)
+
+
+def test_volume():
+    grid = get_grid()
+
+    volume = Volume({'distance': grid}, origin=(1., 0., 0.), spacing=(0.5, 0.5, 0.5))
+
+    vertices = volume.vertices.reshape(-1, 3)
+    assert vertices[:, 0].min() == 1. and vertices[:, 0].max() == 5.
+
+    # The component range is the one of the whole grid
+    assert volume['distance', 'value'].min == grid.min()
+    assert volume['distance', 'value'].array.size == len(vertices)
+
+    surface = IsoSurface(IsoColor(volume), input='distance', value=2.5).extract()
+    assert isinstance(surface, PolyMesh)
+    assert np.allclose(surface['distance', 'value'].array, 2.5)
+
+    kept = Threshold(volume, input='distance', min=0., max=2.).extract()
+    assert kept.triangle_indices.size > 0
+    assert np.all(kept['distance', 'value'].array <= 2.)
+
+    volume.update(('distance', 'value'), -grid)
+    assert volume['distance', 'value'].max == -grid.min()
+
+    with pytest.raises(ValueError):
+        Volume({'distance': grid, 'other': grid[1:]})
+
+
+def test_texture():
+    values = np.array([[[0., 1.], [2., np.nan]], [[3., 4.], [5., 6.]]])
+
+    quantized = texture(values, 0., 4., 'uint8')
+    assert quantized.dtype == np.uint8
+
+    # x varies the fastest, values are clipped to the range and NaNs mapped to 0
+    assert quantized[1, 0, 0] == np.rint(255 / 4)
+    assert quantized[0, 0, 1] == np.rint(3 * 255 / 4)
+    assert quantized[1, 1, 0] == 0
+    assert quantized[1, 1, 1] == 255
+
+    precise = texture(values, 0., 4., 'uint16')
+    assert np.allclose(precise / 65535., texture(values, 0., 4., 'float32'), atol=1. / 65535.)
+
+
+def test_volume_bricks():
+    grid = get_grid()
+
+    volume = Volume({'distance': grid, 'other': grid})
+    assert volume.bricks == []
+
+    volume.brick_size = 4
+    volume.volume_input = ('distance', 'value')
+    assert len(volume.bricks) == len(list(iter_bricks(grid.shape, 4)))
+
+    # Bricks overlap by one point, and their values are quantized over the whole grid range
+    for brick in volume.bricks:
+        slices = tuple(slice(start, start + n) for start, n in zip(brick.offset, brick.shape))
+        expected = (grid[slices] - grid.min()) / (grid.max() - grid.min())
+        assert brick.values.dtype == np.uint8
+        assert np.allclose(brick.values.T / 255., expected, atol=0.5 / 255.)
+
+    # Only the bricks of which the values changed are sent again
+    values = [brick.values for brick in volume.bricks]
+    updated = grid.copy()
+    updated[0, 0, 0] = grid.min()
+    volume.update(('distance', 'value'), updated)
+    changed = [brick.values is not previous for brick, previous in zip(volume.bricks, values)]
+    assert changed[0] and not any(changed[1:])
+
+    # Updating another component does not touch the bricks
+    values = [brick.values for brick in volume.bricks]
+    volume.update(('other', 'value'), -grid)
+    assert all(brick.values is previous for brick, previous in zip(volume.bricks, values))
+
+    bricks = volume.bricks
+    volume.quantization = 'uint16'
+    assert all(brick.values.dtype == np.uint16 for brick in volume.bricks)
+    assert all(brick.comm is None for brick in bricks)
+
+    volume.volume_input = None
+    assert volume.bricks == []
@@ -0,0 +1,110 @@
+import numpy as np
+import pytest
+
+from ipygany import PolyMesh
+from ipygany.filters import VertexWelding
+
+
+def grid_soup(n=4):
+    """Create a triangle soup of a n x n grid of quads, and its indexed vertices and triangles."""
+    x, y = np.meshgrid(np.arange(n + 1.), np.arange(n + 1.), indexing='ij')
+    vertices = np.stack((x.ravel(), y.ravel(), np.sin(x.ravel())), axis=1).astype(np.float32)
+
+    i = (np.arange(n)[:, np.newaxis] * (n + 1) + np.arange(n)).ravel()
+    triangles = np.concatenate((np.stack((i, i + n + 1, i + 1), axis=1), np.stack((i + 1, i + n + 1, i + n + 2), axis=1)))
+
+    return vertices[triangles].reshape(-1, 3), vertices, triangles
+
+
+def test_weld():
+    soup, vertices, triangles = grid_soup()
+
+    welding = VertexWelding(soup)
+
+    assert welding.n_input == len(soup)
+    assert welding.n_vertices == len(vertices)
+    assert welding.ratio == len(soup) / len(vertices)
+    assert np.array_equal(welding.vertices[welding.triangles()].reshape(-1, 3), soup)
+
+    # Welded vertices are ordered by first occurrence
+    _, first_occurrences = np.unique(welding.inverse, return_index=True)
+    assert np.all(np.diff(first_occurrences) > 0)
+
+    # Per-vertex values are averaged
+    values = np.arange(len(soup), dtype=np.float64)
+    merged = welding(values)
+    assert np.allclose(merged, np.bincount(welding.inverse, weights=values) / np.bincount(welding.inverse))
+    assert welding(np.stack((values, values), axis=1)).shape == (len(vertices), 2)
+
+    with pytest.raises(ValueError):
+        welding(values[1:])
+
+
+def test_weld_exact():
+    vertices = np.array([[0., 0., 0.], [-0., 0., 0.], [1e-7, 0., 0.], [1e30, -1e-30, 0.], [1e30, -1e-30, 0.]])
+
+    assert np.array_equal(VertexWelding(vertices).inverse, [0, 0, 1, 2, 2])
+    assert np.array_equal(VertexWelding(vertices.astype(np.float32)).inverse, [0, 0, 1, 2, 2])
+    assert np.array_equal(VertexWelding(np.array([[0, 0, -1], [2, 0, 0], [0, 0, -1]])).inverse, [0, 1, 0])
+
+    empty = VertexWelding(np.empty((0, 3)))
+    assert empty.n_vertices == 0 and len(empty.triangles()) == 0
+
+
+def test_weld_tolerance():
+    soup, vertices, triangles = grid_soup()
+    noisy = soup + np.random.RandomState(0).uniform(-1e-6, 1e-6, soup.shape)
+
+    assert VertexWelding(noisy).n_vertices == len(soup)
+
+    welding = VertexWelding(noisy, tolerance=1e-3)
+    assert welding.n_vertices == len(vertices)
+    assert np.abs(welding.vertices[welding.triangles()].reshape(-1, 3) - soup).max() < 1e-5
+
+    # Triangles collapsed by the tolerance are removed
+    welding = VertexWelding(soup, tolerance=10.)
+    assert welding.n_vertices == 1 and len(welding.triangles()) == 0
+
+
+def test_polymesh_soup():
+    soup, vertices, triangles = grid_soup()
+    values = soup[:, 0].copy()
+
+    mesh = PolyMesh(vertices=soup, data={'x': {'value': values}}, weld=True)
+
+    assert mesh.welding.ratio == len(soup) / len(vertices)
+    assert np.asarray(mesh.vertices).size == vertices.size
+    assert len(mesh.triangle_indices) == triangles.size
+
+    welded = np.asarray(mesh.vertices).reshape(-1, 3)
+    assert np.allclose(np.asarray(mesh['x', 'value'].array), welded[:, 0])
+    assert np.array_equal(welded[mesh.triangle_indices], soup)
+
+    mesh = PolyMesh(vertices=soup, data={'x': {'value': values}})
+
+    assert mesh.welding is None
+    assert np.array_equal(mesh.triangle_indices, np.arange(len(soup)))
+
+    mesh = PolyMesh(vertices=vertices, triangle_indices=triangles)
+    assert mesh.welding is None
+
+
+def test_polymesh_soup_animation():
+    soup, vertices, triangles = grid_soup()
+    frames = [soup + (0., 0., t) for t in range(3)]
+
+    # Without welding, the next frames are given as soups
+    mesh = PolyMesh(vertices=frames[0])
+    for frame in frames[1:]:
+        mesh.vertices = frame
+
+        assert np.array_equal(np.asarray(mesh.vertices).reshape(-1, 3), frame)
+        assert np.array_equal(mesh.triangle_indices, np.arange(len(soup)))
+
+    # With welding, they are merged the same way as the first one
+    mesh = PolyMesh(vertices=frames[0], weld=True)
+    for frame in frames[1:]:
+        mesh.vertices = mesh.welding(frame)
+
+        welded = np.asarray(mesh.vertices).reshape(-1, 3)
+        assert np.allclose(welded[mesh.triangle_indices].reshape(-1, 3), frame)
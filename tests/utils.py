@@ -22,3 +22,20 @@ def get_test_assets():
     ])
 
     return vertices, triangles, data_1d, data_3d
+
+
+def get_tetra_assets(nx=2, ny=1, nz=1):
+    """Create a structured grid of unit cubes, each cube being split into 6 tetrahedrons."""
+    x, y, z = np.meshgrid(np.arange(nx + 1), np.arange(ny + 1), np.arange(nz + 1), indexing='ij')
+    vertices = np.stack((x.ravel(), y.ravel(), z.ravel()), axis=1).astype(float)
+
+    def index(i, j, k):
+        return (i * (ny + 1) + j) * (nz + 1) + k
+
+    i, j, k = [a.ravel() for a in np.meshgrid(np.arange(nx), np.arange(ny), np.arange(nz), indexing='ij')]
+    corners = np.stack([index(i + di, j + dj, k + dk) for dk in (0, 1) for dj in (0, 1) for di in (0, 1)], axis=1)
+
+    split = np.array([[0, 1, 3, 7], [0, 1, 7, 5], [0, 2, 7, 3], [0, 2, 6, 7], [0, 4, 5, 7], [0, 4, 7, 6]])
+    tetrahedrons = corners[:, split].reshape(-1, 4)
+
+    return vertices, tetrahedrons